@@ -1,5 +1,5 @@
-from fastapi import APIRouter, Request, HTTPException, Depends, status, Cookie
-from fastapi.responses import RedirectResponse
+from fastapi import APIRouter, Request, HTTPException, Depends, Query, status, Cookie
+from fastapi.responses import RedirectResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 from backend.app.db.database import engine, Base, SessionLocal, get_db
 from backend.app.models.models import User, MondayConnection, Company, Link, LinkMetrics
@@ -10,6 +10,9 @@ import aiohttp
 import json
 import logging
 from backend.app.core.auth import SECRET_KEY, ALGORITHM, get_current_user
+from backend.app.core.monday_client import MondayAPIError, monday_client
+from backend.app.utils import monday_items
+from backend.app.utils.monday_boards import board_cache
 from datetime import datetime
 from pydantic import BaseModel
 from utils.url_validator import validate_social_url
@@ -60,25 +63,14 @@ async def connect_monday(request: Request, current_user: User = Depends(get_curr
             raise HTTPException(status_code=400, detail="Company ID is required")
             
         # Verify the token with Monday.com API
-        headers = {
-            "Authorization": api_token,
-            "Content-Type": "application/json"
-        }
-        
         query = "{ me { id name } }"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.monday.com/v2",
-                json={"query": query},
-                headers=headers
-            ) as response:
-                if response.status != 200:
-                    raise HTTPException(status_code=400, detail="Invalid Monday.com API token")
-                
-                data = await response.json()
-                if "errors" in data:
-                    raise HTTPException(status_code=400, detail=data["errors"][0]["message"])
+        try:
+            data = await monday_client.execute(api_token, query)
+        except MondayAPIError:
+            raise HTTPException(status_code=400, detail="Invalid Monday.com API token")
+        if "errors" in data:
+            raise HTTPException(status_code=400, detail=data["errors"][0]["message"])
             
         # Store the Monday.com API token in the database
         db = SessionLocal()
@@ -145,11 +137,6 @@ async def get_monday_workspaces(
             raise HTTPException(status_code=400, detail="Please connect your Monday.com account first")
         
         # Make API request to Monday.com
-        headers = {
-            "Authorization": monday_connection.api_token,
-            "Content-Type": "application/json"
-        }
-        
         query = """
         {
             workspaces {
@@ -159,20 +146,14 @@ async def get_monday_workspaces(
         }
         """
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.monday.com/v2",
-                json={"query": query},
-                headers=headers
-            ) as response:
-                if response.status != 200:
-                    raise HTTPException(status_code=response.status, detail="Failed to fetch workspaces")
-                
-                data = await response.json()
-                if "errors" in data:
-                    raise HTTPException(status_code=400, detail=data["errors"][0]["message"])
-                
-                return data["data"]["workspaces"]
+        try:
+            data = await monday_client.execute(monday_connection.api_token, query)
+        except MondayAPIError as e:
+            raise HTTPException(status_code=e.status or 500, detail="Failed to fetch workspaces")
+        if "errors" in data:
+            raise HTTPException(status_code=400, detail=data["errors"][0]["message"])
+        
+        return data["data"]["workspaces"]
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -200,14 +181,9 @@ async def get_monday_boards(
         logger.debug(f"Retrieved Monday.com connection for user {current_user.id}")
         
         # Make API request to Monday.com
-        headers = {
-            "Authorization": monday_connection.api_token,
-            "Content-Type": "application/json"
-        }
-        
         query = """
-        {
-            boards(workspace_ids: [%d]) {
+        query ($workspaceId: ID!) {
+            boards(workspace_ids: [$workspaceId]) {
                 id
                 name
                 state
@@ -219,33 +195,26 @@ async def get_monday_boards(
                 }
             }
         }
-        """ % workspace_id
-        
-        logger.debug(f"Making request to Monday.com API with query: {query}")
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.monday.com/v2",
-                json={"query": query},
-                headers=headers
-            ) as response:
-                logger.debug(f"Monday.com API response status: {response.status}")
-                if response.status != 200:
-                    error_msg = f"Failed to fetch boards: {response.status}"
-                    logger.error(error_msg)
-                    raise HTTPException(status_code=response.status, detail=error_msg)
-                
-                data = await response.json()
-                logger.debug(f"Monday.com API response: {data}")
-                
-                if "errors" in data:
-                    error_msg = data["errors"][0]["message"]
-                    logger.error(f"Monday.com GraphQL Error: {error_msg}")
-                    raise HTTPException(status_code=400, detail=error_msg)
-                
-                boards = data.get("data", {}).get("boards", [])
-                logger.debug(f"Successfully retrieved {len(boards)} boards")
-                return boards
+        """
+        
+        logger.debug(f"Requesting boards of workspace {workspace_id} from Monday.com")
+        
+        try:
+            data = await monday_client.execute(monday_connection.api_token, query, {"workspaceId": workspace_id})
+        except MondayAPIError as e:
+            error_msg = f"Failed to fetch boards: {e.status}"
+            logger.error(error_msg)
+            raise HTTPException(status_code=e.status or 500, detail=error_msg)
+        logger.debug(f"Monday.com API response: {data}")
+        
+        if "errors" in data:
+            error_msg = data["errors"][0]["message"]
+            logger.error(f"Monday.com GraphQL Error: {error_msg}")
+            raise HTTPException(status_code=400, detail=error_msg)
+        
+        boards = data.get("data", {}).get("boards", [])
+        logger.debug(f"Successfully retrieved {len(boards)} boards")
+        return boards
                 
     except Exception as e:
         error_msg = f"Internal server error: {str(e)}"
@@ -256,10 +225,12 @@ async def get_monday_boards(
 async def get_monday_items(
     board_id: int,
     company_id: int,
+    stream: bool = False,
+    page_size: Optional[int] = Query(None, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get all items from a Monday.com board"""
+    """Get all items from a Monday.com board, following page cursors to the end"""
     try:
         # Get user's Monday.com API token for this company
         monday_connection = db.query(MondayConnection).filter(
@@ -272,97 +243,31 @@ async def get_monday_items(
         
         if not monday_connection.api_token:
             raise HTTPException(status_code=400, detail="Invalid Monday.com API token")
-            
-        logger.info("Retrieved Monday.com connection from database")
-        logger.info(f"User ID: {current_user.id}")
-        logger.info(f"Token exists: {bool(monday_connection.api_token)}")
-        
-        # Make request to Monday.com API
-        query = """
-        {
-            boards (ids: ["%s"]) {
-                id
-                name
-                items_page {
-                    items {
-                        id
-                        name
-                    }
-                }
-            }
-        }
-        """ % board_id
         
-        logger.info(f"Making request to Monday.com API for board {board_id}")
+        logger.info(f"Reading items of Monday.com board {board_id}")
         
-        # Define headers for the API request
-        headers = {
-            "Authorization": monday_connection.api_token,
-            "Content-Type": "application/json"
-        }
-        
-        logger.debug(f"Request headers: {headers}")
-        logger.debug(f"GraphQL Query: {query}")
+        try:
+            pages = await monday_items.open_item_pages(monday_connection.api_token, board_id, page_size)
+            if stream:
+                return StreamingResponse(monday_items.ndjson_chunks(pages), media_type="application/x-ndjson")
+            items = [item async for page in pages for item in page]
+        except MondayAPIError as e:
+            error_msg = f"Failed to fetch items: {str(e)}"
+            logger.error(error_msg)
+            raise HTTPException(
+                status_code=e.status or 400,
+                detail=error_msg
+            )
+        except aiohttp.ClientError as e:
+            error_msg = f"Failed to connect to Monday.com API: {str(e)}"
+            logger.error(error_msg)
+            raise HTTPException(
+                status_code=500,
+                detail=error_msg
+            )
         
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.post(
-                    "https://api.monday.com/v2",
-                    json={"query": query},
-                    headers=headers
-                ) as response:
-                    logger.info(f"Monday.com API Response Status: {response.status}")
-                    response_text = await response.text()
-                    logger.debug(f"Response text: {response_text}")
-                    
-                    if response.status != 200:
-                        error_msg = f"Failed to fetch items: {response_text}"
-                        logger.error(error_msg)
-                        raise HTTPException(
-                            status_code=response.status,
-                            detail=error_msg
-                        )
-                    
-                    try:
-                        data = json.loads(response_text)
-                    except json.JSONDecodeError as e:
-                        error_msg = f"Failed to parse JSON response: {e}"
-                        logger.error(error_msg)
-                        raise HTTPException(
-                            status_code=500,
-                            detail=error_msg
-                        )
-                    
-                    logger.debug(f"Monday.com API Response: {data}")
-                    
-                    if "errors" in data:
-                        error_msg = data["errors"][0]["message"]
-                        logger.error(f"Monday.com GraphQL Error: {error_msg}")
-                        raise HTTPException(
-                            status_code=400,
-                            detail=error_msg
-                        )
-                    
-                    boards_data = data.get("data", {}).get("boards", [])
-                    if not boards_data:
-                        error_msg = "No boards found in response"
-                        logger.error(error_msg)
-                        raise HTTPException(
-                            status_code=404,
-                            detail=error_msg
-                        )
-                    
-                    items = boards_data[0].get("items_page", {}).get("items", [])
-                    logger.info(f"Successfully retrieved {len(items)} items")
-                    return items
-                    
-            except aiohttp.ClientError as e:
-                error_msg = f"Failed to connect to Monday.com API: {str(e)}"
-                logger.error(error_msg)
-                raise HTTPException(
-                    status_code=500,
-                    detail=error_msg
-                )
+        logger.info(f"Successfully retrieved {len(items)} items")
+        return items
     except HTTPException:
         raise
     except Exception as e:
@@ -392,31 +297,20 @@ async def verify_monday_token(
             return {"is_valid": False, "message": "No Monday.com connection found"}
             
         # Make API request to Monday.com to verify token
-        headers = {
-            "Authorization": monday_connection.api_token,
-            "Content-Type": "application/json"
-        }
-        
         query = "{ me { id name } }"
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.monday.com/v2",
-                json={"query": query},
-                headers=headers
-            ) as response:
-                if response.status != 200:
-                    return {"is_valid": False, "message": "Invalid API token"}
-                    
-                data = await response.json()
-                if "errors" in data:
-                    return {"is_valid": False, "message": data["errors"][0]["message"]}
-                    
-                return {
-                    "is_valid": True,
-                    "message": "Token is valid",
-                    "user": data["data"]["me"]
-                }
+        try:
+            data = await monday_client.execute(monday_connection.api_token, query)
+        except MondayAPIError:
+            return {"is_valid": False, "message": "Invalid API token"}
+        if "errors" in data:
+            return {"is_valid": False, "message": data["errors"][0]["message"]}
+            
+        return {
+            "is_valid": True,
+            "message": "Token is valid",
+            "user": data["data"]["me"]
+        }
                 
     except Exception as e:
         return {"is_valid": False, "message": str(e)}
@@ -525,6 +419,8 @@ async def save_monday_config(
         
         try:
             db.commit()
+            # Board kind, columns and parent item are re-read on the next push
+            board_cache.invalidate(monday_connection.id)
             return {"message": "Configuration saved successfully"}
         except Exception as e:
             db.rollback()
@@ -561,14 +457,9 @@ async def get_monday_columns(
         logger.debug(f"Retrieved Monday.com connection for user {current_user.id}")
         
         # Make API request to Monday.com
-        headers = {
-            "Authorization": monday_connection.api_token,
-            "Content-Type": "application/json"
-        }
-        
         query = """
-        {
-            boards(ids: [%d]) {
+        query ($boardId: ID!) {
+            boards(ids: [$boardId]) {
                 columns {
                     id
                     title
@@ -576,35 +467,28 @@ async def get_monday_columns(
                 }
             }
         }
-        """ % board_id
-        
-        logger.debug(f"Making request to Monday.com API with query: {query}")
-        
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.monday.com/v2",
-                json={"query": query},
-                headers=headers
-            ) as response:
-                logger.debug(f"Monday.com API response status: {response.status}")
-                if response.status != 200:
-                    error_msg = f"Failed to fetch columns: {response.status}"
-                    logger.error(error_msg)
-                    raise HTTPException(status_code=response.status, detail=error_msg)
-                
-                data = await response.json()
-                logger.debug(f"Monday.com API response: {data}")
-                
-                if "errors" in data:
-                    error_msg = data["errors"][0]["message"]
-                    logger.error(f"Monday.com GraphQL Error: {error_msg}")
-                    raise HTTPException(status_code=400, detail=error_msg)
-                
-                columns = data.get("data", {}).get("boards", [{}])[0].get("columns", [])
-                # Filter for number columns only
-                number_columns = [col for col in columns if col["type"] in ["numeric", "numbers"]]
-                logger.debug(f"Successfully retrieved {len(number_columns)} number columns")
-                return number_columns
+        """
+        
+        logger.debug(f"Requesting columns of board {board_id} from Monday.com")
+        
+        try:
+            data = await monday_client.execute(monday_connection.api_token, query, {"boardId": board_id})
+        except MondayAPIError as e:
+            error_msg = f"Failed to fetch columns: {e.status}"
+            logger.error(error_msg)
+            raise HTTPException(status_code=e.status or 500, detail=error_msg)
+        logger.debug(f"Monday.com API response: {data}")
+        
+        if "errors" in data:
+            error_msg = data["errors"][0]["message"]
+            logger.error(f"Monday.com GraphQL Error: {error_msg}")
+            raise HTTPException(status_code=400, detail=error_msg)
+        
+        columns = data.get("data", {}).get("boards", [{}])[0].get("columns", [])
+        # Filter for number columns only
+        number_columns = [col for col in columns if col["type"] in ["numeric", "numbers"]]
+        logger.debug(f"Successfully retrieved {len(number_columns)} number columns")
+        return number_columns
                 
     except Exception as e:
         error_msg = f"Internal server error: {str(e)}"
@@ -619,11 +503,6 @@ async def create_monday_item(
 ) -> dict:
     """Create a new item in a Monday.com board with specified column values"""
     try:
-        headers = {
-            "Authorization": monday_connection.api_token,
-            "Content-Type": "application/json"
-        }
-        
         # Convert column values to Monday.com format
         column_values_json = json.dumps(column_values)
         
@@ -646,26 +525,20 @@ async def create_monday_item(
             "columnValues": column_values_json
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.monday.com/v2",
-                json={"query": mutation, "variables": variables},
-                headers=headers
-            ) as response:
-                if response.status != 200:
-                    error_msg = f"Failed to create item: {response.status}"
-                    logger.error(error_msg)
-                    raise HTTPException(status_code=response.status, detail=error_msg)
-                
-                data = await response.json()
-                logger.debug(f"Monday.com API response: {data}")
-                
-                if "errors" in data:
-                    error_msg = data["errors"][0]["message"]
-                    logger.error(f"Monday.com GraphQL Error: {error_msg}")
-                    raise HTTPException(status_code=400, detail=error_msg)
-                
-                return data["data"]["create_item"]
+        try:
+            data = await monday_client.execute(monday_connection.api_token, mutation, variables)
+        except MondayAPIError as e:
+            error_msg = f"Failed to create item: {e.status}"
+            logger.error(error_msg)
+            raise HTTPException(status_code=e.status or 500, detail=error_msg)
+        logger.debug(f"Monday.com API response: {data}")
+        
+        if "errors" in data:
+            error_msg = data["errors"][0]["message"]
+            logger.error(f"Monday.com GraphQL Error: {error_msg}")
+            raise HTTPException(status_code=400, detail=error_msg)
+        
+        return data["data"]["create_item"]
                 
     except Exception as e:
         error_msg = f"Error creating Monday.com item: {str(e)}"
@@ -868,49 +741,38 @@ async def refresh_link(
 
                 if link.monday_item_id:
                     # Update existing item
-                    headers = {
-                        "Authorization": monday_connection.api_token,
-                        "Content-Type": "application/json"
-                    }
-                    
                     mutation = """
-                    mutation ($itemId: ID!, $columnValues: JSON!) {
+                    mutation ($boardId: ID!, $itemId: ID!, $columnValues: JSON!) {
                         change_multiple_column_values (
                             item_id: $itemId,
-                            board_id: %s,
+                            board_id: $boardId,
                             column_values: $columnValues
                         ) {
                             id
                         }
                     }
-                    """ % monday_connection.board_id
+                    """
                     
                     variables = {
+                        "boardId": monday_connection.board_id,
                         "itemId": link.monday_item_id,
                         "columnValues": json.dumps(column_values)
                     }
                     
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(
-                            "https://api.monday.com/v2",
-                            json={"query": mutation, "variables": variables},
-                            headers=headers
-                        ) as response:
-                            if response.status != 200:
-                                monday_sync_status = 'error'
-                                monday_error = f"Failed to update Monday.com item (status {response.status})"
-                                logger.error(monday_error)
-                                data = await response.text()
-                                logger.error(data)
-                                raise Exception(monday_error)
-                            data = await response.json()
-                            if "errors" in data:
-                                monday_sync_status = 'error'
-                                monday_error = data["errors"][0]["message"]
-                                logger.error(monday_error)
-                                raise Exception(monday_error)
-                            logger.info(f"[REFRESH_LINK] Successfully updated Monday.com item: {link.monday_item_id}")
-                            monday_sync_status = 'success'
+                    try:
+                        data = await monday_client.execute(monday_connection.api_token, mutation, variables)
+                    except MondayAPIError as e:
+                        monday_sync_status = 'error'
+                        monday_error = f"Failed to update Monday.com item (status {e.status})"
+                        logger.error(monday_error)
+                        raise Exception(monday_error)
+                    if "errors" in data:
+                        monday_sync_status = 'error'
+                        monday_error = data["errors"][0]["message"]
+                        logger.error(monday_error)
+                        raise Exception(monday_error)
+                    logger.info(f"[REFRESH_LINK] Successfully updated Monday.com item: {link.monday_item_id}")
+                    monday_sync_status = 'success'
                 else:
                     # Create new item
                     monday_item = await create_monday_item(
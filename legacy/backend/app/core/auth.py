@@ -2,11 +2,14 @@ from fastapi import HTTPException, Depends, status, Cookie, Request
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from typing import Optional
+from typing import Optional, Tuple
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 from backend.app.db.database import get_db
 from sqlalchemy.orm import Session
 from backend.app.models.models import User
+from backend.app.core.principal_cache import principal_cache
 import os
 from dotenv import load_dotenv
 
@@ -18,16 +21,38 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing. Hashes made with another work factor are upgraded on
+# the next successful login.
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# bcrypt is CPU-bound; async handlers run it on this bounded pool so a burst
+# of logins queues here instead of blocking the event loop.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+password_executor = ThreadPoolExecutor(max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash")
+
 def verify_password(plain_password, hashed_password):
     return pwd_context.verify(plain_password, hashed_password)
 
 def get_password_hash(password):
     return pwd_context.hash(password)
 
+async def _run_password_op(func, *args):
+    return await asyncio.get_running_loop().run_in_executor(password_executor, func, *args)
+
+async def averify_password(plain_password, hashed_password) -> bool:
+    """verify_password on the password executor"""
+    return await _run_password_op(pwd_context.verify, plain_password, hashed_password)
+
+async def aget_password_hash(password) -> str:
+    """get_password_hash on the password executor"""
+    return await _run_password_op(pwd_context.hash, password)
+
+async def averify_and_update_password(plain_password, hashed_password) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a new hash if the stored one uses an outdated work factor"""
+    return await _run_password_op(pwd_context.verify_and_update, plain_password, hashed_password)
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -74,7 +99,18 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    user = db.query(User).filter(User.email == email).first()
+    user = principal_cache.get(email, db)
+    if user is not None:
+        return user
+
+    # Tokens carry the user ID in "uid"; older tokens only have the email
+    user_id = payload.get("uid")
+    if user_id is not None:
+        user = db.get(User, user_id)
+        if user is not None and user.email != email:
+            user = None
+    else:
+        user = db.query(User).filter(User.email == email).first()
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -82,4 +118,5 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    return user 
\ No newline at end of file
+    principal_cache.put(email, user)
+    return user
@@ -0,0 +1,201 @@
+"""
+Shared, pooled HTTP client for all outbound calls (parsers and Monday.com)
+"""
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+import aiohttp
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        logger.warning(f"Invalid value for {name}, using default {default}")
+        return default
+
+
+@dataclass
+class PoolConfig:
+    """Connection pool settings for one upstream"""
+    limit: int = 100
+    limit_per_host: int = 20
+    keepalive_timeout: float = 30.0
+    dns_cache_ttl: int = 300
+    connect_timeout: float = 10.0
+    total_timeout: float = 60.0
+
+    @classmethod
+    def from_env(cls, pool: str, **defaults) -> "PoolConfig":
+        """Build a config from HTTP_* env vars, with HTTP_<POOL>_* overrides"""
+        base = cls(**defaults)
+        prefix = f"HTTP_{pool.upper()}_"
+        return cls(
+            limit=_env_int(prefix + "LIMIT", _env_int("HTTP_POOL_LIMIT", base.limit)),
+            limit_per_host=_env_int(prefix + "LIMIT_PER_HOST", _env_int("HTTP_POOL_LIMIT_PER_HOST", base.limit_per_host)),
+            keepalive_timeout=_env_float(prefix + "KEEPALIVE_TIMEOUT", _env_float("HTTP_KEEPALIVE_TIMEOUT", base.keepalive_timeout)),
+            dns_cache_ttl=_env_int(prefix + "DNS_CACHE_TTL", _env_int("HTTP_DNS_CACHE_TTL", base.dns_cache_ttl)),
+            connect_timeout=_env_float(prefix + "CONNECT_TIMEOUT", _env_float("HTTP_CONNECT_TIMEOUT", base.connect_timeout)),
+            total_timeout=_env_float(prefix + "TOTAL_TIMEOUT", base.total_timeout),
+        )
+
+
+# One pool per upstream host family. Unknown pool names fall back to "default".
+DEFAULT_POOLS: Dict[str, dict] = {
+    "rapidapi": {"total_timeout": 60.0},
+    "apify": {"total_timeout": 120.0},
+    "monday": {"total_timeout": 30.0},
+    "googleapis": {"total_timeout": 30.0},
+    "default": {"total_timeout": 60.0},
+}
+
+
+@dataclass
+class PoolStats:
+    """Counters collected through aiohttp trace hooks"""
+    requests: int = 0
+    handshakes: int = 0
+    connections_reused: int = 0
+    errors: int = 0
+
+
+@dataclass
+class _Pool:
+    config: PoolConfig
+    stats: PoolStats = field(default_factory=PoolStats)
+    session: Optional[aiohttp.ClientSession] = None
+    loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class HTTPClientManager:
+    """Process-wide owner of one keep-alive ClientSession per upstream pool.
+
+    Sessions are created lazily on first use inside the running event loop and
+    closed by :meth:`close`, which the app calls on shutdown.
+    """
+
+    def __init__(self, pools: Optional[Dict[str, PoolConfig]] = None):
+        if pools is None:
+            pools = {name: PoolConfig.from_env(name, **defaults) for name, defaults in DEFAULT_POOLS.items()}
+        self._pools: Dict[str, _Pool] = {name: _Pool(config=config) for name, config in pools.items()}
+        if "default" not in self._pools:
+            self._pools["default"] = _Pool(config=PoolConfig())
+
+    def _pool(self, name: str) -> Tuple[str, _Pool]:
+        if name not in self._pools:
+            name = "default"
+        return name, self._pools[name]
+
+    def _trace_config(self, stats: PoolStats) -> aiohttp.TraceConfig:
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            stats.requests += 1
+
+        async def on_request_exception(session, ctx, params):
+            stats.errors += 1
+
+        async def on_connection_create_end(session, ctx, params):
+            stats.handshakes += 1
+
+        async def on_connection_reuseconn(session, ctx, params):
+            stats.connections_reused += 1
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_request_exception.append(on_request_exception)
+        trace.on_connection_create_end.append(on_connection_create_end)
+        trace.on_connection_reuseconn.append(on_connection_reuseconn)
+        return trace
+
+    def _create_session(self, name: str, pool: _Pool) -> aiohttp.ClientSession:
+        config = pool.config
+        connector = aiohttp.TCPConnector(
+            limit=config.limit,
+            limit_per_host=config.limit_per_host,
+            keepalive_timeout=config.keepalive_timeout,
+            ttl_dns_cache=config.dns_cache_ttl,
+            use_dns_cache=True,
+        )
+        timeout = aiohttp.ClientTimeout(total=config.total_timeout, connect=config.connect_timeout)
+        logger.info(f"HTTP client: opening '{name}' pool (limit_per_host={config.limit_per_host})")
+        return aiohttp.ClientSession(
+            connector=connector,
+            timeout=timeout,
+            trace_configs=[self._trace_config(pool.stats)],
+        )
+
+    def get_session(self, pool: str = "default") -> aiohttp.ClientSession:
+        """Return the shared session for a pool, creating it if needed"""
+        name, entry = self._pool(pool)
+        loop = asyncio.get_running_loop()
+        if entry.session is None or entry.session.closed or entry.loop is not loop:
+            # A session is bound to the loop it was created on; scripts that call
+            # asyncio.run() more than once get a fresh one per loop.
+            entry.session = self._create_session(name, entry)
+            entry.loop = loop
+        return entry.session
+
+    @asynccontextmanager
+    async def session(self, pool: str = "default"):
+        """Borrow the shared session for a pool without closing it afterwards"""
+        yield self.get_session(pool)
+
+    async def close(self) -> None:
+        """Close every open session (called on application shutdown)"""
+        for name, entry in self._pools.items():
+            if entry.session is not None and not entry.session.closed:
+                try:
+                    await entry.session.close()
+                    logger.info(f"HTTP client: closed '{name}' pool")
+                except Exception as e:
+                    logger.error(f"HTTP client: failed to close '{name}' pool: {e}")
+            entry.session = None
+            entry.loop = None
+
+    def metrics(self) -> Dict[str, dict]:
+        """Pool-level metrics: connections in use/idle, reuse and handshake counts"""
+        result = {}
+        for name, entry in self._pools.items():
+            in_use = idle = 0
+            if entry.session is not None and not entry.session.closed:
+                connector = entry.session.connector
+                in_use = len(getattr(connector, "_acquired", ()))
+                idle = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+            result[name] = {
+                "open": entry.session is not None and not entry.session.closed,
+                "connections_in_use": in_use,
+                "connections_idle": idle,
+                "connections_reused": entry.stats.connections_reused,
+                "handshakes": entry.stats.handshakes,
+                "requests": entry.stats.requests,
+                "errors": entry.stats.errors,
+                "limit_per_host": entry.config.limit_per_host,
+            }
+        return result
+
+
+# Create a singleton instance
+http_client = HTTPClientManager()
+
+
+def get_http_client() -> HTTPClientManager:
+    """FastAPI dependency returning the shared HTTP client"""
+    return http_client
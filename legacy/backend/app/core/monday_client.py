@@ -0,0 +1,263 @@
+"""
+Monday.com GraphQL client with per-token complexity budgeting.
+
+Every request asks Monday for ``complexity { query before after
+reset_in_x_seconds }``. Requests of one API token are queued in order
+through a token bucket that is refilled over the budget window and
+re-synchronised with the budget Monday reports. Rate-limit and
+complexity-budget errors are retried after the delay Monday returns.
+"""
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from backend.app.core.http_client import HTTPClientManager, http_client as shared_http_client
+
+logger = logging.getLogger(__name__)
+
+MONDAY_API_URL = os.getenv("MONDAY_API_URL", "https://api.monday.com/v2")
+
+COMPLEXITY_FIELD = "complexity { query before after reset_in_x_seconds }"
+RATE_LIMIT_CODES = {
+    "ComplexityException",
+    "COMPLEXITY_BUDGET_EXHAUSTED",
+    "RATE_LIMIT_EXCEEDED",
+    "Rate Limit Exceeded",
+    "maxConcurrencyExceeded",
+}
+_RESET_IN = re.compile(r"reset in (\d+(?:\.\d+)?) seconds?", re.IGNORECASE)
+
+
+class MondayAPIError(Exception):
+    """Monday.com answered with a non-200 status"""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class MondayRateLimitError(MondayAPIError):
+    """Still rate limited after the configured number of retries"""
+
+
+def with_complexity(query: str) -> str:
+    """Add the complexity field to the top-level selection of a GraphQL document"""
+    if "complexity" in query:
+        return query
+    index = query.find("{")
+    if index < 0:
+        return query
+    return f"{query[:index + 1]} {COMPLEXITY_FIELD} {query[index + 1:]}"
+
+
+def rate_limit_delay(body: Dict[str, Any]) -> Optional[float]:
+    """Seconds to wait if the body reports a rate-limit or budget error, else None"""
+    errors = list(body.get("errors") or [])
+    if body.get("error_code") or body.get("error_message"):
+        errors.append({
+            "message": body.get("error_message") or "",
+            "extensions": {"code": body.get("error_code"), **(body.get("error_data") or {})},
+        })
+    for error in errors:
+        extensions = error.get("extensions") or {}
+        message = error.get("message") or ""
+        if extensions.get("code") in RATE_LIMIT_CODES or message in RATE_LIMIT_CODES or body.get("status_code") == 429:
+            retry = extensions.get("retry_in_seconds")
+            if retry is None:
+                match = _RESET_IN.search(message)
+                retry = match.group(1) if match else 60
+            return max(0.0, float(retry))
+    return None
+
+
+class _Bucket:
+    """Complexity budget of one API token"""
+
+    def __init__(self, capacity: float, window: float):
+        self.capacity = capacity
+        self.rate = capacity / window
+        self.level = capacity
+        self.updated = time.monotonic()
+        # Set from Monday's reset_in_x_seconds; the reported level holds until then
+        self.reset_at: Optional[float] = None
+        self.lock: Optional[asyncio.Lock] = None
+        self.loop = None
+        self.waiting = 0
+
+    def get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self.lock is None or self.loop is not loop:
+            self.lock = asyncio.Lock()
+            self.loop = loop
+        return self.lock
+
+    def refill(self, now: float) -> None:
+        if self.reset_at is not None:
+            if now >= self.reset_at:
+                self.level = self.capacity
+                self.reset_at = None
+        else:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, cost: float, now: float) -> float:
+        if self.reset_at is not None:
+            return max(0.0, self.reset_at - now)
+        return max(0.0, (cost - self.level) / self.rate)
+
+    def observe(self, complexity: Dict[str, Any], now: float) -> None:
+        if complexity.get("after") is None:
+            return
+        # Never above the configured budget, which may be a share of the account's
+        self.level = min(self.capacity, float(complexity["after"]))
+        self.updated = now
+        reset_in = complexity.get("reset_in_x_seconds")
+        if reset_in is not None:
+            self.reset_at = now + float(reset_in)
+
+    def exhaust(self, delay: float, now: float) -> None:
+        self.level = 0
+        self.updated = now
+        self.reset_at = now + delay
+
+
+class MondayClient:
+    """Single entry point for Monday.com GraphQL requests"""
+
+    def __init__(
+        self,
+        http: Optional[HTTPClientManager] = None,
+        api_url: Optional[str] = None,
+        budget: Optional[float] = None,
+        window: Optional[float] = None,
+        default_cost: Optional[float] = None,
+        max_retries: Optional[int] = None,
+    ):
+        self.http = http or shared_http_client
+        self.api_url = api_url or MONDAY_API_URL
+        self.budget = budget or float(os.getenv("MONDAY_COMPLEXITY_BUDGET", "10000000"))
+        self.window = window or float(os.getenv("MONDAY_BUDGET_WINDOW", "60"))
+        self.default_cost = default_cost or float(os.getenv("MONDAY_DEFAULT_QUERY_COST", "1000"))
+        self.max_retries = max_retries if max_retries is not None else int(os.getenv("MONDAY_MAX_RETRIES", "3"))
+        self._buckets: Dict[str, _Bucket] = {}
+        # Last reported cost per query text, used as the estimate next time
+        self._costs: "OrderedDict[str, float]" = OrderedDict()
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.throttled = 0
+        self.throttled_seconds = 0.0
+        self.max_queue_depth = 0
+
+    def _bucket(self, api_token: str) -> _Bucket:
+        bucket = self._buckets.get(api_token)
+        if bucket is None:
+            bucket = self._buckets[api_token] = _Bucket(self.budget, self.window)
+        return bucket
+
+    def _estimate(self, query: str) -> float:
+        return self._costs.get(query, self.default_cost)
+
+    def _remember_cost(self, query: str, cost: float) -> None:
+        self._costs[query] = cost
+        self._costs.move_to_end(query)
+        while len(self._costs) > 256:
+            self._costs.popitem(last=False)
+
+    async def _acquire(self, bucket: _Bucket, cost: float) -> None:
+        """Wait in line until the token's budget covers ``cost``"""
+        bucket.waiting += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            async with bucket.get_lock():
+                waited = 0.0
+                while True:
+                    now = time.monotonic()
+                    bucket.refill(now)
+                    # A query costlier than the whole budget only waits for a full bucket
+                    if bucket.level >= min(cost, bucket.capacity):
+                        bucket.level -= cost
+                        break
+                    delay = bucket.delay(cost, now)
+                    await asyncio.sleep(delay)
+                    waited += delay
+                if waited:
+                    self.throttled += 1
+                    self.throttled_seconds += waited
+        finally:
+            bucket.waiting -= 1
+
+    async def execute(
+        self,
+        api_token: str,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        cost: Optional[float] = None,
+        url: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """Run a GraphQL document and return the decoded body.
+
+        GraphQL errors other than rate limits are returned in the body for the
+        caller to handle. Raises MondayAPIError for non-200 responses and
+        MondayRateLimitError when retries are exhausted.
+        """
+        document = with_complexity(query)
+        bucket = self._bucket(api_token)
+        estimate = cost if cost is not None else self._estimate(query)
+        headers = {"Authorization": api_token, "Content-Type": "application/json"}
+        payload = {"query": document, "variables": variables or {}}
+        attempt = 0
+        while True:
+            await self._acquire(bucket, estimate)
+            self.requests += 1
+            async with self.http.session("monday") as session:
+                async with session.post(url or self.api_url, json=payload, headers=headers) as response:
+                    if response.status == 429:
+                        delay = float(response.headers.get("Retry-After") or 60)
+                        body = None
+                    elif response.status != 200:
+                        text = await response.text()
+                        logger.error(f"Monday.com request failed (status {response.status}): {text}")
+                        raise MondayAPIError(f"Monday.com request failed (status {response.status})", response.status)
+                    else:
+                        body = await response.json()
+                        delay = rate_limit_delay(body)
+            now = time.monotonic()
+            if delay is None:
+                complexity = (body.get("data") or {}).get("complexity") or {}
+                bucket.observe(complexity, now)
+                if complexity.get("query") is not None and cost is None:
+                    self._remember_cost(query, float(complexity["query"]))
+                return body
+
+            self.rate_limited += 1
+            bucket.exhaust(delay, now)
+            if attempt >= self.max_retries:
+                raise MondayRateLimitError(f"Monday.com rate limit: retry in {delay:g} seconds", 429)
+            attempt += 1
+            self.retries += 1
+            logger.warning(f"Monday.com rate limited; retrying in {delay:g}s (attempt {attempt}/{self.max_retries})")
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(bucket.waiting for bucket in self._buckets.values())
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "tokens": len(self._buckets),
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "throttled": self.throttled,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+        }
+
+
+# Create a singleton instance
+monday_client = MondayClient()
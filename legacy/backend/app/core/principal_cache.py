@@ -0,0 +1,92 @@
+"""
+In-process cache of authenticated users, keyed by the token subject
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.session import make_transient_to_detached
+
+from backend.app.models.models import User
+
+
+class PrincipalCache:
+    """TTL + LRU cache of User column values.
+
+    Entries hold plain column values rather than ORM instances, so a hit is
+    turned into a User attached to the request's session without running any
+    SQL. Each process has its own cache; the TTL bounds how long another
+    process can serve a stale user after a change.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_size: Optional[int] = None):
+        self.ttl = ttl if ttl is not None else float(os.getenv("AUTH_CACHE_TTL", "60"))
+        self.max_size = max_size if max_size is not None else int(os.getenv("AUTH_CACHE_SIZE", "1024"))
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, sub: str, db: Session) -> Optional[User]:
+        """Return the cached user for a token subject, attached to ``db``"""
+        if self.ttl <= 0:
+            self.misses += 1
+            return None
+        with self._lock:
+            entry = self._entries.get(sub)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[sub]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(sub)
+            self.hits += 1
+            values = entry[1]
+        user = User(**values)
+        make_transient_to_detached(user)
+        # load=False merges the cached state into the session without a query
+        return db.merge(user, load=False)
+
+    def put(self, sub: str, user: User) -> None:
+        if self.ttl <= 0 or self.max_size <= 0:
+            return
+        values: Dict[str, Any] = {column.key: getattr(user, column.key) for column in User.__table__.columns}
+        with self._lock:
+            self._entries[sub] = (time.monotonic() + self.ttl, values)
+            self._entries.move_to_end(sub)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user: User) -> None:
+        """Drop every entry of a user; call after its row changed or was deleted"""
+        with self._lock:
+            for sub in [sub for sub, (_, values) in self._entries.items() if values.get("id") == user.id]:
+                del self._entries[sub]
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+# Create a singleton instance
+principal_cache = PrincipalCache()
@@ -0,0 +1,78 @@
+"""
+Single-flight coalescing of concurrent async calls with the same key
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, TypeVar
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """Set on a flight whose leader was cancelled; waiting followers retry"""
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time.
+
+    Callers that arrive while a call for their key is in flight await that
+    call and get its result (or its exception) instead of starting their own.
+    If the caller running the call is cancelled, the others run it again
+    rather than being cancelled with it. Nothing is remembered once the call
+    finishes; caching is left to callers.
+    """
+
+    def __init__(self):
+        self._flights: Dict[str, asyncio.Future] = {}
+        self.calls = 0
+        self.executions = 0
+        self.coalesced = 0
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._flights
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        self.calls += 1
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                break
+            self.coalesced += 1
+            try:
+                # shield: a cancelled follower must not cancel the shared call
+                return await asyncio.shield(flight)
+            except _LeaderCancelled:
+                # The first follower to get here becomes the new leader
+                self.coalesced -= 1
+
+        flight = asyncio.get_running_loop().create_future()
+        self._flights[key] = flight
+        self.executions += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            flight.set_exception(_LeaderCancelled())
+            flight.exception()
+            raise
+        except Exception as e:
+            flight.set_exception(e)
+            flight.exception()  # retrieved here, so no warning when nobody else waited
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            del self._flights[key]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "in_flight": len(self._flights),
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_rate": self.coalesced / self.calls if self.calls else 0,
+        }
+
+
+# Shared by every parser call path, so a bulk refresh and a manual refresh
+# of the same content share one upstream request
+parser_flights = SingleFlight()
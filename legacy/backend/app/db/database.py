@@ -1,10 +1,13 @@
 from sqlalchemy import create_engine, text
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
+import asyncio
 import os
 from dotenv import load_dotenv
 import logging
-from backend.app.models.models import User, Company, Link, LinkMetrics, MondayConnection, MondayConfig
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics, MondayConnection, MondayConfig
+# Installs the flush hook that keeps company_platform_rollup in step with link_metrics
+import backend.app.utils.rollups  # noqa: F401
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -18,23 +21,48 @@ SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
 if not SQLALCHEMY_DATABASE_URL:
     raise ValueError("DATABASE_URL environment variable is not set")
 
-try:
-    # Create engine with echo=True for debugging
-    engine = create_engine(SQLALCHEMY_DATABASE_URL, echo=True)
-    
-    # Test the connection
-    with engine.connect() as connection:
-        connection.execute(text("SELECT 1"))
-    logger.info("Database connection successful!")
-except Exception as e:
-    logger.error(f"Database connection failed: {str(e)}")
-    raise
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+def engine_options(url: str) -> dict:
+    """Engine keyword arguments from DB_* environment variables"""
+    options = {
+        "echo": _env_bool("DB_ECHO", False),
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        # SQLite connections are used from the worker threads too
+        options["connect_args"] = {"check_same_thread": False}
+    else:
+        options.update(
+            pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+        )
+    return options
+
+
+# Connections are opened lazily; use check_connection() to test the database
+engine = create_engine(SQLALCHEMY_DATABASE_URL, **engine_options(SQLALCHEMY_DATABASE_URL))
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Create base class for models
-Base = declarative_base()
+
+def check_connection() -> bool:
+    """Run SELECT 1 against the database"""
+    try:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        return True
+    except Exception as e:
+        logger.error(f"Database connection failed: {str(e)}")
+        return False
+
 
 def get_db():
     """Get database session."""
@@ -44,13 +72,100 @@ def get_db():
     finally:
         db.close()
 
+
+# ----------------------------------------------------------------- async mode
+#
+# With DB_ASYNC=true the hot read paths use an AsyncSession on asyncpg or
+# aiosqlite. Otherwise they get the regular Session wrapped in
+# SyncSessionAdapter, which exposes the same awaitable API and runs each call
+# in a worker thread, so handlers are written once against the async API.
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine = None
+_async_session_factory = None
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def get_async_engine():
+    """Create the AsyncEngine on first use; None when async mode is off or unavailable"""
+    global _async_engine, _async_session_factory
+    if _async_engine is None and _env_bool("DB_ASYNC", False):
+        try:
+            from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+            url = async_database_url(SQLALCHEMY_DATABASE_URL)
+            _async_engine = create_async_engine(url, **engine_options(url))
+            _async_session_factory = async_sessionmaker(_async_engine, class_=AsyncSession, expire_on_commit=False)
+            logger.info(f"Async database engine enabled ({make_url(url).drivername})")
+        except (ImportError, ValueError) as e:
+            logger.warning(f"DB_ASYNC is set but the async engine is unavailable, using threads: {str(e)}")
+            os.environ["DB_ASYNC"] = "false"
+    return _async_engine
+
+
+class SyncSessionAdapter:
+    """Awaitable facade over a synchronous Session (async API subset)"""
+
+    def __init__(self, session):
+        self.sync_session = session
+
+    async def execute(self, statement, *args, **kwargs):
+        return await asyncio.to_thread(self.sync_session.execute, statement, *args, **kwargs)
+
+    async def scalar(self, statement, *args, **kwargs):
+        return await asyncio.to_thread(self.sync_session.scalar, statement, *args, **kwargs)
+
+    async def get(self, entity, ident, **kwargs):
+        return await asyncio.to_thread(self.sync_session.get, entity, ident, **kwargs)
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await asyncio.to_thread(fn, self.sync_session, *args, **kwargs)
+
+    async def commit(self):
+        await asyncio.to_thread(self.sync_session.commit)
+
+    async def rollback(self):
+        await asyncio.to_thread(self.sync_session.rollback)
+
+    async def refresh(self, instance, *args, **kwargs):
+        await asyncio.to_thread(self.sync_session.refresh, instance, *args, **kwargs)
+
+    async def close(self):
+        await asyncio.to_thread(self.sync_session.close)
+
+    def add(self, instance):
+        self.sync_session.add(instance)
+
+
+async def get_async_db():
+    """Get a session with the AsyncSession API for the hot endpoints."""
+    if get_async_engine() is not None:
+        async with _async_session_factory() as session:
+            yield session
+    else:
+        db = SyncSessionAdapter(SessionLocal())
+        try:
+            yield db
+        finally:
+            await db.close()
+
+
 def init_db():
     """Initialize database tables."""
     try:
-        # Import all models here to ensure they are registered with Base
-        # Create all tables
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created successfully")
     except Exception as e:
         logger.error(f"Failed to create database tables: {str(e)}")
-        raise 
\ No newline at end of file
+        raise
@@ -0,0 +1,12 @@
+"""
+Background jobs: durable parse queue and its worker
+"""
+
+from .queue import (
+    PRIORITY_NEW_LINK,
+    PRIORITY_REFRESH,
+    PermanentJobError,
+    enqueue,
+    enqueue_many,
+    enqueue_stale,
+)
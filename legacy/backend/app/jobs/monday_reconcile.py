@@ -0,0 +1,485 @@
+"""
+Two-way reconciliation of a company's links with its Monday.com board.
+
+A run for one MondayConnection:
+
+1. reads the board page by page and compares each item with its row in
+   ``monday_item_snapshots``; only items whose ``updated_at`` moved past
+   the snapshot are diffed further;
+2. unlinks links whose item was deleted or archived on the board, so they
+   are created again;
+3. pushes the metrics of links changed since the ``reconciled_at``
+   watermark, of links whose item changed on the board and of links whose
+   last push failed, skipping items whose values already match;
+4. creates items for links that have none and archives items whose link
+   was deleted here.
+
+Writes go through MondayBatchWriter. Runs hold a lease on the connection
+row, so the job is safe to start every few minutes from several processes:
+
+    python -m backend.app.jobs.monday_reconcile [--connection-id N] [--interval SECONDS]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import bindparam, or_, update
+from sqlalchemy.orm import Session
+
+from backend.app.db.database import SessionLocal
+from backend.app.models.models import Link, LinkMetrics, MondayConnection, MondayItemSnapshot
+from backend.app.utils.monday_batch import ColumnUpdate, MondayBatchWriter, NewItem, record_sync_results
+from backend.app.utils.monday_items import iter_board_items
+from backend.app.utils.monday_sync import get_board_metadata
+
+logger = logging.getLogger(__name__)
+
+MONDAY_RECONCILE_INTERVAL = float(os.getenv("MONDAY_RECONCILE_INTERVAL", "300"))
+MONDAY_RECONCILE_LEASE = float(os.getenv("MONDAY_RECONCILE_LEASE", "900"))
+# Links younger than this are left to the push made when they were added
+MONDAY_RECONCILE_CREATE_DELAY = float(os.getenv("MONDAY_RECONCILE_CREATE_DELAY", "300"))
+
+# Keeps IN (...) lists well under every database's parameter limit
+CHUNK_SIZE = 500
+
+
+def _chunks(values: Sequence[Any], size: int = CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def parse_monday_time(value: Optional[str]) -> Optional[datetime]:
+    """Monday.com ISO timestamp as naive UTC"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+@dataclass
+class BoardItem:
+    name: Optional[str]
+    column_values: Dict[str, Optional[str]]
+    updated_at: Optional[datetime]
+
+
+@dataclass
+class ReconcileRun:
+    """State of one run, loaded when the lease is taken"""
+    connection: MondayConnection
+    columns: List[Tuple[str, str]]
+    started_at: datetime
+    # item id -> (link id, item updated_at) of the stored snapshot
+    snapshot: Dict[str, Tuple[Optional[int], Optional[datetime]]]
+    board_updated_at: Optional[datetime] = None
+    seen: Set[str] = field(default_factory=set)
+    changed: Dict[str, BoardItem] = field(default_factory=dict)
+
+    @property
+    def column_ids(self) -> Set[str]:
+        return {column_id for column_id, _ in self.columns}
+
+    def values(self, metrics: Any) -> Dict[str, str]:
+        return {column_id: str(getattr(metrics, name, None) or 0) for column_id, name in self.columns}
+
+
+@dataclass
+class ReconcilePlan:
+    updates: List[ColumnUpdate] = field(default_factory=list)
+    creates: List[NewItem] = field(default_factory=list)
+    archives: List[str] = field(default_factory=list)
+    unlinked: int = 0
+
+
+def claim(db: Session, connection_id: int, lease_seconds: float) -> bool:
+    """Take the connection's reconcile lease with a conditional UPDATE (commits)"""
+    now = datetime.utcnow()
+    result = db.execute(
+        update(MondayConnection)
+        .where(
+            MondayConnection.id == connection_id,
+            or_(MondayConnection.reconcile_locked_until.is_(None), MondayConnection.reconcile_locked_until < now),
+        )
+        .values(reconcile_locked_until=now + timedelta(seconds=lease_seconds), updated_at=MondayConnection.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def release(db: Session, connection_id: int, **watermarks: Any) -> None:
+    """Drop the lease and store the watermarks given (commits)"""
+    db.execute(
+        update(MondayConnection)
+        .where(MondayConnection.id == connection_id)
+        .values(reconcile_locked_until=None, updated_at=MondayConnection.updated_at, **watermarks)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def load_run(db: Session, connection_id: int) -> Optional[ReconcileRun]:
+    connection = db.get(MondayConnection, connection_id)
+    if connection is None or not connection.board_id or not connection.api_token or connection.company_id is None:
+        return None
+    columns = [
+        (column_id, name) for column_id, name in (
+            (connection.views_column_id, "views"),
+            (connection.likes_column_id, "likes"),
+            (connection.comments_column_id, "comments"),
+        ) if column_id
+    ]
+    snapshot = {
+        item_id: (link_id, item_updated_at)
+        for item_id, link_id, item_updated_at in db.query(
+            MondayItemSnapshot.item_id, MondayItemSnapshot.link_id, MondayItemSnapshot.item_updated_at
+        ).filter(MondayItemSnapshot.connection_id == connection_id)
+    }
+    db.expunge(connection)
+    return ReconcileRun(
+        connection=connection,
+        columns=columns,
+        started_at=datetime.utcnow(),
+        snapshot=snapshot,
+        board_updated_at=connection.board_updated_at,
+    )
+
+
+async def read_board(run: ReconcileRun, page_size: Optional[int] = None) -> None:
+    """Note every active item and keep the ones changed since the snapshot"""
+    connection = run.connection
+    column_ids = run.column_ids
+    async for item in iter_board_items(connection.api_token, connection.board_id, page_size):
+        if item.get("state") not in (None, "active"):
+            continue
+        item_id = str(item["id"])
+        run.seen.add(item_id)
+        updated_at = parse_monday_time(item.get("updated_at"))
+        known = run.snapshot.get(item_id)
+        if known is None or known[1] is None or updated_at is None or updated_at > known[1]:
+            run.changed[item_id] = BoardItem(
+                name=item.get("name"),
+                column_values={
+                    value["id"]: value.get("text") for value in item.get("column_values") or []
+                    if value["id"] in column_ids
+                },
+                updated_at=updated_at,
+            )
+        if updated_at and (run.board_updated_at is None or updated_at > run.board_updated_at):
+            run.board_updated_at = updated_at
+
+
+def _stored_values(db: Session, connection_id: int, item_ids: Sequence[str]) -> Dict[str, Dict[str, Optional[str]]]:
+    stored = {}
+    for chunk in _chunks(item_ids):
+        for item_id, column_values in db.query(MondayItemSnapshot.item_id, MondayItemSnapshot.column_values).filter(
+            MondayItemSnapshot.connection_id == connection_id, MondayItemSnapshot.item_id.in_(chunk)
+        ):
+            stored[item_id] = json.loads(column_values) if column_values else {}
+    return stored
+
+
+def _set_item_ids(db: Session, item_ids: Dict[int, Optional[str]]) -> None:
+    if not item_ids:
+        return
+    links = Link.__table__
+    db.execute(
+        links.update()
+        .where(links.c.id == bindparam("link_id"))
+        # Linking an item is not a change to the link itself
+        .values(monday_item_id=bindparam("item_id"), updated_at=links.c.updated_at),
+        [{"link_id": link_id, "item_id": item_id} for link_id, item_id in item_ids.items()],
+    )
+
+
+def plan(db: Session, run: ReconcileRun, create_delay: float = MONDAY_RECONCILE_CREATE_DELAY) -> ReconcilePlan:
+    """Work out what to write to the board; unlinks and forgets vanished items (commits)"""
+    connection = run.connection
+    result = ReconcilePlan()
+
+    # Items deleted or archived on the board (or never there). An item pushed
+    # while the board was being read may sit on a page already read, so a link
+    # is only unlinked when its item was seen by an earlier run or the link was
+    # last changed before this run started.
+    unlinked = [
+        link_id for link_id, item_id, updated_at in db.query(Link.id, Link.monday_item_id, Link.updated_at).filter(
+            Link.company_id == connection.company_id, Link.monday_item_id.isnot(None)
+        )
+        if item_id not in run.seen and (
+            item_id in run.snapshot or updated_at is None or updated_at <= run.started_at
+        )
+    ]
+    _set_item_ids(db, {link_id: None for link_id in unlinked})
+    result.unlinked = len(unlinked)
+    for chunk in _chunks([item_id for item_id in run.snapshot if item_id not in run.seen]):
+        db.query(MondayItemSnapshot).filter(
+            MondayItemSnapshot.connection_id == connection.id, MondayItemSnapshot.item_id.in_(chunk)
+        ).delete(synchronize_session=False)
+    db.commit()
+
+    # Items whose link was deleted here
+    result.archives = [
+        item_id for (item_id,) in db.query(MondayItemSnapshot.item_id)
+        .outerjoin(Link, Link.id == MondayItemSnapshot.link_id)
+        .filter(
+            MondayItemSnapshot.connection_id == connection.id,
+            MondayItemSnapshot.link_id.isnot(None),
+            Link.id.is_(None),
+        )
+        .order_by(MondayItemSnapshot.item_id)
+        if item_id in run.seen
+    ]
+
+    rows = (
+        db.query(Link.id, Link.url, Link.title, Link.monday_item_id, LinkMetrics.views, LinkMetrics.likes, LinkMetrics.comments)
+        .outerjoin(LinkMetrics, LinkMetrics.link_id == Link.id)
+        .filter(Link.company_id == connection.company_id)
+    )
+
+    # Updates: changed here, changed on the board, or failed last time
+    linked = rows.filter(Link.monday_item_id.isnot(None))
+    candidates = {}
+    if connection.reconciled_at is None:
+        candidates = {row.id: row for row in linked}
+    else:
+        watermark = connection.reconciled_at
+        for row in linked.filter(or_(
+            Link.updated_at > watermark, LinkMetrics.updated_at > watermark, Link.monday_sync_status == "error"
+        )):
+            candidates[row.id] = row
+        for chunk in _chunks(list(run.changed)):
+            for row in linked.filter(Link.monday_item_id.in_(chunk)):
+                candidates[row.id] = row
+    stored = _stored_values(db, connection.id, [
+        row.monday_item_id for row in candidates.values() if row.monday_item_id not in run.changed
+    ])
+    for link_id in sorted(candidates):
+        row = candidates[link_id]
+        desired = run.values(row)
+        board = run.changed[row.monday_item_id].column_values if row.monday_item_id in run.changed else stored.get(row.monday_item_id, {})
+        if any(board.get(column_id) != value for column_id, value in desired.items()):
+            result.updates.append(ColumnUpdate(link_id=row.id, item_id=row.monday_item_id, column_values=desired))
+
+    # Creates: links without an item, except very new ones
+    created_before = run.started_at - timedelta(seconds=create_delay)
+    for row in rows.filter(Link.monday_item_id.is_(None), Link.created_at <= created_before).order_by(Link.id):
+        result.creates.append(NewItem(link_id=row.id, name=row.title or row.url, column_values=run.values(row)))
+    return result
+
+
+def record(
+    db: Session,
+    run: ReconcileRun,
+    pushed: Dict[int, Optional[str]],
+    updates: Sequence[ColumnUpdate],
+    created: Dict[int, Tuple[Optional[str], Optional[str]]],
+    creates: Sequence[NewItem],
+    archived: Dict[str, Optional[str]],
+) -> None:
+    """Store sync outcomes, new item ids and the new board snapshot (commits)"""
+    connection_id = run.connection.id
+    now = datetime.utcnow()
+    _set_item_ids(db, {link_id: item_id for link_id, (item_id, error) in created.items() if item_id})
+    record_sync_results(db, {**pushed, **{link_id: error for link_id, (_, error) in created.items()}}, now)
+
+    gone = {item_id for item_id, error in archived.items() if error is None}
+    rows: Dict[str, Dict[str, Any]] = {}
+    for item_id, item in run.changed.items():
+        if item_id not in gone:
+            rows[item_id] = {"item_id": item_id, "name": item.name, "column_values": item.column_values,
+                             "item_updated_at": item.updated_at}
+    # What was pushed is on the board now
+    for column_update in updates:
+        if pushed.get(column_update.link_id) is None:
+            row = rows.setdefault(column_update.item_id, {"item_id": column_update.item_id})
+            row["column_values"] = column_update.column_values
+    for item in creates:
+        item_id, error = created.get(item.link_id, (None, None))
+        if item_id:
+            rows[item_id] = {"item_id": item_id, "name": item.name, "column_values": item.column_values,
+                             "item_updated_at": None, "link_id": item.link_id}
+
+    item_ids = list(rows)
+    for chunk in _chunks(item_ids):
+        for item_id, link_id in db.query(Link.monday_item_id, Link.id).filter(
+            Link.company_id == run.connection.company_id, Link.monday_item_id.in_(chunk)
+        ):
+            rows[item_id]["link_id"] = link_id
+    existing = {}
+    for chunk in _chunks(item_ids):
+        existing.update(db.query(MondayItemSnapshot.item_id, MondayItemSnapshot).filter(
+            MondayItemSnapshot.connection_id == connection_id, MondayItemSnapshot.item_id.in_(chunk)
+        ))
+    for item_id, row in rows.items():
+        snapshot = existing.get(item_id)
+        if snapshot is None:
+            snapshot = MondayItemSnapshot(connection_id=connection_id, item_id=item_id)
+            db.add(snapshot)
+        if "name" in row:
+            snapshot.name = row["name"]
+            snapshot.item_updated_at = row["item_updated_at"]
+        if "column_values" in row:
+            snapshot.column_values = json.dumps(row["column_values"], sort_keys=True)
+        # Keep the old link of an item whose link is gone, so it can still be archived
+        if row.get("link_id") is not None:
+            snapshot.link_id = row["link_id"]
+        snapshot.seen_at = now
+
+    for chunk in _chunks(list(gone)):
+        db.query(MondayItemSnapshot).filter(
+            MondayItemSnapshot.connection_id == connection_id, MondayItemSnapshot.item_id.in_(chunk)
+        ).delete(synchronize_session=False)
+    db.commit()
+
+
+async def reconcile_connection(
+    session_factory,
+    connection_id: int,
+    page_size: Optional[int] = None,
+    lease_seconds: Optional[float] = None,
+    create_delay: Optional[float] = None,
+    **writer_options,
+) -> Dict[str, Any]:
+    """Reconcile one connection's links with its board.
+
+    Returns counts of what was done; ``status`` is ``skipped`` when another
+    run holds the lease and ``not_configured`` when the connection has no
+    board, API token or company. Items and links that fail are retried by the
+    next run.
+    """
+    report: Dict[str, Any] = {
+        "connection_id": connection_id, "status": "skipped", "items": 0, "changed_items": 0,
+        "unlinked": 0, "updated": 0, "created": 0, "archived": 0, "failed": 0, "requests": 0,
+    }
+
+    def start():
+        db = session_factory()
+        try:
+            if not claim(db, connection_id, lease_seconds or MONDAY_RECONCILE_LEASE):
+                return None, False
+            return load_run(db, connection_id), True
+        finally:
+            db.close()
+
+    def in_session(fn, *args, **kwargs):
+        db = session_factory()
+        try:
+            return fn(db, *args, **kwargs)
+        finally:
+            db.close()
+
+    run, leased = await asyncio.to_thread(start)
+    if run is None:
+        if leased:
+            report["status"] = "not_configured"
+            await asyncio.to_thread(in_session, release, connection_id)
+        return report
+
+    watermarks: Dict[str, Any] = {}
+    try:
+        await read_board(run, page_size)
+        report["items"], report["changed_items"] = len(run.seen), len(run.changed)
+        work = await asyncio.to_thread(
+            in_session, plan, run,
+            MONDAY_RECONCILE_CREATE_DELAY if create_delay is None else create_delay,
+        )
+        report["unlinked"] = work.unlinked
+
+        connection = run.connection
+        writer = MondayBatchWriter(connection.api_token, connection.board_id, **writer_options)
+        pushed = await writer.push(work.updates)
+        created: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        if work.creates:
+            board = await get_board_metadata(connection)
+            if board.is_subitems and not board.parent_item_id:
+                error = "No parent item found in subitems board. Please create a parent item first."
+                created = {item.link_id: (None, error) for item in work.creates}
+            else:
+                created = await writer.create(work.creates, board.parent_item_id if board.is_subitems else None)
+        archived = await writer.archive(work.archives)
+        await asyncio.to_thread(in_session, record, run, pushed, work.updates, created, work.creates, archived)
+
+        report["updated"] = sum(1 for error in pushed.values() if error is None)
+        report["created"] = sum(1 for item_id, _ in created.values() if item_id)
+        report["archived"] = sum(1 for error in archived.values() if error is None)
+        report["failed"] = len(pushed) + len(created) + len(archived) - (
+            report["updated"] + report["created"] + report["archived"]
+        )
+        report["requests"] = writer.requests
+        report["status"] = "success"
+        # Changes made while this run was reading are caught by the next one
+        watermarks = {"reconciled_at": run.started_at, "board_updated_at": run.board_updated_at}
+    except Exception as e:
+        logger.error(f"Monday.com reconciliation of connection {connection_id} failed: {str(e)}", exc_info=True)
+        report["status"] = "error"
+        report["error"] = str(e)
+    finally:
+        await asyncio.to_thread(in_session, release, connection_id, **watermarks)
+
+    logger.info(
+        f"Monday.com reconciliation of connection {connection_id}: {report['updated']} updated, "
+        f"{report['created']} created, {report['archived']} archived, {report['unlinked']} unlinked, "
+        f"{report['failed']} failed in {report['requests']} requests"
+    )
+    return report
+
+
+async def reconcile_all(session_factory=SessionLocal, **options) -> List[Dict[str, Any]]:
+    """Reconcile every configured connection, one after another"""
+    def connection_ids():
+        db = session_factory()
+        try:
+            return [connection_id for (connection_id,) in db.query(MondayConnection.id).filter(
+                MondayConnection.board_id.isnot(None), MondayConnection.company_id.isnot(None)
+            ).order_by(MondayConnection.id)]
+        finally:
+            db.close()
+
+    reports = []
+    for connection_id in await asyncio.to_thread(connection_ids):
+        reports.append(await reconcile_connection(session_factory, connection_id, **options))
+    return reports
+
+
+async def _main(connection_id: Optional[int], interval: Optional[float]) -> None:
+    from backend.app.core.http_client import http_client
+
+    try:
+        while True:
+            if connection_id is not None:
+                reports = [await reconcile_connection(SessionLocal, connection_id)]
+            else:
+                reports = await reconcile_all()
+            for report in reports:
+                print(json.dumps(report))
+            if not interval:
+                break
+            await asyncio.sleep(interval)
+    finally:
+        await http_client.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    arg_parser = argparse.ArgumentParser(description="Reconcile links with their Monday.com boards")
+    arg_parser.add_argument("--connection-id", type=int, default=None, help="Only reconcile this connection")
+    arg_parser.add_argument(
+        "--interval", type=float, nargs="?", const=MONDAY_RECONCILE_INTERVAL, default=None,
+        help="Keep running, reconciling every INTERVAL seconds (default MONDAY_RECONCILE_INTERVAL)",
+    )
+    args = arg_parser.parse_args()
+    try:
+        asyncio.run(_main(args.connection_id, args.interval))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,107 @@
+"""
+Parse-link job handler: fetch a link's metrics and push them to Monday.com
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.app.db.database import SessionLocal, SyncSessionAdapter
+from backend.app.jobs.queue import PermanentJobError
+from backend.app.models.models import Link, LinkMetrics, MondayConnection
+from backend.app.parsers.parser_factory import ParserFactory
+from backend.app.utils.content_metrics import content_key, fresh_results, store_results
+from backend.app.utils.metrics_history import record_snapshots
+from backend.app.utils.monday_sync import push_link_to_monday
+
+logger = logging.getLogger(__name__)
+
+FALLBACK_TITLES = {
+    "youtube": "YouTube Video",
+    "tiktok": "TikTok Video",
+    "instagram": "Instagram Post",
+    "facebook": "Facebook Post",
+}
+
+
+def fallback_title(platform: str) -> str:
+    """Title shown for a link until (or unless) its parser returns one"""
+    return FALLBACK_TITLES.get(platform, f"{platform.title()} Content")
+
+
+def _store(db: Session, link: Link, key: Optional[str], parsed: Dict[str, Any], fetched: bool):
+    """Write the parsed metrics and history row (commits); returns the metrics and Monday.com connection"""
+    if fetched:
+        store_results(db, {key: parsed})
+    if key and link.content_key is None:
+        link.content_key = key
+
+    metrics = db.query(LinkMetrics).filter(LinkMetrics.link_id == link.id).first()
+    if not metrics:
+        metrics = LinkMetrics(link_id=link.id)
+        db.add(metrics)
+    metrics.views = parsed.get("views") or 0
+    metrics.likes = parsed.get("likes") or 0
+    metrics.comments = parsed.get("comments") or 0
+    metrics.updated_at = datetime.utcnow()
+
+    title = (parsed.get("title") or "").strip()
+    if title:
+        link.title = title
+    elif not link.title:
+        link.title = fallback_title(link.platform)
+    record_snapshots(db, [(link.id, metrics.views, metrics.likes, metrics.comments)], captured_at=metrics.updated_at)
+    db.commit()
+    # Load everything the Monday.com push reads here, not on the event loop
+    db.refresh(link)
+    db.refresh(metrics)
+    monday_connection = db.query(MondayConnection).filter(
+        MondayConnection.user_id == link.user_id,
+        MondayConnection.company_id == link.company_id
+    ).first()
+    return metrics, monday_connection
+
+
+async def parse_link(link_id: int, parser_factory: ParserFactory, session_factory=SessionLocal) -> None:
+    """Fetch metrics for one link and store them.
+
+    Raises on parser failure so the queue retries; existing metrics are left
+    untouched in that case rather than being overwritten with zeros. Database
+    work runs in threads, so a worker inside the API process does not block
+    its event loop.
+    """
+    db = SyncSessionAdapter(session_factory())
+    try:
+        link = await db.get(Link, link_id)
+        if not link:
+            logger.info(f"Link {link_id} no longer exists, dropping parse job")
+            return
+
+        parser = parser_factory.get_parser(url=link.url, platform=link.platform)
+        if not parser:
+            raise PermanentJobError(f"No parser found for platform: {link.platform}")
+
+        key = link.content_key or content_key(link.url)
+        # Another link of the same content may have been fetched moments ago
+        parsed = (await db.run_sync(fresh_results, [key])).get(key)
+        fetched = parsed is None
+        if fetched:
+            parsed = await parser_factory.parse_url(link.url, platform=link.platform)
+            if not parsed:
+                raise Exception(f"Empty parser result for {link.url}")
+            if parsed.get("error"):
+                raise Exception(parsed["error"])
+
+        metrics, monday_connection = await db.run_sync(_store, link, key, parsed, fetched)
+        logger.info(f"Updated metrics for link {link_id}: views={metrics.views}, likes={metrics.likes}, comments={metrics.comments}")
+
+        monday_sync_status, monday_error = await push_link_to_monday(link, metrics, monday_connection, db)
+        if monday_sync_status == 'error':
+            # The metrics are stored; the next refresh pushes them again
+            logger.warning(f"Monday.com sync failed for link {link_id}: {monday_error}")
+    except Exception:
+        await db.rollback()
+        raise
+    finally:
+        await db.close()
@@ -0,0 +1,294 @@
+"""
+Durable, database-backed queue of link parse jobs.
+
+Jobs live in the ``parse_jobs`` table so they survive restarts. A link has at
+most one active job (deduplicated by ``dedupe_key``); workers lease jobs with
+a visibility timeout so a crashed worker's jobs are picked up again. A
+running job's lease is extended by its worker's heartbeat.
+"""
+import logging
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, func, insert, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from backend.app.models.models import Link, LinkMetrics, ParseJob
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes: lower runs first
+PRIORITY_NEW_LINK = 0
+PRIORITY_REFRESH = 10
+
+DEFAULT_MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 600
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying the job cannot help"""
+
+
+@dataclass
+class ClaimedJob:
+    """A job leased by a worker"""
+    id: int
+    link_id: int
+    attempts: int
+    max_attempts: int
+
+
+def dedupe_key(link_id: int) -> str:
+    return f"link:{link_id}"
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Exponential backoff with jitter for the given number of attempts so far"""
+    delay = min(BACKOFF_BASE_SECONDS * (2 ** max(0, attempts - 1)), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+def _bump(job: ParseJob, priority: int) -> None:
+    # A duplicate request never delays the existing job, it can only speed it up
+    if priority < job.priority:
+        job.priority = priority
+
+
+def enqueue(
+    db: Session,
+    link_id: int,
+    priority: int = PRIORITY_REFRESH,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    commit: bool = True,
+) -> ParseJob:
+    """Queue a parse job for a link, reusing its active job if there is one.
+
+    With ``commit=False`` the job is only added to the session, so callers can
+    create a link and its job in the same transaction.
+    """
+    key = dedupe_key(link_id)
+    job = db.query(ParseJob).filter(ParseJob.dedupe_key == key).first()
+    if job:
+        _bump(job, priority)
+    else:
+        job = ParseJob(
+            link_id=link_id,
+            priority=priority,
+            status="queued",
+            max_attempts=max_attempts,
+            run_after=datetime.utcnow(),
+            dedupe_key=key,
+        )
+        db.add(job)
+    if commit:
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another request queued the same link concurrently
+            db.rollback()
+            job = db.query(ParseJob).filter(ParseJob.dedupe_key == key).first()
+            _bump(job, priority)
+            db.commit()
+    return job
+
+
+def enqueue_many(
+    db: Session,
+    link_ids: Iterable[int],
+    priority: int = PRIORITY_REFRESH,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    commit: bool = True,
+) -> int:
+    """Queue parse jobs for many links in one transaction; returns the number of new jobs.
+
+    With ``commit=False`` the jobs are only added to the session, as for ``enqueue``.
+    """
+    link_ids = list(dict.fromkeys(link_ids))
+    if not link_ids:
+        return 0
+    keys = [dedupe_key(link_id) for link_id in link_ids]
+    existing = {
+        job.link_id: job
+        for job in db.query(ParseJob).filter(ParseJob.dedupe_key.in_(keys)).all()
+    }
+    now = datetime.utcnow()
+    rows = []
+    for link_id in link_ids:
+        job = existing.get(link_id)
+        if job:
+            _bump(job, priority)
+            continue
+        rows.append({
+            "link_id": link_id,
+            "priority": priority,
+            "status": "queued",
+            "max_attempts": max_attempts,
+            "run_after": now,
+            "dedupe_key": dedupe_key(link_id),
+        })
+    if rows:
+        # One multi-row INSERT instead of a flush per job
+        db.execute(insert(ParseJob), rows)
+    created = len(rows)
+    if commit:
+        db.commit()
+    return created
+
+
+def enqueue_stale(db: Session, max_age_seconds: float, limit: Optional[int] = None) -> int:
+    """Queue periodic refreshes, behind new links, for links whose metrics are older
+    than ``max_age_seconds`` (or missing); returns the number of new jobs"""
+    cutoff = datetime.utcnow() - timedelta(seconds=max_age_seconds)
+    query = (
+        db.query(Link.id)
+        .outerjoin(LinkMetrics, LinkMetrics.link_id == Link.id)
+        .filter(or_(LinkMetrics.id.is_(None), LinkMetrics.updated_at < cutoff))
+        .order_by(Link.id)
+    )
+    if limit:
+        query = query.limit(limit)
+    return enqueue_many(db, [link_id for (link_id,) in query], priority=PRIORITY_REFRESH)
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(ParseJob.status == "queued", ParseJob.run_after <= now),
+        and_(
+            ParseJob.status == "running",
+            ParseJob.locked_until < now,
+            ParseJob.attempts < ParseJob.max_attempts,
+        ),
+    )
+
+
+def expire_exhausted(db: Session, now: Optional[datetime] = None) -> int:
+    """Fail jobs whose lease expired on their last attempt (commits).
+
+    ``fail()`` never runs for a job that killed its worker, so without this
+    such a job would be leased and retried forever.
+    """
+    now = now or datetime.utcnow()
+    result = db.execute(
+        update(ParseJob)
+        .where(
+            ParseJob.status == "running",
+            ParseJob.locked_until < now,
+            ParseJob.attempts >= ParseJob.max_attempts,
+        )
+        .values(
+            status="failed",
+            dedupe_key=None,
+            locked_by=None,
+            locked_until=None,
+            last_error="Lease expired on the last attempt",
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if result.rowcount:
+        logger.warning(f"Failed {result.rowcount} parse job(s) whose lease expired on their last attempt")
+    return result.rowcount
+
+
+def claim(db: Session, worker_id: str, limit: int, visibility_timeout: float) -> List[ClaimedJob]:
+    """Lease up to ``limit`` runnable jobs, highest priority first.
+
+    Each lease is taken with a conditional UPDATE, so two workers racing for
+    the same row cannot both win it.
+    """
+    if limit <= 0:
+        return []
+    now = datetime.utcnow()
+    expire_exhausted(db, now)
+    query = (
+        db.query(ParseJob.id)
+        .filter(_claimable(now))
+        .order_by(ParseJob.priority, ParseJob.run_after, ParseJob.id)
+        .limit(limit)
+    )
+    if db.bind.dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    candidate_ids = [row.id for row in query.all()]
+
+    claimed_ids = []
+    locked_until = now + timedelta(seconds=visibility_timeout)
+    for job_id in candidate_ids:
+        result = db.execute(
+            update(ParseJob)
+            .where(ParseJob.id == job_id, _claimable(now))
+            .values(
+                status="running",
+                locked_by=worker_id,
+                locked_until=locked_until,
+                attempts=ParseJob.attempts + 1,
+                updated_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            claimed_ids.append(job_id)
+    db.commit()
+
+    if not claimed_ids:
+        return []
+    rows = (
+        db.query(ParseJob.id, ParseJob.link_id, ParseJob.attempts, ParseJob.max_attempts)
+        .filter(ParseJob.id.in_(claimed_ids))
+        .order_by(ParseJob.priority, ParseJob.run_after, ParseJob.id)
+        .all()
+    )
+    return [ClaimedJob(id=row.id, link_id=row.link_id, attempts=row.attempts, max_attempts=row.max_attempts)
+            for row in rows]
+
+
+def extend_lease(db: Session, job_id: int, worker_id: str, visibility_timeout: float) -> bool:
+    """Push back the lease of a job this worker is still running; False if it was lost"""
+    now = datetime.utcnow()
+    result = db.execute(
+        update(ParseJob)
+        .where(ParseJob.id == job_id, ParseJob.status == "running", ParseJob.locked_by == worker_id)
+        .values(locked_until=now + timedelta(seconds=visibility_timeout), updated_at=now)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def complete(db: Session, job_id: int) -> None:
+    """Acknowledge a finished job by removing it from the queue"""
+    db.query(ParseJob).filter(ParseJob.id == job_id).delete(synchronize_session=False)
+    db.commit()
+
+
+def fail(db: Session, job_id: int, error: str, permanent: bool = False) -> Optional[ParseJob]:
+    """Record a failed attempt: reschedule with backoff, or give up for good"""
+    job = db.query(ParseJob).filter(ParseJob.id == job_id).first()
+    if not job:
+        return None
+    job.last_error = (error or "")[:2000]
+    job.locked_by = None
+    job.locked_until = None
+    if permanent or job.attempts >= job.max_attempts:
+        job.status = "failed"
+        # Free the dedupe slot so the link can be queued again later
+        job.dedupe_key = None
+        logger.warning(f"Parse job {job.id} for link {job.link_id} failed after {job.attempts} attempts: {error}")
+    else:
+        job.status = "queued"
+        job.run_after = datetime.utcnow() + timedelta(seconds=backoff_seconds(job.attempts))
+        logger.info(f"Parse job {job.id} for link {job.link_id} will retry at {job.run_after}: {error}")
+    db.commit()
+    return job
+
+
+def stats(db: Session) -> Dict[str, int]:
+    """Number of jobs per status"""
+    counts = {"queued": 0, "running": 0, "failed": 0}
+    for status, count in db.query(ParseJob.status, func.count(ParseJob.id)).group_by(ParseJob.status).all():
+        counts[status] = count
+    return counts
@@ -0,0 +1,233 @@
+"""
+Worker that drains the parse job queue.
+
+Runs inside the API process (started on app startup unless
+JOB_WORKER_INPROCESS=false) or standalone:
+
+    python -m backend.app.jobs.worker [--concurrency N] [--once]
+
+Periodic refreshes are queued in the lower-priority lane, e.g. from cron:
+
+    python -m backend.app.jobs.worker --enqueue-stale 86400 --once
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from backend.app.db.database import SessionLocal
+from backend.app.jobs import queue
+from backend.app.jobs.parse_link import parse_link
+from backend.app.parsers.parser_factory import ParserFactory
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Leases jobs from the queue and runs up to ``concurrency`` of them at once"""
+
+    def __init__(
+        self,
+        parser_factory: ParserFactory,
+        session_factory=SessionLocal,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        visibility_timeout: Optional[float] = None,
+        heartbeat_interval: Optional[float] = None,
+        handler: Optional[Callable[[int], Awaitable[None]]] = None,
+        worker_id: Optional[str] = None,
+    ):
+        self.parser_factory = parser_factory
+        self.session_factory = session_factory
+        self.concurrency = concurrency or int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))
+        self.poll_interval = poll_interval or float(os.getenv("JOB_POLL_INTERVAL", "1.0"))
+        self.visibility_timeout = visibility_timeout or float(os.getenv("JOB_VISIBILITY_TIMEOUT", "300"))
+        # Leases of running jobs are extended this often, so a slow job is not claimed twice
+        self.heartbeat_interval = heartbeat_interval or self.visibility_timeout / 3
+        self.handler = handler or self._parse_link
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.processed = 0
+        self.failed = 0
+        self._active: Set[asyncio.Task] = set()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def _parse_link(self, link_id: int) -> None:
+        await parse_link(link_id, self.parser_factory, session_factory=self.session_factory)
+
+    # ------------------------------------------------------------- lifecycle
+
+    def start(self) -> None:
+        """Start polling in the background of the running event loop"""
+        if self._task and not self._task.done():
+            return
+        self._stopping = False
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self.run())
+        logger.info(f"Job worker {self.worker_id} started (concurrency={self.concurrency})")
+
+    async def stop(self) -> None:
+        """Stop polling and wait for running jobs to finish"""
+        self._stopping = True
+        self.notify()
+        if self._task:
+            await self._task
+            self._task = None
+        logger.info(f"Job worker {self.worker_id} stopped")
+
+    def notify(self) -> None:
+        """Wake the worker immediately, e.g. right after a job was queued"""
+        if self._wake is not None:
+            self._wake.set()
+
+    # --------------------------------------------------------------- running
+
+    def _claim(self, limit: int):
+        db = self.session_factory()
+        try:
+            return queue.claim(db, self.worker_id, limit, self.visibility_timeout)
+        finally:
+            db.close()
+
+    def _finish(self, job_id: int, error: Optional[str] = None, permanent: bool = False) -> None:
+        db = self.session_factory()
+        try:
+            if error is None:
+                queue.complete(db, job_id)
+            else:
+                queue.fail(db, job_id, error, permanent=permanent)
+        finally:
+            db.close()
+
+    def _extend(self, job_id: int) -> bool:
+        db = self.session_factory()
+        try:
+            return queue.extend_lease(db, job_id, self.worker_id, self.visibility_timeout)
+        finally:
+            db.close()
+
+    async def _heartbeat(self, job: queue.ClaimedJob) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                if not await asyncio.to_thread(self._extend, job.id):
+                    logger.warning(f"Parse job {job.id} (link {job.link_id}): lease lost while running")
+                    return
+            except Exception as e:
+                logger.error(f"Parse job {job.id}: failed to extend lease: {str(e)}")
+
+    async def _run_handler(self, job: queue.ClaimedJob) -> None:
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await self.handler(job.link_id)
+        finally:
+            heartbeat.cancel()
+
+    async def _process(self, job: queue.ClaimedJob) -> None:
+        try:
+            await self._run_handler(job)
+        except queue.PermanentJobError as e:
+            self.failed += 1
+            await asyncio.to_thread(self._finish, job.id, str(e), True)
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Parse job {job.id} (link {job.link_id}, attempt {job.attempts}) failed: {str(e)}")
+            await asyncio.to_thread(self._finish, job.id, str(e) or type(e).__name__)
+        else:
+            self.processed += 1
+            await asyncio.to_thread(self._finish, job.id)
+
+    async def run_once(self) -> int:
+        """Claim one round of jobs, run them and return how many were claimed"""
+        jobs = await asyncio.to_thread(self._claim, self.concurrency - len(self._active))
+        for job in jobs:
+            task = asyncio.create_task(self._process(job))
+            self._active.add(task)
+            task.add_done_callback(self._job_done)
+        return len(jobs)
+
+    def _job_done(self, task: asyncio.Task) -> None:
+        self._active.discard(task)
+        # A free slot means another job can be claimed right away
+        self.notify()
+
+    async def run(self) -> None:
+        if self._wake is None:
+            self._wake = asyncio.Event()
+        while not self._stopping:
+            claimed = 0
+            if len(self._active) < self.concurrency:
+                try:
+                    claimed = await self.run_once()
+                except Exception as e:
+                    logger.error(f"Job worker {self.worker_id}: failed to claim jobs: {str(e)}", exc_info=True)
+            if claimed:
+                continue
+            self._wake.clear()
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        if self._active:
+            await asyncio.gather(*list(self._active), return_exceptions=True)
+
+    async def drain(self) -> None:
+        """Run until no runnable job is left (used by ``--once`` and tests)"""
+        while True:
+            claimed = await self.run_once()
+            if not claimed and not self._active:
+                return
+            if self._active:
+                await asyncio.wait(list(self._active), return_when=asyncio.FIRST_COMPLETED)
+
+    def metrics(self) -> Dict[str, object]:
+        return {
+            "worker_id": self.worker_id,
+            "running": self._task is not None and not self._task.done(),
+            "active_jobs": len(self._active),
+            "concurrency": self.concurrency,
+            "processed": self.processed,
+            "failed": self.failed,
+        }
+
+
+async def _main(concurrency: Optional[int], once: bool, enqueue_stale: Optional[float] = None) -> None:
+    from backend.app.core.http_client import http_client
+
+    if enqueue_stale is not None:
+        db = SessionLocal()
+        try:
+            queued = queue.enqueue_stale(db, enqueue_stale)
+        finally:
+            db.close()
+        print(f"Queued refreshes of {queued} links")
+    worker = JobWorker(ParserFactory(http_client=http_client), concurrency=concurrency)
+    try:
+        if once:
+            await worker.drain()
+        else:
+            worker.start()
+            await worker._task
+    finally:
+        await http_client.close()
+    print(f"Job worker finished: {worker.processed} processed, {worker.failed} failed")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    arg_parser = argparse.ArgumentParser(description="Process queued link parse jobs")
+    arg_parser.add_argument("--concurrency", type=int, default=None, help="Jobs run at the same time")
+    arg_parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    arg_parser.add_argument(
+        "--enqueue-stale", type=float, default=None, metavar="SECONDS",
+        help="First queue refreshes of links whose metrics are older than SECONDS",
+    )
+    args = arg_parser.parse_args()
+    try:
+        asyncio.run(_main(args.concurrency, args.once, args.enqueue_stale))
+    except KeyboardInterrupt:
+        pass
@@ -1,59 +1,69 @@
-from fastapi import FastAPI, Request, HTTPException, Depends, status, Cookie
+from fastapi import FastAPI, Request, HTTPException, Depends, Query, status, Cookie
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel, HttpUrl
-from backend.app.db.database import engine, Base, SessionLocal, get_db
+from backend.app.db.database import SessionLocal, get_db, get_async_db
 from datetime import datetime, timedelta
 from backend.app.parsers.parser_factory import ParserFactory
 from backend.app.parsers.youtube_parser import YouTubeParser
 from backend.app.parsers.tiktok_parser import TikTokParser
 from sqlalchemy import func
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from typing import Optional, List
 from jose import JWTError, jwt
 import os
 from dotenv import load_dotenv
-import aiohttp
 import json
 import re
 from bs4 import BeautifulSoup
 import requests
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 import logging
 from logging.handlers import RotatingFileHandler
 from backend.app.routers.stats import router as stats_router
-<<<<<<< HEAD
 from backend.app.routers.user_settings import router as user_settings_router
-=======
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
-from backend.app.utils.monday_sync import sync_link_to_monday
+from backend.app.utils.monday_sync import sync_link_to_monday, push_link_to_monday
+from backend.app.utils.monday_boards import board_cache
 from backend.app.core.auth import (
     SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES,
-    verify_password, get_password_hash, create_access_token, get_current_user
+    verify_password, get_password_hash, create_access_token, get_current_user,
+    aget_password_hash, averify_and_update_password, password_executor
 )
+from backend.app.core.http_client import http_client
+from backend.app.core.monday_client import MondayAPIError, monday_client
+from backend.app.core.principal_cache import principal_cache
+from backend.app.utils.refresh_engine import RefreshEngine
+from backend.app.utils.content_metrics import content_key, ensure_content
+from backend.app.utils.metrics_history import day_range, record_snapshots
+from backend.app.utils import export, link_import, link_listing, monday_items, report_queries
+from backend.app.utils.rollups import company_rollups
+from backend.app.utils.url_classifier import classify_url
+from backend.app.jobs.queue import PRIORITY_NEW_LINK, enqueue as enqueue_parse_job, stats as parse_job_stats
+from backend.app.jobs.parse_link import fallback_title
+from backend.app.jobs.worker import JobWorker
+from backend.app.jobs.monday_reconcile import reconcile_connection
 import traceback
 import asyncio
 from sqlalchemy.sql import select
 from sqlalchemy.orm import joinedload
 from pydantic import ConfigDict
 from backend.app.models.models import SocialLink, Platform, User, Company, Link, LinkMetrics, MondayConnection
-<<<<<<< HEAD
 from sqlalchemy.sql import text
-=======
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
 
 # Load environment variables
 load_dotenv()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
 # Initialize parser factory
-parser_factory = ParserFactory()
+parser_factory = ParserFactory(http_client=http_client)
+
+# Initialize bulk refresh engine
+refresh_engine = RefreshEngine(parser_factory)
+
+# Initialize parse job worker (runs in-process unless JOB_WORKER_INPROCESS=false)
+job_worker = JobWorker(parser_factory)
 
 # Configure logging
 log_dir = "logs"
@@ -85,6 +95,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Mount static files
@@ -96,12 +107,9 @@ templates = Jinja2Templates(directory="../../templates")
 # Mount Monday.com routes
 app.include_router(stats_router)
 
-<<<<<<< HEAD
 # Mount user settings routes
 app.include_router(user_settings_router)
 
-=======
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
 # Pydantic models for request/response
 class Token(BaseModel):
     access_token: str
@@ -195,98 +203,14 @@ class LinkSubmission(BaseModel):
 
 def validate_social_url(url: str) -> tuple[str, str]:
     """Validate and extract platform from social media URL."""
-<<<<<<< HEAD
-    logger.info(f"Validating social URL: '{url}'")
-    if not url:
-        raise ValueError("URL cannot be empty")
-    url = url.strip()
-    logger.info(f"Stripped URL: '{url}'")
-=======
     if not url:
         raise ValueError("URL cannot be empty")
-        
     url = url.strip()
-    
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
-    # YouTube URL patterns
-    youtube_patterns = [
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/watch\?v=[\w-]+',
-        r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/shorts\/[\w-]+',
-        r'(?:https?:\/\/)?youtu\.be\/[\w-]+'
-    ]
-<<<<<<< HEAD
-=======
-    
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
-    # TikTok URL patterns
-    tiktok_patterns = [
-        r'(?:https?:\/\/)?(?:www\.)?tiktok\.com\/@[\w.-]+\/video\/\d+',
-        r'(?:https?:\/\/)?(?:www\.)?tiktok\.com\/t\/[\w-]+',
-        r'(?:https?:\/\/)?vm\.tiktok\.com\/[\w-]+'
-    ]
-<<<<<<< HEAD
-=======
-    
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
-    # Instagram URL patterns
-    instagram_patterns = [
-        r'(?:https?:\/\/)?(?:www\.)?instagram\.com\/(?:p|reel)\/[\w-]+(?:\/.*)?(?:\?.*)?$',
-        r'(?:https?:\/\/)?(?:www\.)?instagram\.com\/reels\/[\w-]+(?:\/.*)?(?:\?.*)?$',
-        r'(?:https?:\/\/)?(?:www\.)?instagram\.com\/(?:stories|tv)\/[\w-]+(?:\/.*)?(?:\?.*)?$'
-    ]
-<<<<<<< HEAD
-    # Facebook URL patterns
-    facebook_patterns = [
-        r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/reel\/\d+',
-=======
-    
-    # Facebook URL patterns
-    facebook_patterns = [
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
-        r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/[\w.-]+\/videos\/\d+',
-        r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/watch\/\?v=\d+',
-        r'(?:https?:\/\/)?(?:www\.)?fb\.watch\/[\w-]+'
-    ]
-<<<<<<< HEAD
-    # Check each platform's patterns
-    for pattern in youtube_patterns:
-        if re.match(pattern, url):
-            logger.info(f"Matched YouTube pattern: {pattern}")
-            return url, "youtube"
-    for pattern in tiktok_patterns:
-        if re.match(pattern, url):
-            logger.info(f"Matched TikTok pattern: {pattern}")
-            return url, "tiktok"
-    for pattern in instagram_patterns:
-        if re.match(pattern, url):
-            logger.info(f"Matched Instagram pattern: {pattern}")
-            return url, "instagram"
-    for pattern in facebook_patterns:
-        if re.match(pattern, url):
-            logger.info(f"Matched Facebook pattern: {pattern}")
-            return url, "facebook"
-    logger.error(f"No pattern matched for URL: '{url}'")
-=======
-    
-    # Check each platform's patterns
-    for pattern in youtube_patterns:
-        if re.match(pattern, url):
-            return url, "youtube"
-            
-    for pattern in tiktok_patterns:
-        if re.match(pattern, url):
-            return url, "tiktok"
-            
-    for pattern in instagram_patterns:
-        if re.match(pattern, url):
-            return url, "instagram"
-            
-    for pattern in facebook_patterns:
-        if re.match(pattern, url):
-            return url, "facebook"
-    
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
-    raise ValueError("Invalid social media URL. Please provide a valid YouTube, TikTok, Instagram, or Facebook URL.")
+    classified = classify_url(url)
+    if classified is None:
+        logger.info(f"No pattern matched for URL: '{url}'")
+        raise ValueError("Invalid social media URL. Please provide a valid YouTube, TikTok, Instagram, or Facebook URL.")
+    return url, classified.platform
 
 def determine_platform(url: str) -> str:
     """Determine the platform from the URL."""
@@ -337,7 +261,11 @@ async def startup_event():
     
     # Initialize parser factory
     global parser_factory
-    parser_factory = ParserFactory()
+    parser_factory = ParserFactory(http_client=http_client)
+    refresh_engine.parser_factory = parser_factory
+    job_worker.parser_factory = parser_factory
+    if os.getenv("JOB_WORKER_INPROCESS", "true").lower() in ("1", "true", "yes"):
+        job_worker.start()
     
     # Create test user and company
     db = SessionLocal()
@@ -360,6 +288,13 @@ async def startup_event():
     finally:
         db.close()
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background workers and release pooled connections on shutdown."""
+    await job_worker.stop()
+    await http_client.close()
+    password_executor.shutdown(wait=False)
+
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log all requests."""
@@ -391,22 +326,30 @@ async def root(request: Request):
 async def login_page(request: Request):
     return templates.TemplateResponse("login.html", {"request": request})
 
-async def process_single_link(link: Link, db: Session):
-    """Process a single link to update its metrics."""
+async def process_single_link(link: Link, db: AsyncSession, force: bool = False) -> Optional[LinkMetrics]:
+    """Process a single link to update its metrics; returns the stored metrics.
+
+    Parser results are served from the result cache unless ``force`` is set.
+    On failure the link is reloaded after the rollback, so callers can keep
+    reading it.
+    """
+    link_id = link.id
     try:
         # Get the appropriate parser
         parser = parser_factory.get_parser(url=link.url, platform=link.platform)
         if not parser:
             logger.error(f"No parser found for platform: {link.platform} and url: {link.url}")
-            return
+            return None
         # Parse the link to get metrics
-        metrics = await parser.parse_url(link.url)
+        metrics = await parser_factory.parse_url(link.url, platform=link.platform, force=force)
         if not metrics:
             logger.error(f"Failed to parse link: {link.url}")
-            return
+            return None
         
         # Update or create metrics in the database
-        link_metrics = db.query(LinkMetrics).filter(LinkMetrics.link_id == link.id).first()
+        link_metrics = (await db.execute(
+            select(LinkMetrics).where(LinkMetrics.link_id == link.id)
+        )).scalars().first()
         
         if not link_metrics:
             link_metrics = LinkMetrics(link_id=link.id)
@@ -417,14 +360,20 @@ async def process_single_link(link: Link, db: Session):
         link_metrics.likes = metrics.get('likes', 0)
         link_metrics.comments = metrics.get('comments', 0)
         link_metrics.updated_at = datetime.utcnow()
+        snapshot = (link.id, link_metrics.views, link_metrics.likes, link_metrics.comments)
+        await db.run_sync(record_snapshots, [snapshot], captured_at=link_metrics.updated_at)
         
         # Commit changes
-        db.commit()
+        await db.commit()
         logger.info(f"Updated metrics for link {link.id}: {metrics}")
+        return link_metrics
             
     except Exception as e:
-        logger.error(f"Error processing link {link.id}: {str(e)}\n{traceback.format_exc()}")
-        db.rollback()
+        logger.error(f"Error processing link {link_id}: {str(e)}\n{traceback.format_exc()}")
+        await db.rollback()
+        # The rollback expired the link; an async session cannot lazy-load it
+        await db.refresh(link)
+        return None
 
 @app.post("/api/links/", response_model=LinkWithMetricsResponse)
 async def add_link(
@@ -432,11 +381,7 @@ async def add_link(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-<<<<<<< HEAD
-    """Add a new social media link with parsing first."""
-=======
-    """Add a new social media link."""
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
+    """Add a new social media link; metrics are fetched in the background."""
     try:
         # Log the raw request body
         logger.info(f"Received link submission: {link.dict()}")
@@ -458,296 +403,40 @@ async def add_link(
             logger.error(f"User {current_user.id} not authorized for company {link.company_id}")
             raise HTTPException(status_code=403, detail="Not authorized to add links to this company")
         
-<<<<<<< HEAD
-        # Parse the link FIRST and wait for response
-        parsed_title = None
-        parsed_metrics = None
-        try:
-            logger.info(f"Starting parser for URL: {url}")
-            parser = parser_factory.get_parser(url=url, platform=platform)
-            if parser:
-                logger.info(f"Parser found: {type(parser).__name__}")
-                parsed = await parser.parse_url(url)
-                logger.info(f"Parser response received: {parsed}")
-                
-                parsed_title = parsed.get("title")
-                parsed_metrics = {
-                    'views': parsed.get('views', 0),
-                    'likes': parsed.get('likes', 0),
-                    'comments': parsed.get('comments', 0)
-                }
-                logger.info(f"Parsed title: {parsed_title}")
-                logger.info(f"Parsed metrics: {parsed_metrics}")
-                
-                # If title is empty or None, try to create a fallback title
-                if not parsed_title or parsed_title.strip() == "":
-                    # Create a fallback title based on platform and URL
-                    if platform == "youtube":
-                        parsed_title = "YouTube Video"
-                    elif platform == "tiktok":
-                        parsed_title = "TikTok Video"
-                    elif platform == "instagram":
-                        parsed_title = "Instagram Post"
-                    elif platform == "facebook":
-                        parsed_title = "Facebook Post"
-                    else:
-                        parsed_title = f"{platform.title()} Content"
-                    
-                    logger.info(f"Using fallback title: {parsed_title}")
-            else:
-                logger.warning(f"No parser found for url={url}, platform={platform}")
-                # Create a fallback title
-                parsed_title = f"{platform.title()} Content"
-                parsed_metrics = {'views': 0, 'likes': 0, 'comments': 0}
-        except Exception as e:
-            logger.error(f"Error parsing link: {str(e)}")
-            # Create a fallback title even if parsing fails
-            parsed_title = f"{platform.title()} Content"
-            parsed_metrics = {'views': 0, 'likes': 0, 'comments': 0}
-            logger.info(f"Using fallback title after error: {parsed_title}")
-        
-        # NOW create the link in database after parsing is complete
-=======
-        # Create new link
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
+        # Store the link with empty metrics and queue the parse job in one
+        # transaction; the worker fetches metrics and syncs Monday.com.
         try:
+            key = content_key(url)
+            ensure_content(db, [key])
             new_link = Link(
                 url=url,
                 platform=platform.lower(),  # Ensure platform is lowercase
                 user_id=current_user.id,
-<<<<<<< HEAD
                 company_id=link.company_id,
-                title=parsed_title
-=======
-                company_id=link.company_id
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
+                title=fallback_title(platform.lower()),
+                content_key=key
             )
             db.add(new_link)
+            db.flush()
+            db.add(LinkMetrics(link_id=new_link.id, views=0, likes=0, comments=0))
+            enqueue_parse_job(db, new_link.id, priority=PRIORITY_NEW_LINK, commit=False)
             db.commit()
             db.refresh(new_link)
-            logger.info(f"Created new link with ID: {new_link.id}")
-            
-<<<<<<< HEAD
-            # Create metrics with the parsed data
-            metrics = LinkMetrics(
-                link_id=new_link.id,
-                views=parsed_metrics['views'],
-                likes=parsed_metrics['likes'],
-                comments=parsed_metrics['comments']
-=======
-            # Create initial metrics
-            metrics = LinkMetrics(
-                link_id=new_link.id,
-                views=0,
-                likes=0,
-                comments=0
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
-            )
-            db.add(metrics)
-            db.commit()
-            db.refresh(new_link)
-            
+            logger.info(f"Created new link with ID: {new_link.id}, parse job queued")
         except Exception as e:
             logger.error(f"Database error creating link: {str(e)}\n{traceback.format_exc()}")
             db.rollback()
             raise HTTPException(status_code=500, detail=f"Failed to create link in database: {str(e)}")
-        
-<<<<<<< HEAD
-=======
-        # Process the link asynchronously
-        try:
-            asyncio.create_task(process_single_link(new_link, db))
-            logger.info(f"Started async processing for link: {new_link.id}")
-        except Exception as e:
-            logger.error(f"Error starting async processing: {str(e)}\n{traceback.format_exc()}")
-            # Don't raise here, as the link was created successfully
-        
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
-        # Sync to Monday.com
-        monday_sync_status = 'not_configured'
-        monday_error = None
-        try:
-            # Get Monday.com configuration
-            monday_connection = db.query(MondayConnection).filter(
-                MondayConnection.user_id == current_user.id,
-                MondayConnection.company_id == link.company_id
-            ).first()
 
-            if monday_connection and monday_connection.board_id:
-                logger.info(f"Syncing new link to Monday.com for link ID: {new_link.id}")
-                
-                # Get the updated link with metrics after async processing
-                db.refresh(new_link)
-                metrics = db.query(LinkMetrics).filter(LinkMetrics.link_id == new_link.id).first()
-                
-                # Prepare column values
-                column_values = {
-                    monday_connection.views_column_id: str(metrics.views if metrics else 0),
-                    monday_connection.likes_column_id: str(metrics.likes if metrics else 0),
-                    monday_connection.comments_column_id: str(metrics.comments if metrics else 0)
-                }
+        job_worker.notify()
+
+        monday_connection = db.query(MondayConnection).filter(
+            MondayConnection.user_id == current_user.id,
+            MondayConnection.company_id == link.company_id
+        ).first()
+        monday_sync_status = 'pending' if monday_connection and monday_connection.board_id else 'not_configured'
+        monday_error = None
 
-                # Create item in Monday.com
-                headers = {
-                    "Authorization": monday_connection.api_token,
-                    "Content-Type": "application/json"
-                }
-                
-                # First, let's check if this is a subitems board by trying to get board info
-                board_query = """
-                query ($boardId: ID!) {
-                    boards(ids: [$boardId]) {
-                        id
-                        name
-                        board_kind
-                    }
-                }
-                """
-                
-                board_variables = {
-                    "boardId": monday_connection.board_id
-                }
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(
-                        "https://api.monday.com/v2",
-                        json={"query": board_query, "variables": board_variables},
-                        headers=headers
-                    ) as board_response:
-                        board_data = await board_response.json()
-                        is_subitems_board = False
-                        
-                        if "data" in board_data and board_data["data"]["boards"]:
-                            board_info = board_data["data"]["boards"][0]
-                            is_subitems_board = board_info.get("board_kind") == "subitems"
-                            logger.info(f"Board type: {board_info.get('board_kind')}")
-                        
-                        # Use appropriate mutation based on board type
-                        if is_subitems_board:
-                            # For subitems boards, we need a parent item ID
-                            # Let's try to find an existing parent item or create one
-                            parent_query = """
-                            query ($boardId: ID!) {
-                                boards(ids: [$boardId]) {
-                                    items {
-                                        id
-                                        name
-                                    }
-                                }
-                            }
-                            """
-                            
-                            async with session.post(
-                                "https://api.monday.com/v2",
-                                json={"query": parent_query, "variables": board_variables},
-                                headers=headers
-                            ) as parent_response:
-                                parent_data = await parent_response.json()
-                                parent_item_id = None
-                                
-                                if "data" in parent_data and parent_data["data"]["boards"]:
-                                    items = parent_data["data"]["boards"][0].get("items", [])
-                                    if items:
-                                        parent_item_id = items[0]["id"]
-                                        logger.info(f"Using parent item: {parent_item_id}")
-                                
-                                if parent_item_id:
-                                    mutation = """
-                                    mutation ($parentId: ID!, $itemName: String!, $columnValues: JSON!) {
-                                        create_subitem (
-                                            parent_item_id: $parentId,
-                                            item_name: $itemName,
-                                            column_values: $columnValues
-                                        ) {
-                                            id
-                                        }
-                                    }
-                                    """
-                                    
-                                    variables = {
-                                        "parentId": parent_item_id,
-                                        "itemName": new_link.title or new_link.url,
-                                        "columnValues": json.dumps(column_values)
-                                    }
-                                else:
-                                    # No parent item found, can't create subitem
-                                    monday_sync_status = 'error'
-                                    monday_error = "No parent item found in subitems board. Please create a parent item first."
-                                    logger.error(monday_error)
-                                    return {
-                                        "message": "Link added successfully",
-                                        "id": new_link.id,
-                                        "url": new_link.url,
-                                        "platform": new_link.platform,
-                                        "title": new_link.title,
-                                        "user_id": new_link.user_id,
-                                        "company_id": new_link.company_id,
-                                        "created_at": new_link.created_at,
-                                        "monday_item_id": new_link.monday_item_id,
-                                        "metrics": {
-                                            "views": metrics.views if metrics else 0,
-                                            "likes": metrics.likes if metrics else 0,
-                                            "comments": metrics.comments if metrics else 0,
-                                            "updated_at": metrics.updated_at if metrics else None
-                                        } if metrics else None,
-                                        "monday_sync_status": monday_sync_status,
-                                        "monday_error": monday_error
-                                    }
-                        else:
-                            # Regular board
-                            mutation = """
-                            mutation ($boardId: ID!, $itemName: String!, $columnValues: JSON!) {
-                                create_item (
-                                    board_id: $boardId,
-                                    item_name: $itemName,
-                                    column_values: $columnValues
-                                ) {
-                                    id
-                                }
-                            }
-                            """
-                            
-                            variables = {
-                                "boardId": monday_connection.board_id,
-                                "itemName": new_link.title or new_link.url,
-                                "columnValues": json.dumps(column_values)
-                            }
-                        
-                        # Execute the mutation
-                        async with session.post(
-                            "https://api.monday.com/v2",
-                            json={"query": mutation, "variables": variables},
-                            headers=headers
-                        ) as response:
-                            if response.status != 200:
-                                monday_sync_status = 'error'
-                                monday_error = f"Failed to create Monday.com item (status {response.status})"
-                                logger.error(monday_error)
-                                data = await response.text()
-                                logger.error(data)
-                            else:
-                                data = await response.json()
-                                if "errors" in data:
-                                    monday_sync_status = 'error'
-                                    monday_error = data["errors"][0]["message"]
-                                    logger.error(monday_error)
-                                else:
-                                    # Store Monday.com item ID
-                                    if is_subitems_board:
-                                        monday_item_id = data["data"]["create_subitem"]["id"]
-                                    else:
-                                        monday_item_id = data["data"]["create_item"]["id"]
-                                    new_link.monday_item_id = monday_item_id
-                                    db.commit()
-                                    logger.info(f"Successfully created Monday.com item: {monday_item_id}")
-                                    monday_sync_status = 'success'
-            else:
-                monday_sync_status = 'not_configured'
-        except Exception as e:
-            logger.error(f"Error syncing to Monday.com: {str(e)}", exc_info=True)
-            monday_sync_status = 'error'
-            monday_error = str(e)
-        
         # Fetch metrics for the new link
         metrics = db.query(LinkMetrics).filter(LinkMetrics.link_id == new_link.id).first()
         return {
@@ -775,56 +464,113 @@ async def add_link(
         logger.error(f"Unexpected error adding link: {str(e)}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@app.post("/api/companies/{company_id}/links:bulk")
+async def bulk_add_links(
+    company_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Add many links to a company; metrics are fetched in the background.
+
+    Accepts a JSON body ``{"urls": [...]}``, a CSV body (text/csv) or a
+    multipart upload with a CSV ``file``. Returns one result per row.
+    """
+    company = db.query(Company).filter(Company.id == company_id).first()
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    if company.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to add links to this company")
+
+    content_type = request.headers.get("content-type", "")
+    try:
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form.get("file")
+            if upload is None or isinstance(upload, str):
+                raise HTTPException(status_code=400, detail="Upload a CSV file in the 'file' field")
+            urls = link_import.urls_from_csv((await upload.read()).decode("utf-8-sig"))
+        elif content_type.startswith("text/csv") or content_type.startswith("text/plain"):
+            urls = link_import.urls_from_csv((await request.body()).decode("utf-8-sig"))
+        else:
+            body = await request.json()
+            urls = body.get("urls") if isinstance(body, dict) else None
+            if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+                raise HTTPException(status_code=400, detail="Body must be {\"urls\": [\"...\"]}")
+    except (UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Could not read the submitted links")
+
+    if not urls:
+        raise HTTPException(status_code=400, detail="No links submitted")
+    if len(urls) > link_import.MAX_BULK_LINKS:
+        raise HTTPException(status_code=413, detail=f"At most {link_import.MAX_BULK_LINKS} links per import")
+
+    try:
+        report = link_import.import_links(db, company_id, current_user.id, urls)
+    except Exception as e:
+        logger.error(f"Database error importing links: {str(e)}\n{traceback.format_exc()}")
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Failed to import links")
+    logger.info(
+        f"Imported links for company {company_id}: {report['created']} created, "
+        f"{report['duplicates']} duplicates, {report['invalid']} invalid"
+    )
+    if report["created"]:
+        job_worker.notify()
+    return report
+
 @app.get("/api/links/", response_model=List[LinkWithMetricsResponse])
 async def get_links(
     company_id: int,
-    db: Session = Depends(get_db),
+    limit: int = Query(link_listing.DEFAULT_PAGE_SIZE, ge=1, le=link_listing.MAX_PAGE_SIZE),
+    after_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    sort: str = Query("id", pattern="^(id|views|likes|updated_at)$"),
+    order: Optional[str] = Query(None, pattern="^(asc|desc)$"),
+    platform: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get all links for a company."""
+    """Get one page of a company's links.
+
+    Pages continue after ``cursor`` (from the X-Next-Cursor header of the
+    previous page) or after the link ``after_id``; the header is absent on
+    the last page.
+    """
     try:
         logger.info(f"Fetching links for company_id: {company_id}")
         
         # Verify company exists and user has access
-        company = db.query(Company).filter(Company.id == company_id).first()
-        if not company:
+        owner_id = (await db.execute(select(Company.owner_id).where(Company.id == company_id))).scalar()
+        if owner_id is None:
             logger.error(f"Company not found: {company_id}")
             raise HTTPException(status_code=404, detail="Company not found")
             
-        if company.owner_id != current_user.id:
+        if owner_id != current_user.id:
             logger.error(f"User {current_user.id} not authorized for company {company_id}")
             raise HTTPException(status_code=403, detail="Not authorized to view this company's links")
         
-        # Get links with metrics using eager loading
-        links = (
-            db.query(Link)
-            .options(joinedload(Link.metrics))
-            .filter(Link.company_id == company_id)
-            .all()
-        )
-        
-        # Convert to response format
-        response = []
-        for link in links:
-            link_data = {
-                "id": link.id,
-                "url": link.url,
-                "platform": link.platform,
-                "title": link.title,
-                "user_id": link.user_id,
-                "company_id": link.company_id,
-                "created_at": link.created_at,
-                "monday_item_id": link.monday_item_id,
-                "metrics": {
-                    "views": link.metrics.views if link.metrics else 0,
-                    "likes": link.metrics.likes if link.metrics else 0,
-                    "comments": link.metrics.comments if link.metrics else 0,
-                    "updated_at": link.metrics.updated_at if link.metrics else None
-                } if link.metrics else None
-            }
-            response.append(link_data)
+        after = None
+        if cursor:
+            try:
+                after = link_listing.decode_cursor(cursor, sort)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        elif after_id is not None:
+            anchor = (await db.execute(link_listing.anchor_query(after_id, sort))).first()
+            if anchor is None:
+                raise HTTPException(status_code=400, detail="after_id does not match a link")
+            after = (anchor[0], after_id)
         
-        return response
+        # Projected columns only; rows are serialized without ORM objects or model validation
+        rows = (await db.execute(
+            link_listing.links_page_query(company_id, sort, order, limit, after, platform)
+        )).all()
+        items, next_cursor = link_listing.build_page(rows, sort, limit)
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return JSONResponse(content=items, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting links: {str(e)}\n{traceback.format_exc()}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -882,6 +628,44 @@ async def debug_company(
         logger.error(f"Debug endpoint error: {str(e)}\n{traceback.format_exc()}")
         return {"error": str(e)}
 
+@app.get("/api/debug/http-client")
+async def debug_http_client(current_user: User = Depends(get_current_user)):
+    """Connection pool metrics for the shared outbound HTTP client."""
+    return http_client.metrics()
+
+@app.get("/api/debug/auth-cache")
+async def debug_auth_cache(current_user: User = Depends(get_current_user)):
+    """Hit/miss counters of the authenticated-user cache."""
+    return principal_cache.metrics()
+
+@app.get("/api/debug/parser-cache")
+async def debug_parser_cache(current_user: User = Depends(get_current_user)):
+    """Hit/miss counters of the parser result cache."""
+    return parser_factory.cache.metrics()
+
+@app.get("/api/debug/single-flight")
+async def debug_single_flight(current_user: User = Depends(get_current_user)):
+    """How many parser calls were coalesced into an in-flight call."""
+    return parser_factory.flights.metrics()
+
+@app.get("/api/debug/monday-board-cache")
+async def debug_monday_board_cache(current_user: User = Depends(get_current_user)):
+    """Hit/miss counters of the Monday.com board metadata cache."""
+    return board_cache.metrics()
+
+@app.get("/api/debug/monday-client")
+async def debug_monday_client(current_user: User = Depends(get_current_user)):
+    """Monday.com request queue depth, rate limits and time spent throttled."""
+    return monday_client.metrics()
+
+@app.get("/api/debug/job-queue")
+async def debug_job_queue(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Parse job queue depth and in-process worker counters."""
+    return {"jobs": parse_job_stats(db), "worker": job_worker.metrics()}
+
 @app.get("/api/stats/")
 async def get_stats():
     """Get overall statistics."""
@@ -1015,17 +799,25 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
         (User.username == form_data.username) | (User.email == form_data.username)
     ).first()
     
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    verified, new_hash = (
+        await averify_and_update_password(form_data.password, user.hashed_password) if user else (False, None)
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # The work factor changed since this hash was made
+        user.hashed_password = new_hash
+        db.commit()
+        principal_cache.invalidate(user)
     
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, "uid": user.id}, expires_delta=access_token_expires
     )
     
     return {"access_token": access_token, "token_type": "bearer"}
@@ -1084,13 +876,14 @@ async def delete_company(
 @app.post("/api/links/{link_id}/refresh")
 async def refresh_link(
     link_id: int,
-    db: Session = Depends(get_db),
+    force: bool = Query(False, description="Bypass the parser result cache"),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Refresh metrics for a single link."""
+    """Refresh metrics for a single link; ``force=true`` always calls the upstream API."""
     try:
         # Get the link
-        link = db.query(Link).filter(Link.id == link_id).first()
+        link = await db.get(Link, link_id)
         if not link:
             raise HTTPException(status_code=404, detail="Link not found")
             
@@ -1099,239 +892,23 @@ async def refresh_link(
             raise HTTPException(status_code=403, detail="Not authorized to refresh this link")
             
         # Process the link
-        await process_single_link(link, db)
-        
-        # Refresh the link to get updated metrics
-        db.refresh(link)
-        metrics = db.query(LinkMetrics).filter(LinkMetrics.link_id == link_id).first()
+        metrics = await process_single_link(link, db, force=force)
+        if metrics is None:
+            metrics = (await db.execute(
+                select(LinkMetrics).where(LinkMetrics.link_id == link_id)
+            )).scalars().first()
         
         # Sync to Monday.com
-        monday_sync_status = 'not_configured'
-        monday_error = None
-        try:
-            # Get Monday.com configuration
-            monday_connection = db.query(MondayConnection).filter(
+        monday_connection = (await db.execute(
+            select(MondayConnection).where(
                 MondayConnection.user_id == current_user.id,
                 MondayConnection.company_id == link.company_id
-            ).first()
-
-            if monday_connection and monday_connection.board_id:
-                logger.info(f"Syncing refreshed link to Monday.com for link ID: {link_id}")
-                
-                # Prepare column values
-                column_values = {
-                    monday_connection.views_column_id: str(metrics.views if metrics else 0),
-                    monday_connection.likes_column_id: str(metrics.likes if metrics else 0),
-                    monday_connection.comments_column_id: str(metrics.comments if metrics else 0)
-                }
+            )
+        )).scalars().first()
+        if monday_connection and monday_connection.board_id:
+            logger.info(f"Syncing refreshed link to Monday.com for link ID: {link_id}")
+        monday_sync_status, monday_error = await push_link_to_monday(link, metrics, monday_connection, db)
 
-                if link.monday_item_id:
-                    # Update existing item
-                    headers = {
-                        "Authorization": monday_connection.api_token,
-                        "Content-Type": "application/json"
-                    }
-                    
-                    mutation = """
-                    mutation ($itemId: ID!, $columnValues: JSON!) {
-                        change_multiple_column_values (
-                            item_id: $itemId,
-                            board_id: %s,
-                            column_values: $columnValues
-                        ) {
-                            id
-                        }
-                    }
-                    """ % monday_connection.board_id
-                    
-                    variables = {
-                        "itemId": link.monday_item_id,
-                        "columnValues": json.dumps(column_values)
-                    }
-                    
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(
-                            "https://api.monday.com/v2",
-                            json={"query": mutation, "variables": variables},
-                            headers=headers
-                        ) as response:
-                            if response.status != 200:
-                                monday_sync_status = 'error'
-                                monday_error = f"Failed to update Monday.com item (status {response.status})"
-                                logger.error(monday_error)
-                                data = await response.text()
-                                logger.error(data)
-                            else:
-                                data = await response.json()
-                                if "errors" in data:
-                                    monday_sync_status = 'error'
-                                    monday_error = data["errors"][0]["message"]
-                                    logger.error(monday_error)
-                                else:
-                                    logger.info(f"Successfully updated Monday.com item: {link.monday_item_id}")
-                                    monday_sync_status = 'success'
-                else:
-                    # Create new item - check if it's a subitems board
-                    headers = {
-                        "Authorization": monday_connection.api_token,
-                        "Content-Type": "application/json"
-                    }
-                    
-                    # First, let's check if this is a subitems board by trying to get board info
-                    board_query = """
-                    query ($boardId: ID!) {
-                        boards(ids: [$boardId]) {
-                            id
-                            name
-                            board_kind
-                        }
-                    }
-                    """
-                    
-                    board_variables = {
-                        "boardId": monday_connection.board_id
-                    }
-                    
-                    async with aiohttp.ClientSession() as session:
-                        async with session.post(
-                            "https://api.monday.com/v2",
-                            json={"query": board_query, "variables": board_variables},
-                            headers=headers
-                        ) as board_response:
-                            board_data = await board_response.json()
-                            is_subitems_board = False
-                            
-                            if "data" in board_data and board_data["data"]["boards"]:
-                                board_info = board_data["data"]["boards"][0]
-                                is_subitems_board = board_info.get("board_kind") == "subitems"
-                                logger.info(f"Board type: {board_info.get('board_kind')}")
-                            
-                            # Use appropriate mutation based on board type
-                            if is_subitems_board:
-                                # For subitems boards, we need a parent item ID
-                                # Let's try to find an existing parent item or create one
-                                parent_query = """
-                                query ($boardId: ID!) {
-                                    boards(ids: [$boardId]) {
-                                        items {
-                                            id
-                                            name
-                                        }
-                                    }
-                                }
-                                """
-                                
-                                async with session.post(
-                                    "https://api.monday.com/v2",
-                                    json={"query": parent_query, "variables": board_variables},
-                                    headers=headers
-                                ) as parent_response:
-                                    parent_data = await parent_response.json()
-                                    parent_item_id = None
-                                    
-                                    if "data" in parent_data and parent_data["data"]["boards"]:
-                                        items = parent_data["data"]["boards"][0].get("items", [])
-                                        if items:
-                                            parent_item_id = items[0]["id"]
-                                            logger.info(f"Using parent item: {parent_item_id}")
-                                
-                                    if parent_item_id:
-                                        mutation = """
-                                        mutation ($parentId: ID!, $itemName: String!, $columnValues: JSON!) {
-                                            create_subitem (
-                                                parent_item_id: $parentId,
-                                                item_name: $itemName,
-                                                column_values: $columnValues
-                                            ) {
-                                                id
-                                            }
-                                        }
-                                        """
-                                        
-                                        variables = {
-                                            "parentId": parent_item_id,
-                                            "itemName": link.title or link.url,
-                                            "columnValues": json.dumps(column_values)
-                                        }
-                                    else:
-                                        # No parent item found, can't create subitem
-                                        monday_sync_status = 'error'
-                                        monday_error = "No parent item found in subitems board. Please create a parent item first."
-                                        logger.error(monday_error)
-                                        return {
-                                            "message": "Link refreshed successfully",
-                                            "id": link.id,
-                                            "url": link.url,
-                                            "platform": link.platform,
-                                            "title": link.title,
-                                            "user_id": link.user_id,
-                                            "company_id": link.company_id,
-                                            "created_at": link.created_at,
-                                            "monday_item_id": link.monday_item_id,
-                                            "metrics": {
-                                                "views": metrics.views if metrics else 0,
-                                                "likes": metrics.likes if metrics else 0,
-                                                "comments": metrics.comments if metrics else 0,
-                                                "updated_at": metrics.updated_at if metrics else None
-                                            } if metrics else None,
-                                            "monday_sync_status": monday_sync_status,
-                                            "monday_error": monday_error
-                                        }
-                            else:
-                                # Regular board
-                                mutation = """
-                                mutation ($boardId: ID!, $itemName: String!, $columnValues: JSON!) {
-                                    create_item (
-                                        board_id: $boardId,
-                                        item_name: $itemName,
-                                        column_values: $columnValues
-                                    ) {
-                                        id
-                                    }
-                                }
-                                """
-                                
-                                variables = {
-                                    "boardId": monday_connection.board_id,
-                                    "itemName": link.title or link.url,
-                                    "columnValues": json.dumps(column_values)
-                                }
-                            
-                            # Execute the mutation
-                            async with session.post(
-                                "https://api.monday.com/v2",
-                                json={"query": mutation, "variables": variables},
-                                headers=headers
-                            ) as response:
-                                if response.status != 200:
-                                    monday_sync_status = 'error'
-                                    monday_error = f"Failed to create Monday.com item (status {response.status})"
-                                    logger.error(monday_error)
-                                    data = await response.text()
-                                    logger.error(data)
-                                else:
-                                    data = await response.json()
-                                    if "errors" in data:
-                                        monday_sync_status = 'error'
-                                        monday_error = data["errors"][0]["message"]
-                                        logger.error(monday_error)
-                                    else:
-                                        # Store Monday.com item ID
-                                        if is_subitems_board:
-                                            monday_item_id = data["data"]["create_subitem"]["id"]
-                                        else:
-                                            monday_item_id = data["data"]["create_item"]["id"]
-                                        link.monday_item_id = monday_item_id
-                                        db.commit()
-                                        logger.info(f"Successfully created Monday.com item: {monday_item_id}")
-                                        monday_sync_status = 'success'
-            else:
-                monday_sync_status = 'not_configured'
-        except Exception as e:
-            logger.error(f"Error syncing to Monday.com: {str(e)}", exc_info=True)
-            monday_sync_status = 'error'
-            monday_error = str(e)
-        
         return {
             "message": "Link refreshed successfully",
             "id": link.id,
@@ -1343,18 +920,112 @@ async def refresh_link(
             "created_at": link.created_at,
             "monday_item_id": link.monday_item_id,
             "metrics": {
-                "views": metrics.views if metrics else 0,
-                "likes": metrics.likes if metrics else 0,
-                "comments": metrics.comments if metrics else 0,
-                "updated_at": metrics.updated_at if metrics else None
+                "views": metrics.views,
+                "likes": metrics.likes,
+                "comments": metrics.comments,
+                "updated_at": metrics.updated_at
             } if metrics else None,
             "monday_sync_status": monday_sync_status,
             "monday_error": monday_error
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error refreshing link: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
 
+@app.post("/api/companies/{company_id}/refresh")
+async def refresh_company_links(
+    company_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Start a bulk refresh of all links of a company and return its job."""
+    company = db.query(Company).filter(Company.id == company_id).first()
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    if company.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to refresh this company")
+
+    job = refresh_engine.start_company_refresh(company_id, user_id=current_user.id)
+    logger.info(f"Started refresh job {job.id} for company {company_id}")
+    return job.to_dict()
+
+@app.post("/api/companies/{company_id}/monday/reconcile")
+async def reconcile_company_monday(
+    company_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Reconcile a company's links with its Monday.com board now and return what changed."""
+    company = db.query(Company).filter(Company.id == company_id).first()
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    if company.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to access this company")
+    monday_connection = db.query(MondayConnection).filter(
+        MondayConnection.company_id == company_id
+    ).first()
+    if not monday_connection or not monday_connection.board_id:
+        raise HTTPException(status_code=404, detail="No Monday.com board configured for this company")
+    if not monday_connection.api_token:
+        raise HTTPException(status_code=400, detail="Monday.com API token not configured")
+
+    report = await reconcile_connection(SessionLocal, monday_connection.id)
+    if report["status"] == "not_configured":
+        raise HTTPException(status_code=400, detail="Monday.com connection is not fully configured")
+    if report["status"] == "skipped":
+        raise HTTPException(status_code=409, detail="A reconciliation of this board is already running")
+    return report
+
+@app.get("/api/companies/{company_id}/export")
+async def export_company_links(
+    company_id: int,
+    format: str = Query("csv", pattern="^(csv|ndjson|parquet)$"),
+    history_start: Optional[str] = None,
+    history_end: Optional[str] = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Stream a company's links with their current metrics, or their snapshots
+    between history_start and history_end (YYYY-MM-DD, both inclusive)."""
+    company = db.query(Company).filter(Company.id == company_id).first()
+    if not company:
+        raise HTTPException(status_code=404, detail="Company not found")
+    if company.owner_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to export this company")
+    if format == "parquet" and export.pyarrow is None:
+        raise HTTPException(status_code=400, detail="Parquet export is not available on this server")
+
+    history = None
+    if history_start or history_end:
+        try:
+            start = datetime.strptime(history_start, "%Y-%m-%d") if history_start else datetime.utcnow()
+            end = datetime.strptime(history_end, "%Y-%m-%d") if history_end else datetime.utcnow()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="History dates must be YYYY-MM-DD")
+        history = day_range(start, end)
+
+    media_type = export.FORMATS[format][0]
+    filename = export.export_filename(company_id, format, history)
+    logger.info(f"Exporting links of company {company_id} as {format}")
+    return StreamingResponse(
+        export.stream_export(SessionLocal, company_id, format, history),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/api/refresh-jobs/{job_id}")
+async def get_refresh_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user)
+):
+    """Get progress of a bulk refresh job."""
+    job = refresh_engine.get_job(job_id)
+    if not job or job.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Refresh job not found")
+    return job.to_dict()
+
 @app.get("/monday")
 async def monday_page(request: Request):
     return templates.TemplateResponse("monday.html", {"request": request})
@@ -1391,43 +1062,7 @@ async def get_platform_performance_report(
         start = datetime.strptime(start_date, "%Y-%m-%d")
         end = datetime.strptime(end_date, "%Y-%m-%d")
         
-        # Get links for the company
-        links = db.query(Link).filter(Link.company_id == company_id).all()
-        
-        # Initialize platform stats
-        platform_stats = {
-            "YouTube": {"views": 0, "likes": 0, "comments": 0, "count": 0},
-            "TikTok": {"views": 0, "likes": 0, "comments": 0, "count": 0},
-            "Instagram": {"views": 0, "likes": 0, "comments": 0, "count": 0},
-            "Facebook": {"views": 0, "likes": 0, "comments": 0, "count": 0}
-        }
-        
-        # Aggregate metrics by platform
-        for link in links:
-            metrics = db.query(LinkMetrics).filter(
-                LinkMetrics.link_id == link.id,
-                LinkMetrics.updated_at >= start,
-                LinkMetrics.updated_at <= end
-            ).first()
-            
-            if metrics and link.platform in platform_stats:
-                platform_stats[link.platform]["views"] += metrics.views or 0
-                platform_stats[link.platform]["likes"] += metrics.likes or 0
-                platform_stats[link.platform]["comments"] += metrics.comments or 0
-                platform_stats[link.platform]["count"] += 1
-        
-        # Calculate averages
-        for platform in platform_stats:
-            if platform_stats[platform]["count"] > 0:
-                platform_stats[platform]["avg_views"] = platform_stats[platform]["views"] / platform_stats[platform]["count"]
-                platform_stats[platform]["avg_likes"] = platform_stats[platform]["likes"] / platform_stats[platform]["count"]
-                platform_stats[platform]["avg_comments"] = platform_stats[platform]["comments"] / platform_stats[platform]["count"]
-            else:
-                platform_stats[platform]["avg_views"] = 0
-                platform_stats[platform]["avg_likes"] = 0
-                platform_stats[platform]["avg_comments"] = 0
-        
-        return platform_stats
+        return report_queries.platform_performance(db, company_id, start, end)
     except Exception as e:
         logger.error(f"Error getting platform performance report: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -1453,39 +1088,7 @@ async def get_engagement_analysis_report(
         start = datetime.strptime(start_date, "%Y-%m-%d")
         end = datetime.strptime(end_date, "%Y-%m-%d")
         
-        # Get links for the company
-        links = db.query(Link).filter(Link.company_id == company_id).all()
-        
-        # Initialize engagement stats
-        engagement_stats = {
-            "total_views": 0,
-            "total_likes": 0,
-            "total_comments": 0,
-            "total_links": len(links),
-            "engagement_rate": 0
-        }
-        
-        # Aggregate metrics
-        for link in links:
-            metrics = db.query(LinkMetrics).filter(
-                LinkMetrics.link_id == link.id,
-                LinkMetrics.updated_at >= start,
-                LinkMetrics.updated_at <= end
-            ).first()
-            
-            if metrics:
-                engagement_stats["total_views"] += metrics.views or 0
-                engagement_stats["total_likes"] += metrics.likes or 0
-                engagement_stats["total_comments"] += metrics.comments or 0
-        
-        # Calculate engagement rate
-        if engagement_stats["total_views"] > 0:
-            engagement_stats["engagement_rate"] = (
-                (engagement_stats["total_likes"] + engagement_stats["total_comments"]) /
-                engagement_stats["total_views"]
-            ) * 100
-        
-        return engagement_stats
+        return report_queries.engagement_analysis(db, company_id, start, end)
     except Exception as e:
         logger.error(f"Error getting engagement analysis report: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -1511,39 +1114,7 @@ async def get_growth_trends_report(
         start = datetime.strptime(start_date, "%Y-%m-%d")
         end = datetime.strptime(end_date, "%Y-%m-%d")
         
-        # Get links for the company
-        links = db.query(Link).filter(Link.company_id == company_id).all()
-        
-        # Initialize growth stats
-        growth_stats = {
-            "total_views": 0,
-            "total_likes": 0,
-            "total_comments": 0,
-            "total_links": len(links),
-            "growth_rate": 0
-        }
-        
-        # Aggregate metrics
-        for link in links:
-            metrics = db.query(LinkMetrics).filter(
-                LinkMetrics.link_id == link.id,
-                LinkMetrics.updated_at >= start,
-                LinkMetrics.updated_at <= end
-            ).first()
-            
-            if metrics:
-                growth_stats["total_views"] += metrics.views or 0
-                growth_stats["total_likes"] += metrics.likes or 0
-                growth_stats["total_comments"] += metrics.comments or 0
-        
-        # Calculate growth rate
-        if growth_stats["total_links"] > 0:
-            growth_stats["growth_rate"] = (
-                (growth_stats["total_views"] + growth_stats["total_likes"] + growth_stats["total_comments"]) /
-                growth_stats["total_links"]
-            ) * 100
-        
-        return growth_stats
+        return report_queries.growth_trends(db, company_id, start, end)
     except Exception as e:
         logger.error(f"Error getting growth trends report: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -1561,10 +1132,6 @@ async def get_monday_columns(
         board_id = data.get("board_id")
         if not api_token or not board_id:
             raise HTTPException(status_code=400, detail="API token and board ID are required")
-        headers = {
-            "Authorization": api_token,
-            "Content-Type": "application/json"
-        }
         query = """
         query ($board_id: [ID!]) {
             boards(ids: $board_id) {
@@ -1576,19 +1143,13 @@ async def get_monday_columns(
             }
         }
         """
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.monday.com/v2",
-                json={"query": query, "variables": {"board_id": [board_id]}},
-                headers=headers
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    boards = result.get("data", {}).get("boards", [])
-                    columns = boards[0]["columns"] if boards and "columns" in boards[0] else []
-                    return {"columns": columns}
-                else:
-                    raise HTTPException(status_code=400, detail="Failed to fetch columns from Monday.com")
+        try:
+            result = await monday_client.execute(api_token, query, {"board_id": [board_id]})
+        except MondayAPIError:
+            raise HTTPException(status_code=400, detail="Failed to fetch columns from Monday.com")
+        boards = result.get("data", {}).get("boards", [])
+        columns = boards[0]["columns"] if boards and "columns" in boards[0] else []
+        return {"columns": columns}
     except Exception as e:
         logger.error(f"Error getting Monday.com columns: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -1649,6 +1210,8 @@ async def connect_monday(
             )
             db.add(monday_connection)
         db.commit()
+        if existing_connection:
+            board_cache.invalidate(existing_connection.id)
         return {"message": "Monday.com connection established successfully"}
     except Exception as e:
         logger.error(f"Error connecting to Monday.com: {str(e)}")
@@ -1669,11 +1232,6 @@ async def get_monday_workspaces(
             raise HTTPException(status_code=400, detail="API token is required")
         
         # Make request to Monday.com API to get workspaces
-        headers = {
-            "Authorization": api_token,
-            "Content-Type": "application/json"
-        }
-        
         query = """
         query {
             workspaces {
@@ -1683,18 +1241,12 @@ async def get_monday_workspaces(
         }
         """
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.monday.com/v2",
-                json={"query": query},
-                headers=headers
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    workspaces = result.get("data", {}).get("workspaces", [])
-                    return {"workspaces": workspaces}
-                else:
-                    raise HTTPException(status_code=400, detail="Failed to fetch workspaces from Monday.com")
+        try:
+            result = await monday_client.execute(api_token, query)
+        except MondayAPIError:
+            raise HTTPException(status_code=400, detail="Failed to fetch workspaces from Monday.com")
+        workspaces = result.get("data", {}).get("workspaces", [])
+        return {"workspaces": workspaces}
                     
     except Exception as e:
         logger.error(f"Error getting Monday.com workspaces: {str(e)}")
@@ -1716,11 +1268,6 @@ async def get_monday_boards(
             raise HTTPException(status_code=400, detail="Workspace ID and API token are required")
         
         # Make request to Monday.com API to get boards
-        headers = {
-            "Authorization": api_token,
-            "Content-Type": "application/json"
-        }
-        
         query = """
         query ($workspace_id: [ID!]) {
             boards(workspace_ids: $workspace_id) {
@@ -1731,18 +1278,12 @@ async def get_monday_boards(
         }
         """
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                "https://api.monday.com/v2",
-                json={"query": query, "variables": {"workspace_id": [workspace_id]}},
-                headers=headers
-            ) as response:
-                if response.status == 200:
-                    result = await response.json()
-                    boards = result.get("data", {}).get("boards", [])
-                    return {"boards": boards}
-                else:
-                    raise HTTPException(status_code=400, detail="Failed to fetch boards from Monday.com")
+        try:
+            result = await monday_client.execute(api_token, query, {"workspace_id": [workspace_id]})
+        except MondayAPIError:
+            raise HTTPException(status_code=400, detail="Failed to fetch boards from Monday.com")
+        boards = result.get("data", {}).get("boards", [])
+        return {"boards": boards}
                     
     except Exception as e:
         logger.error(f"Error getting Monday.com boards: {str(e)}")
@@ -1750,17 +1291,53 @@ async def get_monday_boards(
 
 @app.get("/api/monday/items")
 async def get_monday_items(
-    board_id: int,
+    board_id: Optional[str] = None,
+    company_id: Optional[int] = None,
+    stream: bool = Query(False, description="Stream items as NDJSON while pages are read"),
+    page_size: Optional[int] = Query(None, ge=1, le=500),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get Monday.com items for a board."""
+    """Get every item of a Monday.com board as a list, following page cursors to the end.
+
+    Without company_id the user's connection to board_id (or any of the
+    user's connections) supplies the API token; board_id defaults to the
+    connection's board. With stream=true the items are sent as NDJSON as
+    each page arrives, for boards too large to buffer.
+    """
+    if company_id is not None:
+        company = db.query(Company).filter(Company.id == company_id).first()
+        if not company:
+            raise HTTPException(status_code=404, detail="Company not found")
+        if company.owner_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not authorized to access this company")
+        monday_connection = db.query(MondayConnection).filter(
+            MondayConnection.company_id == company_id
+        ).first()
+    else:
+        connections = db.query(MondayConnection).filter(
+            MondayConnection.user_id == current_user.id,
+            MondayConnection.api_token.isnot(None)
+        ).order_by(MondayConnection.id).all()
+        monday_connection = next(
+            (connection for connection in connections if board_id and connection.board_id == str(board_id)),
+            connections[0] if connections else None
+        )
+    if not monday_connection or not monday_connection.api_token:
+        raise HTTPException(status_code=404, detail="No Monday.com connection found")
+    board_id = board_id or monday_connection.board_id
+    if not board_id:
+        raise HTTPException(status_code=400, detail="Board ID is required")
+
     try:
-        # This is a placeholder - implement actual Monday.com item fetching logic
-        return {"message": "Monday.com items endpoint"}
-    except Exception as e:
-        logger.error(f"Error getting Monday.com items: {str(e)}")
-        raise HTTPException(status_code=500, detail="Internal server error")
+        pages = await monday_items.open_item_pages(monday_connection.api_token, board_id, page_size)
+        if stream:
+            return StreamingResponse(monday_items.ndjson_chunks(pages), media_type="application/x-ndjson")
+        items = [item async for page in pages for item in page]
+    except MondayAPIError as e:
+        logger.error(f"Error getting Monday.com items of board {board_id}: {str(e)}")
+        raise HTTPException(status_code=e.status or 400, detail=str(e))
+    return items
 
 @app.get("/api/monday/verify_token", response_model=dict)
 async def verify_monday_token(
@@ -1793,26 +1370,25 @@ async def monday_configured_page(
     return templates.TemplateResponse("monday_configured.html", {"request": request})
 
 @app.get("/api/companies/{company_id}/stats")
-async def get_company_stats(company_id: int, db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+async def get_company_stats(company_id: int, db: AsyncSession = Depends(get_async_db), current_user: User = Depends(get_current_user)):
     """Get statistics for a specific company."""
     try:
         # Verify user has access to the company
-        company = db.query(Company).filter(Company.id == company_id).first()
+        company = await db.get(Company, company_id)
         if not company:
             raise HTTPException(status_code=404, detail="Company not found")
         if company.owner_id != current_user.id:
             raise HTTPException(status_code=403, detail="Not authorized to access this company")
             
-        # Get links for the company
-        links = db.query(Link).filter(Link.company_id == company_id).all()
-        link_ids = [link.id for link in links]
+        # Read the precomputed per-platform totals
+        rollups = await db.run_sync(company_rollups, company_id)
         
         # Initialize stats
         stats = {
             "total_views": 0,
             "total_likes": 0,
             "total_comments": 0,
-            "total_links": len(links),
+            "total_links": 0,
             "platform_stats": {
                 "YouTube": {"count": 0, "views": 0, "likes": 0, "comments": 0},
                 "TikTok": {"count": 0, "views": 0, "likes": 0, "comments": 0},
@@ -1821,43 +1397,21 @@ async def get_company_stats(company_id: int, db: Session = Depends(get_db), curr
             }
         }
         
-<<<<<<< HEAD
-        # Platform mapping for case-insensitive matching
-        platform_mapping = {
-            "youtube": "YouTube",
-            "tiktok": "TikTok", 
-            "instagram": "Instagram",
-            "facebook": "Facebook"
-        }
-        
-=======
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
-        # Fetch all metrics for these links in one query
-        metrics_list = db.query(LinkMetrics).filter(LinkMetrics.link_id.in_(link_ids)).all() if link_ids else []
-        link_id_to_platform = {link.id: link.platform for link in links}
-        
-        for metrics in metrics_list:
-            platform = link_id_to_platform.get(metrics.link_id)
-<<<<<<< HEAD
-            # Map platform to correct case
-            platform_normalized = platform_mapping.get(platform.lower()) if platform else None
+        for rollup in rollups:
+            stats["total_links"] += rollup.link_count
+            platform_normalized = report_queries.PLATFORM_LABELS.get(rollup.platform)
             if platform_normalized in stats["platform_stats"]:
-                stats["platform_stats"][platform_normalized]["count"] += 1
-                stats["platform_stats"][platform_normalized]["views"] += metrics.views or 0
-                stats["platform_stats"][platform_normalized]["likes"] += metrics.likes or 0
-                stats["platform_stats"][platform_normalized]["comments"] += metrics.comments or 0
-=======
-            if platform in stats["platform_stats"]:
-                stats["platform_stats"][platform]["count"] += 1
-                stats["platform_stats"][platform]["views"] += metrics.views or 0
-                stats["platform_stats"][platform]["likes"] += metrics.likes or 0
-                stats["platform_stats"][platform]["comments"] += metrics.comments or 0
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
-                stats["total_views"] += metrics.views or 0
-                stats["total_likes"] += metrics.likes or 0
-                stats["total_comments"] += metrics.comments or 0
+                stats["platform_stats"][platform_normalized]["count"] += rollup.link_count
+                stats["platform_stats"][platform_normalized]["views"] += rollup.views
+                stats["platform_stats"][platform_normalized]["likes"] += rollup.likes
+                stats["platform_stats"][platform_normalized]["comments"] += rollup.comments
+                stats["total_views"] += rollup.views
+                stats["total_likes"] += rollup.likes
+                stats["total_comments"] += rollup.comments
         
         return stats
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting company stats: {str(e)}")
         raise HTTPException(status_code=500, detail="Internal server error")
@@ -1878,7 +1432,7 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
             )
         
         # Create new user
-        hashed_password = get_password_hash(user.password)
+        hashed_password = await aget_password_hash(user.password)
         db_user = User(
             email=user.email,
             username=user.username,
@@ -1891,7 +1445,6 @@ async def register_user(user: UserCreate, db: Session = Depends(get_db)):
         return UserBase.from_orm(db_user)
     except Exception as e:
         logger.error(f"Error registering user: {str(e)}\n{traceback.format_exc()}")
-<<<<<<< HEAD
         raise HTTPException(status_code=500, detail="Internal server error")
 
 @app.get("/health")
@@ -1919,6 +1472,3 @@ async def health_check():
                 "error": str(e)
             }
         ) 
-=======
-        raise HTTPException(status_code=500, detail="Internal server error") 
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
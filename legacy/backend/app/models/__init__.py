@@ -7,7 +7,11 @@ from .models import (
     Platform,
     User,
     Company,
+    CompanyPlatformRollup,
+    ContentMetrics,
     Link,
     LinkMetrics,
-    MondayConnection
+    LinkMetricsHistory,
+    MondayConnection,
+    ParseJob
 ) 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from enum import Enum
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Enum as SQLEnum, Text, ForeignKey, func
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, Boolean, Enum as SQLEnum, Text, ForeignKey, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -34,7 +34,6 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     is_active = Column(Boolean, default=True)
-<<<<<<< HEAD
     
     # Profile Information
     display_name = Column(String, nullable=True)
@@ -46,8 +45,6 @@ class User(Base):
     email_verified = Column(Boolean, default=False)
     last_login = Column(DateTime(timezone=True), nullable=True)
     
-=======
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
     companies = relationship("Company", back_populates="owner")
     links = relationship("Link", back_populates="user")
     monday_connections = relationship("MondayConnection", back_populates="user")
@@ -61,6 +58,7 @@ class Company(Base):
     owner = relationship("User", back_populates="companies")
     links = relationship("Link", back_populates="company")
     monday_config = relationship("MondayConfig", back_populates="company", uselist=False)
+    platform_rollups = relationship("CompanyPlatformRollup", cascade="all, delete-orphan", passive_deletes=True)
 
 class Link(Base):
     __tablename__ = "links"
@@ -69,13 +67,25 @@ class Link(Base):
     platform = Column(String, nullable=False)
     title = Column(String)
     user_id = Column(Integer, ForeignKey("users.id"))
-    company_id = Column(Integer, ForeignKey("companies.id"))
+    company_id = Column(Integer, ForeignKey("companies.id"), index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     user = relationship("User", back_populates="links")
     company = relationship("Company", back_populates="links")
     metrics = relationship("LinkMetrics", back_populates="link", uselist=False, cascade="all, delete-orphan")
+    metrics_history = relationship("LinkMetricsHistory", cascade="all, delete-orphan", passive_deletes=True, lazy="dynamic")
     monday_item_id = Column(String, nullable=True)
+    # Outcome of the last push to Monday.com: "success" or "error"
+    monday_sync_status = Column(String, nullable=True)
+    monday_sync_error = Column(Text, nullable=True)
+    monday_synced_at = Column(DateTime, nullable=True)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # "<platform>:<content id>"; links tracking the same video share one key
+    content_key = Column(String, ForeignKey("content_metrics.content_key", ondelete="SET NULL"), nullable=True, index=True)
+    content = relationship("ContentMetrics")
+    __table_args__ = (
+        # Keyset pages of a company's links in id order
+        Index("ix_links_company_id_id", "company_id", "id"),
+    )
 
     def __repr__(self):
         return f"<Link(id={self.id}, url='{self.url}', platform='{self.platform}')>"
@@ -83,12 +93,58 @@ class Link(Base):
 class LinkMetrics(Base):
     __tablename__ = "link_metrics"
     id = Column(Integer, primary_key=True, index=True)
-    link_id = Column(Integer, ForeignKey("links.id"), nullable=False)
+    link_id = Column(Integer, ForeignKey("links.id"), nullable=False, index=True)
     views = Column(Integer, default=0)
     likes = Column(Integer, default=0)
     comments = Column(Integer, default=0)
     updated_at = Column(DateTime(timezone=True), server_default=func.now())
     link = relationship("Link", back_populates="metrics")
+    __table_args__ = (
+        # Keyset pages of links sorted by a metric
+        Index("ix_link_metrics_views_link_id", "views", "link_id"),
+        Index("ix_link_metrics_likes_link_id", "likes", "link_id"),
+        Index("ix_link_metrics_updated_at_link_id", "updated_at", "link_id"),
+    )
+
+class ContentMetrics(Base):
+    """Latest fetched metrics of one video or post, shared by every Link that tracks it"""
+    __tablename__ = "content_metrics"
+
+    content_key = Column(String, primary_key=True)
+    platform = Column(String, nullable=False)
+    content_id = Column(String, nullable=False)
+    title = Column(String, nullable=True)
+    views = Column(Integer, default=0)
+    likes = Column(Integer, default=0)
+    comments = Column(Integer, default=0)
+    fetched_at = Column(DateTime, nullable=True)
+
+class CompanyPlatformRollup(Base):
+    """Running metric totals per (company, platform), kept in step with LinkMetrics"""
+    __tablename__ = "company_platform_rollup"
+
+    company_id = Column(Integer, ForeignKey("companies.id", ondelete="CASCADE"), primary_key=True)
+    platform = Column(String, primary_key=True)
+    link_count = Column(Integer, nullable=False, default=0)
+    views = Column(BigInteger, nullable=False, default=0)
+    likes = Column(BigInteger, nullable=False, default=0)
+    comments = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class LinkMetricsHistory(Base):
+    """Append-only snapshot of a link's metrics, one row per refresh"""
+    __tablename__ = "link_metrics_history"
+
+    id = Column(Integer, primary_key=True)
+    link_id = Column(Integer, ForeignKey("links.id", ondelete="CASCADE"), nullable=False)
+    views = Column(Integer, default=0)
+    likes = Column(Integer, default=0)
+    comments = Column(Integer, default=0)
+    captured_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_link_metrics_history_link_id_captured_at", "link_id", "captured_at"),
+    )
 
 class MondayConnection(Base):
     __tablename__ = "monday_connections"
@@ -109,12 +165,36 @@ class MondayConnection(Base):
     likes_column_name = Column(String, nullable=True)
     comments_column_id = Column(String, nullable=True)
     comments_column_name = Column(String, nullable=True)
+    # Reconciliation watermarks: links changed after reconciled_at and board
+    # items updated after board_updated_at are diffed on the next run
+    reconciled_at = Column(DateTime, nullable=True)
+    board_updated_at = Column(DateTime, nullable=True)
+    reconcile_locked_until = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     user = relationship("User", back_populates="monday_connections")
     company = relationship("Company", backref="monday_connection")
 
+class MondayItemSnapshot(Base):
+    """Last seen state of one item on a connection's board"""
+    __tablename__ = "monday_item_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    connection_id = Column(Integer, ForeignKey("monday_connections.id", ondelete="CASCADE"), nullable=False)
+    item_id = Column(String, nullable=False)
+    # Deliberately not a foreign key: it outlives the link so the item can be archived
+    link_id = Column(Integer, nullable=True)
+    name = Column(String, nullable=True)
+    # JSON object of column id -> text for the metric columns
+    column_values = Column(Text, nullable=True)
+    item_updated_at = Column(DateTime, nullable=True)
+    seen_at = Column(DateTime, default=datetime.utcnow)
+    __table_args__ = (
+        Index("ix_monday_item_snapshots_connection_item", "connection_id", "item_id", unique=True),
+        Index("ix_monday_item_snapshots_connection_link", "connection_id", "link_id"),
+    )
+
 class MondayConfig(Base):
     __tablename__ = "monday_configs"
     
@@ -125,4 +205,29 @@ class MondayConfig(Base):
     board_id = Column(String)
     workspace_id = Column(String)
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ParseJob(Base):
+    """Durable queue entry for fetching a link's metrics in the background"""
+    __tablename__ = "parse_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    link_id = Column(Integer, ForeignKey("links.id", ondelete="CASCADE"), nullable=False)
+    # Lower numbers run first: new links jump ahead of bulk refreshes
+    priority = Column(Integer, nullable=False, default=10)
+    status = Column(String, nullable=False, default="queued")  # queued, running, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    run_after = Column(DateTime, nullable=False, default=datetime.utcnow)
+    # Visibility timeout: a running job whose lease expired is picked up again
+    locked_until = Column(DateTime, nullable=True)
+    locked_by = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    # "link:<id>" while the job is active, NULL once it failed for good
+    dedupe_key = Column(String, unique=True, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_parse_jobs_status_priority_run_after", "status", "priority", "run_after"),
+    )
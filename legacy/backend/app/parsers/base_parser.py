@@ -1,5 +1,7 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from backend.app.core.http_client import HTTPClientManager, http_client as shared_http_client
 
 def log_step(message: str, success: bool = True) -> None:
     """Log a step in the parsing process"""
@@ -8,6 +10,18 @@ def log_step(message: str, success: bool = True) -> None:
 
 class BaseParser(ABC):
     """Base class for all social media parsers"""
+
+    # Number of URLs one upstream call can resolve; parsers with a native
+    # batch endpoint raise this and override parse_many.
+    batch_size: int = 1
+    
+    def __init__(self, http_client: Optional[HTTPClientManager] = None):
+        """
+        Args:
+            http_client (HTTPClientManager, optional): Pooled HTTP client to use
+                for upstream calls. Defaults to the process-wide instance.
+        """
+        self.http_client = http_client or shared_http_client
     
     @abstractmethod
     async def parse_url(self, url: str) -> Dict[str, Any]:
@@ -26,6 +40,23 @@ class BaseParser(ABC):
         """
         pass
     
+    async def parse_many(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Parse several URLs at once
+        
+        Args:
+            urls (List[str]): The URLs to parse
+            
+        Returns:
+            Dict[str, Dict[str, Any]]: Result per URL, in the same format as
+                parse_url; a URL that failed maps to {"error": message}
+        """
+        results = await asyncio.gather(*(self.parse_url(url) for url in urls), return_exceptions=True)
+        return {
+            url: {"error": str(result)} if isinstance(result, Exception) else result
+            for url, result in zip(urls, results)
+        }
+    
     @abstractmethod
     def validate_url(self, url: str) -> bool:
         """
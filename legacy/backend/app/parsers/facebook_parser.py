@@ -3,6 +3,7 @@ import json
 import re
 from typing import Dict, Any, Optional
 from .base_parser import BaseParser
+from backend.app.utils.url_classifier import classify_url
 import logging
 import aiohttp
 from bs4 import BeautifulSoup
@@ -22,9 +23,9 @@ logger = logging.getLogger(__name__)
 class FacebookParser(BaseParser):
     """Parser for Facebook Reels"""
     
-    def __init__(self):
+    def __init__(self, http_client=None):
         """Initialize the Facebook parser"""
-        super().__init__()
+        super().__init__(http_client)
         self.platform = "facebook"
         # Try to get API key from environment, fallback to hardcoded key
         self.api_key = os.getenv("FACEBOOK_RAPIDAPI_KEY", "686292c56amsh1c864cb048af666p1c8f45jsna2dbcc01f184")
@@ -34,12 +35,8 @@ class FacebookParser(BaseParser):
         
     def validate_url(self, url: str) -> bool:
         """Validate if the URL is a Facebook URL"""
-        facebook_patterns = [
-            r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/reel\/\d+',
-            r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/.*\/videos\/\d+',
-            r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/watch\/\?v=\d+'
-        ]
-        return any(re.match(pattern, url) for pattern in facebook_patterns)
+        classified = classify_url(url)
+        return bool(classified and classified.platform == "facebook")
     
     def can_handle(self, url: str) -> bool:
         """Check if the URL is a Facebook URL"""
@@ -47,17 +44,8 @@ class FacebookParser(BaseParser):
     
     def extract_id(self, url: str) -> Optional[str]:
         """Extract the Facebook video/reel ID from the URL"""
-        patterns = [
-            r'facebook\.com\/reel\/(\d+)',
-            r'facebook\.com\/.*\/videos\/(\d+)',
-            r'facebook\.com\/watch\/\?v=(\d+)'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
+        classified = classify_url(url)
+        return classified.content_id if classified and classified.platform == "facebook" else None
     
     async def get_metrics(self, url: str) -> Dict[str, Any]:
         """Get metrics for a Facebook video/reel using RapidAPI"""
@@ -75,7 +63,7 @@ class FacebookParser(BaseParser):
             params = {"post_id": video_id}
             
             # Make async API call
-            async with aiohttp.ClientSession() as session:
+            async with self.http_client.session("rapidapi") as session:
                 async with session.get(self.api_url, headers=headers, params=params) as response:
                     logger.info(f"[FACEBOOK_PARSER] Response status code: {response.status}")
                     response_text = await response.text()
@@ -1,4 +1,5 @@
 from .base_parser import BaseParser
+from backend.app.utils.url_classifier import classify_url
 import re
 import json
 import os
@@ -7,7 +8,6 @@ import aiohttp
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 import logging
-from urllib.parse import urlparse
 from typing import Dict, Any, Optional
 
 # Configure logging
@@ -17,8 +17,8 @@ logger = logging.getLogger(__name__)
 class InstagramParser(BaseParser):
     """Parser for Instagram links"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, http_client=None):
+        super().__init__(http_client)
         self.platform = 'instagram'
         self.required_fields = ['likes', 'comments', 'views']
         load_dotenv()
@@ -29,15 +29,8 @@ class InstagramParser(BaseParser):
         
     def validate_url(self, url: str) -> bool:
         """Validate Instagram URL format"""
-        try:
-            result = urlparse(url)
-            return all([
-                result.scheme in ['http', 'https'],
-                'instagram.com' in result.netloc,
-                result.path.strip('/')
-            ])
-        except Exception:
-            return False
+        classified = classify_url(url)
+        return bool(classified and classified.platform == "instagram")
     
     async def parse_url(self, url: str) -> Dict[str, Any]:
         """Parse Instagram URL and return stats"""
@@ -67,20 +60,8 @@ class InstagramParser(BaseParser):
     
     def _extract_post_id(self, url: str) -> Optional[str]:
         """Extract post ID from Instagram URL"""
-        try:
-            # Handle different URL formats
-            if '/p/' in url:
-                # Standard post URL
-                post_id = url.split('/p/')[1].split('/')[0]
-            elif '/reel/' in url:
-                # Reel URL
-                post_id = url.split('/reel/')[1].split('/')[0]
-            else:
-                return None
-            
-            return post_id
-        except Exception:
-            return None
+        classified = classify_url(url)
+        return classified.content_id if classified and classified.platform == "instagram" else None
     
     def _format_number(self, text: str) -> int:
         """Convert number with K, M, B suffixes to integer"""
@@ -102,7 +83,7 @@ class InstagramParser(BaseParser):
     async def _get_instagram_data(self, url: str) -> dict:
         """Fetch Instagram post data using RapidAPI"""
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_client.session("rapidapi") as session:
                 api_url = "https://real-time-instagram-scraper-api1.p.rapidapi.com/v1/media_info"
                 
                 headers = {
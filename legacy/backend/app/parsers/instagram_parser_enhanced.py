@@ -1,4 +1,5 @@
 from .base_parser import BaseParser
+from backend.app.utils.url_classifier import classify_url
 import re
 import json
 import os
@@ -7,7 +8,6 @@ import aiohttp
 from bs4 import BeautifulSoup
 from dotenv import load_dotenv
 import logging
-from urllib.parse import urlparse
 from typing import Dict, Any, Optional
 
 # Configure logging
@@ -17,8 +17,8 @@ logger = logging.getLogger(__name__)
 class InstagramParserEnhanced(BaseParser):
     """Enhanced Instagram parser with ScrapeNinja API and view count estimation"""
     
-    def __init__(self):
-        super().__init__()
+    def __init__(self, http_client=None):
+        super().__init__(http_client)
         self.platform = 'instagram_enhanced'
         self.required_fields = ['likes', 'comments', 'views']
         load_dotenv()
@@ -34,15 +34,8 @@ class InstagramParserEnhanced(BaseParser):
         
     def validate_url(self, url: str) -> bool:
         """Validate Instagram URL format"""
-        try:
-            result = urlparse(url)
-            return all([
-                result.scheme in ['http', 'https'],
-                'instagram.com' in result.netloc,
-                result.path.strip('/')
-            ])
-        except Exception:
-            return False
+        classified = classify_url(url)
+        return bool(classified and classified.platform == "instagram")
     
     async def parse_url(self, url: str) -> Dict[str, Any]:
         """Parse Instagram URL with enhanced view count handling"""
@@ -113,7 +106,7 @@ class InstagramParserEnhanced(BaseParser):
             raise ValueError("RapidAPI key not available")
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_client.session("rapidapi") as session:
                 api_url = "https://scrapeninja.p.rapidapi.com/scrape"
                 
                 headers = {
@@ -155,7 +148,7 @@ class InstagramParserEnhanced(BaseParser):
             raise ValueError("Direct ScrapeNinja API key not available")
         
         try:
-            async with aiohttp.ClientSession() as session:
+            async with self.http_client.session("default") as session:
                 api_url = "https://api.scrapeninja.com/v1/scrape"
                 
                 headers = {
@@ -343,14 +336,5 @@ class InstagramParserEnhanced(BaseParser):
     
     def _extract_post_id(self, url: str) -> Optional[str]:
         """Extract post ID from Instagram URL"""
-        try:
-            if '/p/' in url:
-                post_id = url.split('/p/')[1].split('/')[0]
-            elif '/reel/' in url:
-                post_id = url.split('/reel/')[1].split('/')[0]
-            else:
-                return None
-            
-            return post_id
-        except Exception:
-            return None 
\ No newline at end of file
+        classified = classify_url(url)
+        return classified.content_id if classified and classified.platform == "instagram" else None
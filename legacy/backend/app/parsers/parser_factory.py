@@ -1,34 +1,51 @@
 from .youtube_parser import YouTubeParser
 from .tiktok_parser import TikTokParser
 from .instagram_parser import InstagramParser
-<<<<<<< HEAD
 from .instagram_parser_enhanced import InstagramParserEnhanced
-=======
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
 from .facebook_parser import FacebookParser
 from typing import Optional, Dict
 from .base_parser import BaseParser
+from backend.app.core.http_client import HTTPClientManager, http_client as shared_http_client
+from backend.app.core.single_flight import SingleFlight, parser_flights
+from backend.app.parsers.result_cache import ParserResultCache, parser_result_cache
+from backend.app.utils.url_classifier import classify_url
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def result_key(url: str) -> str:
+    """Cache and single-flight key of a URL: ``platform:content_id`` when known, else the canonical URL"""
+    classified = classify_url(url)
+    if classified is None:
+        return url.strip()
+    return classified.content_key or classified.canonical_url
+
+
 class ParserFactory:
     """Factory class for creating social media parsers"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        http_client: Optional[HTTPClientManager] = None,
+        cache: Optional[ParserResultCache] = None,
+        flights: Optional[SingleFlight] = None,
+    ):
+        self.http_client = http_client or shared_http_client
+        self.cache = cache or parser_result_cache
+        self.flights = flights or parser_flights
+        self._revalidating: Dict[str, asyncio.Task] = {}
         self.parsers = {}
         for name, parser_cls in [
             ('youtube', YouTubeParser),
             ('tiktok', TikTokParser),
             ('instagram', InstagramParser),
-<<<<<<< HEAD
             ('instagram_enhanced', InstagramParserEnhanced),
-=======
->>>>>>> 3f7391616262f0d9bb63bdfee4943e8983f27460
             ('facebook', FacebookParser)
         ]:
             try:
-                self.parsers[name] = parser_cls()
+                self.parsers[name] = parser_cls(http_client=self.http_client)
                 logger.info(f"ParserFactory: Successfully initialized {name} parser.")
             except Exception as e:
                 logger.error(f"ParserFactory: Failed to initialize {name} parser: {e}")
@@ -44,24 +61,28 @@ class ParserFactory:
             return None
         
         if url:
-            url = url.lower()
-            for key, parser in self.parsers.items():
-                if parser.validate_url(url):
-                    logger.info(f"Found parser for URL: {url}")
-                    return parser
+            classified = classify_url(url)
+            parser = self.parsers.get(classified.platform) if classified else None
+            if parser:
+                return parser
             logger.warning(f"No parser found for URL: {url}")
             return None
         
         logger.error("Either URL or platform must be provided")
         return None
     
-    async def parse_url(self, url: str, platform: str = None) -> dict:
+    async def parse_url(self, url: str, platform: str = None, force: bool = False) -> dict:
         """
         Parse the given URL using the appropriate parser
         
+        Results are cached per content for the platform's TTL. A stale
+        result is returned at once while a background task fetches a new one.
+        Concurrent fetches of the same content share one parser call.
+        
         Args:
             url (str): The URL to parse
             platform (str, optional): The platform to use for parsing
+            force (bool, optional): Skip the cache and always call the parser
             
         Returns:
             dict: Parsed metadata
@@ -73,7 +94,40 @@ class ParserFactory:
         if not parser:
             raise ValueError(f"No parser found for platform: {platform or 'unknown'}")
         
-        return await parser.parse_url(url)
+        classified = classify_url(url)
+        platform = (platform or (classified.platform if classified else "")).lower()
+        key = result_key(url)
+        if not force:
+            cached, fresh = self.cache.get(key, platform)
+            if cached is not None:
+                if not fresh:
+                    self._revalidate(parser, url, key, platform)
+                return cached
+        return await self._fetch(parser, url, key, platform)
+
+    async def _fetch(self, parser: BaseParser, url: str, key: str, platform: str) -> dict:
+        async def fetch() -> dict:
+            result = await parser.parse_url(url)
+            # Errors and empty results are never cached, so the next call retries
+            if result and not result.get("error"):
+                self.cache.put(key, platform, result)
+            return result
+
+        return await self.flights.do(key, fetch)
+
+    def _revalidate(self, parser: BaseParser, url: str, key: str, platform: str) -> None:
+        """Refresh a stale entry in the background, at most once at a time per key"""
+        if key in self._revalidating or self.flights.in_flight(key):
+            return
+        task = asyncio.create_task(self._fetch(parser, url, key, platform))
+        self._revalidating[key] = task
+
+        def done(finished: asyncio.Task) -> None:
+            self._revalidating.pop(key, None)
+            if not finished.cancelled() and finished.exception():
+                logger.warning(f"ParserFactory: Background refresh of {url} failed: {finished.exception()}")
+
+        task.add_done_callback(done)
 
 # Create a singleton instance
 parser_factory = ParserFactory() 
\ No newline at end of file
@@ -0,0 +1,190 @@
+"""
+TTL cache of parser results, in front of ParserFactory.parse_url
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a result counts as fresh; the paid scraping APIs get longer TTLs.
+DEFAULT_PLATFORM_TTLS = {
+    "youtube": 300,
+    "tiktok": 900,
+    "instagram": 900,
+    "facebook": 900,
+}
+
+
+def _parse_platform_ttls(value: Optional[str]) -> Dict[str, float]:
+    """Parse "tiktok=900,youtube=300" into a dict, ignoring malformed entries"""
+    ttls = {platform: float(ttl) for platform, ttl in DEFAULT_PLATFORM_TTLS.items()}
+    if not value:
+        return ttls
+    for entry in value.split(","):
+        name, _, number = entry.partition("=")
+        try:
+            ttls[name.strip().lower()] = max(0.0, float(number))
+        except ValueError:
+            logger.warning(f"Ignoring invalid parser cache TTL entry: {entry!r}")
+    return ttls
+
+
+class ParserResultCache:
+    """Per-platform TTL + LRU cache of parser results with an optional SQLite tier.
+
+    An entry is fresh for its platform's TTL and may then be served stale for
+    another ``stale`` seconds while the caller revalidates it. Timestamps are
+    wall-clock so entries in the SQLite file stay valid across restarts and
+    can be shared by processes on one host.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: Optional[float] = None,
+        stale: Optional[float] = None,
+        max_size: Optional[int] = None,
+        path: Optional[str] = None,
+    ):
+        self.ttls = ttls if ttls is not None else _parse_platform_ttls(os.getenv("PARSER_CACHE_TTLS"))
+        self.default_ttl = default_ttl if default_ttl is not None else float(os.getenv("PARSER_CACHE_TTL", "300"))
+        self.stale = stale if stale is not None else float(os.getenv("PARSER_CACHE_STALE", "3600"))
+        self.max_size = max_size if max_size is not None else int(os.getenv("PARSER_CACHE_SIZE", "2048"))
+        self.path = path if path is not None else os.getenv("PARSER_CACHE_PATH", "")
+        self._entries: "OrderedDict[str, Tuple[float, str, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.stale_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def ttl(self, platform: Optional[str]) -> float:
+        return self.ttls.get((platform or "").lower(), self.default_ttl)
+
+    # ------------------------------------------------------------------ disk
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """Open the SQLite tier on first use; callers hold the lock"""
+        if not self.path:
+            return None
+        if self._disk is None:
+            self._disk = sqlite3.connect(self.path, check_same_thread=False)
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS parser_cache "
+                "(key TEXT PRIMARY KEY, platform TEXT, stored_at REAL, value TEXT)"
+            )
+            self._disk.commit()
+        return self._disk
+
+    def _disk_get(self, key: str) -> Optional[Tuple[float, str, Dict[str, Any]]]:
+        try:
+            disk = self._connection()
+            if disk is None:
+                return None
+            row = disk.execute("SELECT stored_at, platform, value FROM parser_cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Parser cache disk read failed: {str(e)}")
+            return None
+        return (row[0], row[1], json.loads(row[2])) if row else None
+
+    def _disk_put(self, key: str, entry: Tuple[float, str, Dict[str, Any]]) -> None:
+        try:
+            disk = self._connection()
+            if disk is None:
+                return
+            disk.execute(
+                "INSERT OR REPLACE INTO parser_cache (key, platform, stored_at, value) VALUES (?, ?, ?, ?)",
+                (key, entry[1], entry[0], json.dumps(entry[2], default=str)),
+            )
+            disk.commit()
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            logger.warning(f"Parser cache disk write failed: {str(e)}")
+
+    # ---------------------------------------------------------------- lookup
+
+    def get(self, key: str, platform: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """Return ``(result, fresh)``; ``(None, False)`` on a miss or an expired entry"""
+        ttl = self.ttl(platform)
+        if ttl <= 0:
+            self.misses += 1
+            return None, False
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            from_disk = False
+            if entry is None:
+                entry = self._disk_get(key)
+                from_disk = entry is not None
+            if entry is None or now - entry[0] >= ttl + self.stale:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None, False
+            if from_disk:
+                self.disk_hits += 1
+                self._store(key, entry)
+            else:
+                self._entries.move_to_end(key)
+            fresh = now - entry[0] < ttl
+            if fresh:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return dict(entry[2]), fresh
+
+    def put(self, key: str, platform: Optional[str], result: Dict[str, Any]) -> None:
+        if self.ttl(platform) <= 0 or self.max_size <= 0:
+            return
+        entry = (time.time(), (platform or "").lower(), dict(result))
+        with self._lock:
+            self._store(key, entry)
+            self._disk_put(key, entry)
+
+    def _store(self, key: str, entry: Tuple[float, str, Dict[str, Any]]) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+            try:
+                disk = self._connection()
+                if disk is not None:
+                    disk.execute("DELETE FROM parser_cache WHERE key = ?", (key,))
+                    disk.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Parser cache disk delete failed: {str(e)}")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttls": self.ttls,
+            "stale": self.stale,
+            "disk": bool(self.path),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0,
+            "evictions": self.evictions,
+        }
+
+
+# Create a singleton instance
+parser_result_cache = ParserResultCache()
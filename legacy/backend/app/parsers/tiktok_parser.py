@@ -1,8 +1,9 @@
 import re
 import aiohttp
 import os
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Set
 from .base_parser import BaseParser
+from backend.app.utils.url_classifier import classify_url
 import logging
 from dotenv import load_dotenv
 import asyncio
@@ -12,10 +13,19 @@ import emoji
 logger = logging.getLogger(__name__)
 
 class TikTokParser(BaseParser):
-    """Parser for TikTok videos using Apify Actor."""
+    """Parser for TikTok videos using Apify Actor.
 
-    def __init__(self):
-        super().__init__()
+    Every actor run pays a cold start, so URLs are sent in batches: parse_many
+    submits up to ``batch_size`` URLs per run, and concurrent parse_url calls
+    share one run. A call made while no run is in flight starts one at once;
+    calls made while one is running are collected for ``batch_window``
+    seconds.
+    """
+
+    batch_size = 50
+
+    def __init__(self, http_client=None):
+        super().__init__(http_client)
         self.platform = 'tiktok'
         load_dotenv()
         self.apify_token = os.getenv('APIFY_TOKEN')
@@ -23,44 +33,26 @@ class TikTokParser(BaseParser):
             raise ValueError("APIFY_TOKEN environment variable is not set")
         
         self.actor_id = "S5h7zRLfKFEr8pdj7"
-        self.api_url = f"https://api.apify.com/v2/acts/{self.actor_id}/runs?token={self.apify_token}"
-        self.session = None
-        self._session_lock = asyncio.Lock()
-
-    async def _init_session(self):
-        async with self._session_lock:
-            if not self.session:
-                timeout = aiohttp.ClientTimeout(total=60)
-                self.session = aiohttp.ClientSession(timeout=timeout)
-
-    async def _close_session(self):
-        async with self._session_lock:
-            if self.session:
-                await self.session.close()
-                self.session = None
+        self.api_base = os.getenv('APIFY_API_BASE', 'https://api.apify.com/v2').rstrip('/')
+        self.api_url = f"{self.api_base}/acts/{self.actor_id}/runs"
+        # Seconds Apify holds a request open until the run finishes (max 60)
+        self.wait_for_finish = min(60, int(os.getenv('APIFY_WAIT_FOR_FINISH', '60')))
+        self.run_timeout = float(os.getenv('APIFY_RUN_TIMEOUT', '300'))
+        self.batch_size = int(os.getenv('APIFY_TIKTOK_BATCH_SIZE', self.batch_size))
+        self.batch_window = float(os.getenv('APIFY_TIKTOK_BATCH_WINDOW', '1.0'))
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # The loop keeps only weak references to tasks; hold running flushes here
+        self._flush_tasks: Set[asyncio.Task] = set()
 
     def _extract_video_id(self, url: str) -> Optional[str]:
-        patterns = [
-            r'video/(\d+)',
-            r'v/(\d+)',
-            r'@[\w.-]+/video/(\d+)',
-            r'vm\.tiktok\.com/(\w+)',
-            r'tiktok\.com/t/(\w+)'
-        ]
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                return match.group(1)
-        return None
+        """Numeric video ID; None for short links, which Apify resolves itself"""
+        classified = classify_url(url)
+        return classified.content_id if classified and classified.platform == 'tiktok' else None
 
     def validate_url(self, url: str) -> bool:
-        patterns = [
-            r'https?://(?:www\.)?tiktok\.com/(@[\w.-]+/video/\d+)',
-            r'https?://(?:www\.)?tiktok\.com/v/\d+',
-            r'https?://(?:www\.)?vm\.tiktok\.com/\w+',
-            r'https?://(?:www\.)?tiktok\.com/t/\w+'
-        ]
-        return any(re.match(pattern, url) for pattern in patterns)
+        classified = classify_url(url)
+        return bool(classified and classified.platform == 'tiktok')
 
     def _clean_title(self, text: str, max_length: int = 100) -> str:
         if not text:
@@ -80,15 +72,44 @@ class TikTokParser(BaseParser):
                 return data[key]
         return default
 
-    async def _get_tiktok_data(self, url: str) -> Dict[str, Any]:
-        await self._init_session()
+    def _item_video_id(self, item: Dict[str, Any]) -> Optional[str]:
+        """Video ID of a dataset item, from its id or one of its URLs"""
+        if item.get('id'):
+            return str(item['id'])
+        for key in ('webVideoUrl', 'submittedVideoUrl', 'inputUrl', 'url'):
+            if item.get(key):
+                video_id = self._extract_video_id(item[key])
+                if video_id:
+                    return video_id
+        return None
+
+    def _build_result(self, video_data: Dict[str, Any]) -> Dict[str, Any]:
+        description = self._get_from_dot(video_data, 'text', 'desc', default='')
+        hashtags = re.findall(r'#(\w+)', description)
+        title = self._clean_title(description)
+                
+        return {
+            'title': title,
+            'description': description,
+            'views': self._get_from_dot(video_data, 'playCount', 'stats.playCount', default=0),
+            'likes': self._get_from_dot(video_data, 'likesCount', 'diggCount', 'stats.diggCount', default=0),
+            'comments': self._get_from_dot(video_data, 'commentsCount', 'commentCount', 'stats.commentCount', default=0),
+            'owner': self._get_from_dot(video_data, 'authorMeta.name', 'author.nickname', default=''),
+            'created_time': self._get_from_dot(video_data, 'createTime', 'createTimeISO', default=''),
+            'hashtags': hashtags,
+            'platform': 'tiktok'
+        }
+
+    async def _run_actor(self, urls: List[str]) -> List[Dict[str, Any]]:
+        """Run the actor once for all given URLs and return its dataset items"""
+        session = self.http_client.get_session("apify")
         try:
             headers = {
                 "Content-Type": "application/json"
             }
             
             input_data = {
-                "postURLs": [url],
+                "postURLs": urls,
                 "shouldDownloadVideos": False,
                 "shouldDownloadCovers": False,
                 "shouldDownloadSubtitles": False,
@@ -106,77 +127,161 @@ class TikTokParser(BaseParser):
                 }
             }
             
-            logger.info(f"Triggering Apify run for: {url}")
-            async with self.session.post(self.api_url, headers=headers, json=input_data) as resp:
+            logger.info(f"Triggering Apify run for {len(urls)} TikTok URL(s)")
+            # waitForFinish makes Apify hold the response until the run is done
+            # (or the wait expires), so a short run costs a single round-trip.
+            params = {"token": self.apify_token, "waitForFinish": str(self.wait_for_finish)}
+            async with session.post(self.api_url, headers=headers, json=input_data, params=params) as resp:
                 if resp.status != 201:
                     raise ValueError(f"Failed to start Apify run: HTTP {resp.status}")
-                run_data = await resp.json()
-                run_id = run_data.get("data", {}).get("id")
-                if not run_id:
-                    raise ValueError("No run ID received")
-
-            # Poll for completion
-            status_url = f"https://api.apify.com/v2/actor-runs/{run_id}?token={self.apify_token}"
-            max_attempts = 15
-            for attempt in range(max_attempts):
-                await asyncio.sleep(min(10, 1.2 ** attempt))
-                async with self.session.get(status_url) as status_resp:
-                    status_data = await status_resp.json()
-                    status = status_data.get("data", {}).get("status")
-                    if status == "SUCCEEDED":
-                        break
-                    elif status in ["FAILED", "ABORTED", "TIMEOUT"]:
-                        raise ValueError(f"Run failed with status: {status}")
-            else:
-                raise TimeoutError("Apify run did not finish in time")
+                run = (await resp.json()).get("data", {})
+            run_id = run.get("id")
+            if not run_id:
+                raise ValueError("No run ID received")
+
+            # Long-poll until the run reaches a terminal status
+            status_url = f"{self.api_base}/actor-runs/{run_id}"
+            deadline = asyncio.get_running_loop().time() + self.run_timeout
+            while run.get("status") not in ("SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT", "TIMEOUT"):
+                if asyncio.get_running_loop().time() >= deadline:
+                    # A run left going keeps billing
+                    await self._abort_run(session, run_id)
+                    raise TimeoutError("Apify run did not finish in time")
+                async with session.get(status_url, params=params) as status_resp:
+                    if status_resp.status != 200:
+                        raise ValueError(f"Failed to get Apify run status: HTTP {status_resp.status}")
+                    run = (await status_resp.json()).get("data", {})
+            if run["status"] != "SUCCEEDED":
+                raise ValueError(f"Run failed with status: {run['status']}")
                 
             # Fetch results
-            dataset_id = status_data["data"].get("defaultDatasetId")
+            dataset_id = run.get("defaultDatasetId")
             if not dataset_id:
                 raise ValueError("Dataset ID not found in run data")
 
-            dataset_url = f"https://api.apify.com/v2/datasets/{dataset_id}/items?token={self.apify_token}"
-            for _ in range(5):
-                await asyncio.sleep(2)
-                async with self.session.get(dataset_url) as result_resp:
-                    if result_resp.status != 200:
-                        continue
-                    results = await result_resp.json()
-                    if results:
-                        break
-            else:
+            dataset_url = f"{self.api_base}/datasets/{dataset_id}/items"
+            async with session.get(dataset_url, params={"token": self.apify_token, "clean": "true"}) as result_resp:
+                if result_resp.status != 200:
+                    raise ValueError(f"Failed to fetch Apify dataset: HTTP {result_resp.status}")
+                results = await result_resp.json()
+            if not results:
                 raise ValueError("No data received from Apify dataset")
-                    
-            video_data = results[0]
-            description = self._get_from_dot(video_data, 'text', 'desc', default='')
-            hashtags = re.findall(r'#(\w+)', description)
-            title = self._clean_title(description)
-                    
-            return {
-                'title': title,
-                'description': description,
-                'views': self._get_from_dot(video_data, 'playCount', 'stats.playCount', default=0),
-                'likes': self._get_from_dot(video_data, 'likesCount', 'diggCount', 'stats.diggCount', default=0),
-                'comments': self._get_from_dot(video_data, 'commentsCount', 'commentCount', 'stats.commentCount', default=0),
-                'owner': self._get_from_dot(video_data, 'authorMeta.name', 'author.nickname', default=''),
-                'created_time': self._get_from_dot(video_data, 'createTime', 'createTimeISO', default=''),
-                'hashtags': hashtags,
-                'platform': 'tiktok'
-            }
+            return results
                 
         except aiohttp.ClientError as e:
             logger.error(f"Network error: {e}")
             raise ValueError(f"Network error: {e}")
+        except ValueError:
+            raise
         except Exception as e:
             logger.error(f"Error: {e}")
             raise ValueError(f"Error fetching TikTok data: {e}")
-        finally:
-            await self._close_session()
+
+    async def _abort_run(self, session, run_id: str) -> None:
+        try:
+            abort_url = f"{self.api_base}/actor-runs/{run_id}/abort"
+            async with session.post(abort_url, params={"token": self.apify_token}) as resp:
+                if resp.status != 200:
+                    logger.warning(f"Failed to abort Apify run {run_id}: HTTP {resp.status}")
+                    return
+            logger.info(f"Aborted Apify run {run_id}")
+        except aiohttp.ClientError as e:
+            logger.warning(f"Failed to abort Apify run {run_id}: {e}")
+
+    async def _fetch_batch(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """One actor run for up to ``batch_size`` valid URLs, mapped back per URL"""
+        items = await self._run_actor(urls)
+        by_video_id: Dict[str, Dict[str, Any]] = {}
+        by_url: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            if not isinstance(item, dict) or item.get('error'):
+                continue
+            video_id = self._item_video_id(item)
+            if video_id:
+                by_video_id.setdefault(video_id, item)
+            for key in ('submittedVideoUrl', 'inputUrl', 'webVideoUrl'):
+                if item.get(key):
+                    by_url.setdefault(item[key], item)
+
+        results = {}
+        for url in urls:
+            # Short links (vm.tiktok.com) carry no numeric ID, so fall back to
+            # the URL the actor echoes back, or to the only item of a single run.
+            item = by_video_id.get(self._extract_video_id(url)) or by_url.get(url)
+            if item is None and len(urls) == 1 and len(items) == 1 and isinstance(items[0], dict):
+                item = items[0]
+            if item is None:
+                results[url] = {"error": "No data returned by Apify for this video"}
+            else:
+                results[url] = self._build_result(item)
+        logger.info(f"Apify run returned data for {sum('error' not in r for r in results.values())}/{len(urls)} URL(s)")
+        return results
+
+    async def parse_many(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Parse many TikTok URLs with one actor run per ``batch_size`` URLs.
+
+        URLs the run returned nothing for map to {"error": ...}, so one missing
+        video does not fail the others.
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        valid = []
+        for url in dict.fromkeys(urls):
+            if not self.validate_url(url):
+                results[url] = {"error": "Invalid TikTok URL"}
+            else:
+                valid.append(url)
+
+        chunks = [valid[i:i + self.batch_size] for i in range(0, len(valid), self.batch_size)]
+        responses = await asyncio.gather(*(self._fetch_batch(chunk) for chunk in chunks), return_exceptions=True)
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                for url in chunk:
+                    results[url] = {"error": str(response)}
+            else:
+                results.update(response)
+        return results
+
+    def _start_flush(self) -> None:
+        task = asyncio.get_running_loop().create_task(self._flush_pending())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    def _schedule_flush(self) -> None:
+        loop = asyncio.get_running_loop()
+        if len(self._pending) >= self.batch_size:
+            if self._flush_handle:
+                self._flush_handle.cancel()
+                self._flush_handle = None
+            self._start_flush()
+        elif self._flush_handle is None:
+            # With no run in flight, start on the next loop pass: calls made in
+            # the same pass still join, and a single call does not wait
+            delay = self.batch_window if self._flush_tasks else 0
+            self._flush_handle = loop.call_later(delay, self._start_flush)
+
+    async def _flush_pending(self) -> None:
+        """Send every URL waiting in parse_url through one actor run"""
+        self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        try:
+            results = await self.parse_many(list(pending))
+        except Exception as e:
+            results = {url: {"error": str(e)} for url in pending}
+        for url, futures in pending.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(results.get(url) or {"error": "No data returned by Apify for this video"})
 
     async def parse_url(self, url: str) -> Dict[str, Any]:
         if not self.validate_url(url):
             raise ValueError("Invalid TikTok URL")
-        video_id = self._extract_video_id(url)
-        if not video_id:
-            raise ValueError("Could not extract video ID from URL")
-        return await self._get_tiktok_data(url) 
\ No newline at end of file
+        # Join the next batched run instead of starting an actor run per URL
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(url, []).append(future)
+        self._schedule_flush()
+        result = await future
+        if result.get("error"):
+            raise ValueError(result["error"])
+        return result
@@ -1,11 +1,10 @@
-import re
 import os
+import asyncio
 import logging
-from typing import Dict, Any, Optional
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from typing import Dict, Any, List, Optional
 from dotenv import load_dotenv
 from .base_parser import BaseParser
+from backend.app.utils.url_classifier import classify_url
 
 # Load environment variables
 load_dotenv()
@@ -17,6 +16,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# videos.list REST endpoint; called directly so no discovery document is needed
+YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
+
 def print_separator():
     """Print a separator line"""
     print("\n" + "="*50)
@@ -31,36 +33,23 @@ def log_step(step: str, data: Any = None):
 
 class YouTubeParser(BaseParser):
     """Parser for YouTube URLs"""
+
+    # videos.list accepts up to 50 IDs per call
+    batch_size = 50
     
-    def __init__(self):
+    def __init__(self, http_client=None):
         """Initialize the YouTube parser with API credentials"""
+        super().__init__(http_client)
         self.api_key = os.getenv('YOUTUBE_API_KEY')
         if not self.api_key:
             raise ValueError("YOUTUBE_API_KEY environment variable is not set")
-        
-        try:
-            self.youtube = build('youtube', 'v3', developerKey=self.api_key)
-            logger.info("YouTube API client initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize YouTube API client: {str(e)}")
-            raise
+        logger.info("YouTube API client initialized successfully")
 
     def _extract_video_id(self, url: str) -> Optional[str]:
         """Extract video ID from YouTube URL"""
-        patterns = [
-            r'(?:v=|\/)([0-9A-Za-z_-]{11}).*',
-            r'(?:youtu\.be\/)([0-9A-Za-z_-]{11})',
-            r'(?:embed\/)([0-9A-Za-z_-]{11})',
-            r'(?:shorts\/)([0-9A-Za-z_-]{11})'
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, url)
-            if match:
-                video_id = match.group(1)
-                logger.debug(f"Extracted video ID: {video_id}")
-                return video_id
-        
+        classified = classify_url(url)
+        if classified and classified.platform == "youtube":
+            return classified.content_id
         logger.warning(f"Could not extract video ID from URL: {url}")
         return None
 
@@ -74,6 +63,51 @@ class YouTubeParser(BaseParser):
             logger.warning(f"Failed to convert value to integer: {value}")
             return default
 
+    async def _fetch_videos(self, video_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch video resources for up to 50 IDs with one videos.list call"""
+        params = {
+            "part": "snippet,statistics,contentDetails",
+            "id": ",".join(video_ids),
+            "key": self.api_key
+        }
+        async with self.http_client.session("googleapis") as session:
+            async with session.get(YOUTUBE_VIDEOS_URL, params=params) as response:
+                try:
+                    data = await response.json(content_type=None)
+                except ValueError:
+                    data = {}
+                if response.status != 200:
+                    error = data.get("error", {}) if isinstance(data, dict) else {}
+                    reasons = [item.get("reason", "") for item in error.get("errors", [])]
+                    error_msg = error.get("message") or f"YouTube API request failed (status {response.status})"
+                    if any("quota" in reason.lower() for reason in reasons) or "quota" in error_msg.lower():
+                        error_msg = "YouTube API quota exceeded. Please try again later."
+                    elif "keyInvalid" in reasons or ("invalid" in error_msg.lower() and "key" in error_msg.lower()):
+                        error_msg = "Invalid YouTube API key. Please check your API key configuration."
+                    logger.error(f"HTTP Error fetching YouTube data: {error_msg}")
+                    raise ValueError(error_msg)
+        return data.get('items', [])
+
+    def _build_result(self, video_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a videos.list item into the parser result format"""
+        snippet = video_data.get('snippet', {})
+        statistics = video_data.get('statistics', {})
+        content_details = video_data.get('contentDetails', {})
+        
+        # Check if video is available
+        if content_details.get('uploadStatus') not in (None, 'processed'):
+            logger.warning(f"Video {video_data.get('id')} is not fully processed yet")
+        
+        return {
+            "title": snippet.get('title', ''),
+            # Convert statistics to integers
+            "views": self._safe_int_conversion(statistics.get('viewCount', '0')),
+            "likes": self._safe_int_conversion(statistics.get('likeCount', '0')),
+            "comments": self._safe_int_conversion(statistics.get('commentCount', '0')),
+            "duration": content_details.get('duration', ''),
+            "published_at": snippet.get('publishedAt', '')
+        }
+
     async def parse_url(self, url: str) -> Optional[Dict]:
         """Parse YouTube URL and return video statistics"""
         logger.info(f"Starting to parse YouTube URL: {url}")
@@ -90,66 +124,65 @@ class YouTubeParser(BaseParser):
         try:
             # Request video data from the YouTube API
             logger.info("Fetching data from YouTube API...")
-            request = self.youtube.videos().list(
-                part="snippet,statistics,contentDetails",
-                id=video_id
-            )
-            response = request.execute()
-            
-            if not response.get('items'):
-                error_msg = "No video data found - the video might be private or deleted"
-                logger.error(error_msg)
-                raise ValueError(error_msg)
-            
-            video_data = response['items'][0]
-            snippet = video_data.get('snippet', {})
-            statistics = video_data.get('statistics', {})
-            content_details = video_data.get('contentDetails', {})
-            
-            # Convert statistics to integers
-            views = self._safe_int_conversion(statistics.get('viewCount', '0'))
-            likes = self._safe_int_conversion(statistics.get('likeCount', '0'))
-            comments = self._safe_int_conversion(statistics.get('commentCount', '0'))
-            
-            # Check if video is available
-            if content_details.get('uploadStatus') != 'processed':
-                logger.warning("Video is not fully processed yet")
-            
-            result = {
-                "title": snippet.get('title', ''),
-                "views": views,
-                "likes": likes,
-                "comments": comments,
-                "duration": content_details.get('duration', ''),
-                "published_at": snippet.get('publishedAt', '')
-            }
-            
-            logger.info("Successfully parsed video data:")
-            logger.info(f"Title: {result['title']}")
-            logger.info(f"Views: {views:,}")
-            logger.info(f"Likes: {likes:,}")
-            logger.info(f"Comments: {comments:,}")
-            
-            return result
-                
-        except HttpError as e:
-            error_msg = str(e)
-            if "quota" in error_msg.lower():
-                error_msg = "YouTube API quota exceeded. Please try again later."
-            elif "invalid" in error_msg.lower() and "key" in error_msg.lower():
-                error_msg = "Invalid YouTube API key. Please check your API key configuration."
-            logger.error(f"HTTP Error fetching YouTube data: {error_msg}")
-            raise ValueError(error_msg)
+            items = await self._fetch_videos([video_id])
+        except ValueError:
+            raise
         except Exception as e:
             error_msg = f"Unexpected error fetching YouTube data: {str(e)}"
             logger.error(error_msg)
             raise ValueError(error_msg)
+            
+        if not items:
+            error_msg = "No video data found - the video might be private or deleted"
+            logger.error(error_msg)
+            raise ValueError(error_msg)
+        
+        result = self._build_result(items[0])
+        logger.info("Successfully parsed video data:")
+        logger.info(f"Title: {result['title']}")
+        logger.info(f"Views: {result['views']:,}")
+        logger.info(f"Likes: {result['likes']:,}")
+        logger.info(f"Comments: {result['comments']:,}")
+        return result
+
+    async def parse_many(self, urls: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Parse many YouTube URLs with one videos.list call per 50 video IDs"""
+        results: Dict[str, Dict[str, Any]] = {}
+        urls_by_id: Dict[str, List[str]] = {}
+        for url in urls:
+            video_id = self._extract_video_id(url)
+            if video_id:
+                urls_by_id.setdefault(video_id, []).append(url)
+            else:
+                results[url] = {"error": "Invalid YouTube URL format"}
+
+        video_ids = list(urls_by_id)
+        chunks = [video_ids[i:i + self.batch_size] for i in range(0, len(video_ids), self.batch_size)]
+        logger.info(f"Fetching {len(video_ids)} YouTube videos in {len(chunks)} request(s)")
+        responses = await asyncio.gather(
+            *(self._fetch_videos(chunk) for chunk in chunks),
+            return_exceptions=True
+        )
+
+        for chunk, response in zip(chunks, responses):
+            if isinstance(response, Exception):
+                error = {"error": str(response)}
+                for video_id in chunk:
+                    for url in urls_by_id[video_id]:
+                        results[url] = error
+                continue
+            found = {item.get('id'): item for item in response}
+            for video_id in chunk:
+                item = found.get(video_id)
+                result = (
+                    self._build_result(item) if item
+                    else {"error": "No video data found - the video might be private or deleted"}
+                )
+                for url in urls_by_id[video_id]:
+                    results[url] = result
+        return results
 
     def validate_url(self, url: str) -> bool:
         """Validate if the URL is a YouTube URL"""
-        # First check if it's a YouTube URL
-        youtube_domains = ['youtube.com', 'youtu.be', 'youtube.be']
-        if not any(domain in url.lower() for domain in youtube_domains):
-            return False
-        # Then try to extract video ID
-        return bool(self._extract_video_id(url)) 
\ No newline at end of file
+        classified = classify_url(url)
+        return bool(classified and classified.platform == "youtube" and classified.content_id)
@@ -12,7 +12,8 @@ from backend.app.models.user_schemas import (
     UserProfileUpdate, UserProfileResponse, PasswordChangeRequest, 
     AccountDeletionRequest, ProfilePictureUpload
 )
-from backend.app.core.auth import get_current_user, get_password_hash, verify_password
+from backend.app.core.auth import get_current_user, aget_password_hash, averify_password
+from backend.app.core.principal_cache import principal_cache
 
 router = APIRouter(prefix="/api/user", tags=["user-settings"])
 
@@ -45,6 +46,7 @@ async def update_user_profile(
             current_user.timezone = profile_update.timezone
         
         db.commit()
+        principal_cache.invalidate(current_user)
         db.refresh(current_user)
         
         return current_user
@@ -91,6 +93,7 @@ async def upload_profile_picture(
         current_user.profile_picture = profile_picture_url
         
         db.commit()
+        principal_cache.invalidate(current_user)
         
         return ProfilePictureUpload(profile_picture_url=profile_picture_url)
         
@@ -108,14 +111,14 @@ async def change_password(
 ):
     """Change user password"""
     # Verify current password
-    if not verify_password(password_request.current_password, current_user.hashed_password):
+    if not await averify_password(password_request.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
         )
     
     # Check if new password is different from current
-    if verify_password(password_request.new_password, current_user.hashed_password):
+    if await averify_password(password_request.new_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="New password must be different from current password"
@@ -123,8 +126,9 @@ async def change_password(
     
     try:
         # Update password
-        current_user.hashed_password = get_password_hash(password_request.new_password)
+        current_user.hashed_password = await aget_password_hash(password_request.new_password)
         db.commit()
+        principal_cache.invalidate(current_user)
         
         return {"message": "Password changed successfully"}
         
@@ -143,7 +147,7 @@ async def delete_account(
 ):
     """Delete user account"""
     # Verify password
-    if not verify_password(deletion_request.password, current_user.hashed_password):
+    if not await averify_password(deletion_request.password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Password is incorrect"
@@ -160,6 +164,7 @@ async def delete_account(
                 pass  # Ignore errors when deleting profile picture
         
         # Delete user (this will cascade to related data)
+        principal_cache.invalidate(current_user)
         db.delete(current_user)
         db.commit()
         
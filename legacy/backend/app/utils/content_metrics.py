@@ -0,0 +1,137 @@
+"""
+Shared per-content metrics.
+
+Links are keyed by ``<platform>:<content id>`` from the URL classifier, and
+every link with the same key references one ``content_metrics`` row. A fetch
+stores its result there, and a link whose content was fetched less than
+``CONTENT_SHARE_WINDOW`` seconds ago reuses that result instead of calling
+the upstream API again, so content tracked by several companies is fetched
+once per refresh cycle.
+
+Backfill keys of existing links with:
+
+    python -m backend.app.utils.content_metrics
+"""
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from backend.app.models.models import ContentMetrics, Link
+from backend.app.utils.upsert import conflict_insert
+from backend.app.utils.url_classifier import classify_url
+
+logger = logging.getLogger(__name__)
+
+CONTENT_SHARE_WINDOW = float(os.getenv("CONTENT_SHARE_WINDOW", "300"))
+
+
+def content_key(url: str) -> Optional[str]:
+    classified = classify_url(url)
+    return classified.content_key if classified else None
+
+
+def ensure_content(db: Session, keys: Iterable[str]) -> None:
+    """Create the content_metrics rows that links are about to reference (no commit)"""
+    keys = {key for key in keys if key}
+    if not keys:
+        return
+    existing = set(db.execute(select(ContentMetrics.content_key).where(ContentMetrics.content_key.in_(keys))).scalars())
+    rows = []
+    for key in keys - existing:
+        platform, _, content_id = key.partition(":")
+        rows.append({"content_key": key, "platform": platform, "content_id": content_id})
+    if rows:
+        # Concurrent adds, imports and refreshes may create the same row
+        statement = conflict_insert(db, ContentMetrics)
+        if statement is None:
+            db.execute(insert(ContentMetrics), rows)
+        else:
+            db.execute(statement.on_conflict_do_nothing(index_elements=[ContentMetrics.content_key]), rows)
+
+
+def fresh_results(db: Session, keys: Iterable[str], max_age: float = None) -> Dict[str, Dict[str, Any]]:
+    """Parser-shaped results for keys fetched within ``max_age`` seconds"""
+    max_age = CONTENT_SHARE_WINDOW if max_age is None else max_age
+    keys = {key for key in keys if key}
+    if not keys or max_age <= 0:
+        return {}
+    cutoff = datetime.utcnow() - timedelta(seconds=max_age)
+    rows = db.query(ContentMetrics).filter(
+        ContentMetrics.content_key.in_(keys),
+        ContentMetrics.fetched_at >= cutoff,
+    ).all()
+    return {
+        row.content_key: {"title": row.title, "views": row.views, "likes": row.likes, "comments": row.comments}
+        for row in rows
+    }
+
+
+def store_results(db: Session, results: Dict[str, Dict[str, Any]], fetched_at: Optional[datetime] = None) -> None:
+    """Record fetched parser results per content key (no commit)"""
+    results = {key: parsed for key, parsed in results.items() if key}
+    if not results:
+        return
+    fetched_at = fetched_at or datetime.utcnow()
+    ensure_content(db, results)
+    rows = {row.content_key: row for row in db.query(ContentMetrics).filter(ContentMetrics.content_key.in_(results)).all()}
+    for key, parsed in results.items():
+        row = rows[key]
+        row.views = parsed.get("views") or 0
+        row.likes = parsed.get("likes") or 0
+        row.comments = parsed.get("comments") or 0
+        if parsed.get("title"):
+            row.title = parsed["title"]
+        row.fetched_at = fetched_at
+
+
+def backfill_keys(db: Session, batch_size: int = 1000) -> int:
+    """Set content_key on links that have none yet; returns the number of links keyed"""
+    updated = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.query(Link.id, Link.url)
+            .filter(Link.content_key.is_(None), Link.id > last_id)
+            .order_by(Link.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        last_id = rows[-1].id
+        keys: Dict[int, str] = {}
+        for link_id, url in rows:
+            key = content_key(url)
+            if key:
+                keys[link_id] = key
+        ensure_content(db, keys.values())
+        for link in db.query(Link).filter(Link.id.in_(list(keys))).all():
+            link.content_key = keys[link.id]
+        db.commit()
+        updated += len(keys)
+    return updated
+
+
+def group_by_content(links: Iterable[Tuple[int, str, str]]) -> Dict[str, list]:
+    """Group (id, url, platform) links by content key; URLs without one form their own group"""
+    groups: Dict[str, list] = {}
+    for link in links:
+        key = content_key(link[1]) or f"url:{link[1]}"
+        groups.setdefault(key, []).append(link)
+    return groups
+
+
+if __name__ == "__main__":
+    from backend.app.db.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    db = SessionLocal()
+    try:
+        keyed = backfill_keys(db)
+    finally:
+        db.close()
+    print(f"Set content keys on {keyed} links")
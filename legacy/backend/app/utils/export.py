@@ -0,0 +1,202 @@
+"""
+Streaming export of a company's links and metrics.
+
+Rows are read in partitions of ``EXPORT_BATCH_SIZE`` with ``yield_per``, so
+the database driver uses a server-side cursor where it has one, and each
+partition is encoded and handed to the response before the next is read.
+Memory use depends on the batch size, not on the number of links.
+"""
+import csv
+import io
+import json
+import os
+from datetime import datetime, timedelta
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend.app.models.models import Link, LinkMetrics, LinkMetricsHistory
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # parquet export is optional
+    pyarrow = None
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+LINK_COLUMNS = (
+    Link.id.label("link_id"),
+    Link.url,
+    Link.platform,
+    Link.title,
+    Link.created_at,
+    Link.monday_item_id,
+)
+
+# Column name -> parquet type name
+CURRENT_SCHEMA = (
+    ("link_id", "int64"), ("url", "string"), ("platform", "string"), ("title", "string"),
+    ("created_at", "timestamp"), ("monday_item_id", "string"),
+    ("views", "int64"), ("likes", "int64"), ("comments", "int64"), ("metrics_updated_at", "timestamp"),
+)
+HISTORY_SCHEMA = CURRENT_SCHEMA[:6] + (
+    ("views", "int64"), ("likes", "int64"), ("comments", "int64"), ("captured_at", "timestamp"),
+)
+
+
+def export_query(company_id: int, history: Optional[Tuple[datetime, datetime]] = None):
+    """Current metrics per link, or every snapshot in the half-open ``history`` range"""
+    if history is None:
+        return (
+            select(
+                *LINK_COLUMNS,
+                LinkMetrics.views,
+                LinkMetrics.likes,
+                LinkMetrics.comments,
+                LinkMetrics.updated_at.label("metrics_updated_at"),
+            )
+            .outerjoin(LinkMetrics, LinkMetrics.link_id == Link.id)
+            .where(Link.company_id == company_id)
+            .order_by(Link.id)
+        )
+    start, end = history
+    return (
+        select(
+            *LINK_COLUMNS,
+            LinkMetricsHistory.views,
+            LinkMetricsHistory.likes,
+            LinkMetricsHistory.comments,
+            LinkMetricsHistory.captured_at,
+        )
+        .join(LinkMetricsHistory, LinkMetricsHistory.link_id == Link.id)
+        .where(
+            Link.company_id == company_id,
+            LinkMetricsHistory.captured_at >= start,
+            LinkMetricsHistory.captured_at < end,
+        )
+        .order_by(Link.id, LinkMetricsHistory.captured_at)
+    )
+
+
+def iter_partitions(db: Session, query, batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Sequence]:
+    result = db.execute(query.execution_options(yield_per=batch_size))
+    try:
+        yield from result.partitions()
+    finally:
+        result.close()
+
+
+def _text(value: Any) -> Any:
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _encode_csv(columns: List[str]) -> Callable[[Sequence, bool], bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    def encode(rows: Sequence, last: bool) -> bytes:
+        for row in rows:
+            writer.writerow(["" if value is None else _text(value) for value in row])
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    return encode
+
+
+def _encode_ndjson(columns: List[str]) -> Callable[[Sequence, bool], bytes]:
+    def encode(rows: Sequence, last: bool) -> bytes:
+        return "".join(
+            json.dumps(dict(zip(columns, (_text(value) for value in row)))) + "\n" for row in rows
+        ).encode()
+
+    return encode
+
+
+class _Sink(io.RawIOBase):
+    """Write-only stream whose contents are drained after every row group"""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data, self.chunks = b"".join(self.chunks), []
+        return data
+
+
+def _encode_parquet(schema: Sequence[Tuple[str, str]]) -> Callable[[Sequence, bool], bytes]:
+    types = {"int64": pyarrow.int64(), "string": pyarrow.string(), "timestamp": pyarrow.timestamp("us")}
+    arrow_schema = pyarrow.schema([(name, types[kind]) for name, kind in schema])
+    sink = _Sink()
+    writer = pyarrow.parquet.ParquetWriter(sink, arrow_schema)
+
+    def encode(rows: Sequence, last: bool) -> bytes:
+        if rows:
+            # One row group per partition
+            columns = list(zip(*rows))
+            writer.write_table(pyarrow.Table.from_arrays(
+                [pyarrow.array(column, type=field.type) for column, field in zip(columns, arrow_schema)],
+                schema=arrow_schema,
+            ))
+        if last:
+            writer.close()
+        return sink.drain()
+
+    return encode
+
+
+def stream_export(
+    session_factory: Callable[[], Session],
+    company_id: int,
+    fmt: str,
+    history: Optional[Tuple[datetime, datetime]] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+) -> Iterator[bytes]:
+    """Encoded export chunks; opens its own session because it outlives the request handler"""
+    schema = HISTORY_SCHEMA if history is not None else CURRENT_SCHEMA
+    columns = [name for name, _ in schema]
+    if fmt == "csv":
+        encode = _encode_csv(columns)
+    elif fmt == "ndjson":
+        encode = _encode_ndjson(columns)
+    elif fmt == "parquet":
+        if pyarrow is None:
+            raise ValueError("Parquet export requires pyarrow")
+        encode = _encode_parquet(schema)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    db = session_factory()
+    try:
+        for rows in iter_partitions(db, export_query(company_id, history), batch_size):
+            chunk = encode(rows, False)
+            if chunk:
+                yield chunk
+        chunk = encode([], True)
+        if chunk:
+            yield chunk
+    finally:
+        db.close()
+
+
+def export_filename(company_id: int, fmt: str, history: Optional[Tuple[datetime, datetime]] = None) -> str:
+    # history ends are exclusive; name the file after the last included day
+    suffix = f"-history-{history[0]:%Y%m%d}-{history[1] - timedelta(days=1):%Y%m%d}" if history else ""
+    return f"company-{company_id}-links{suffix}.{FORMATS[fmt][1]}"
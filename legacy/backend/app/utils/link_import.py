@@ -0,0 +1,125 @@
+"""
+Bulk link import: validate, deduplicate and store many links at once.
+
+Every URL is checked with one pass of the URL classifier, existing links are found
+with a single IN query, and the new links, their empty metrics and their
+parse jobs are written with multi-row INSERTs in one transaction.
+"""
+import csv
+import io
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, List
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from backend.app.jobs.parse_link import fallback_title
+from backend.app.jobs.queue import PRIORITY_NEW_LINK, enqueue_many
+from backend.app.models.models import Link, LinkMetrics
+from backend.app.utils.content_metrics import ensure_content
+from backend.app.utils.rollups import apply_deltas
+from backend.app.utils.url_classifier import classify_url
+
+MAX_BULK_LINKS = int(os.getenv("MAX_BULK_LINKS", "5000"))
+
+INVALID_URL = "Invalid social media URL. Please provide a valid YouTube, TikTok, Instagram, or Facebook URL."
+
+
+def urls_from_csv(text: str) -> List[str]:
+    """URLs from CSV text: the ``url`` column if there is a header with one, else the first column"""
+    rows = [row for row in csv.reader(io.StringIO(text)) if any(cell.strip() for cell in row)]
+    if not rows:
+        return []
+    header = [cell.strip().lower() for cell in rows[0]]
+    if "url" in header:
+        column = header.index("url")
+        rows = rows[1:]
+    else:
+        column = 0
+    return [row[column] if column < len(row) else "" for row in rows]
+
+
+def classify(urls: Iterable[str]) -> List[Dict[str, Any]]:
+    """One result per input row: the stripped URL with its platform, or an error"""
+    results = []
+    for row, url in enumerate(urls, start=1):
+        url = (url or "").strip()
+        result: Dict[str, Any] = {"row": row, "url": url}
+        if not url:
+            result.update(status="invalid", error="URL cannot be empty")
+        else:
+            classified = classify_url(url)
+            if classified:
+                result.update(status="valid", platform=classified.platform, content_key=classified.content_key)
+            else:
+                result.update(status="invalid", error=INVALID_URL)
+        results.append(result)
+    return results
+
+
+def import_links(db: Session, company_id: int, user_id: int, urls: List[str]) -> Dict[str, Any]:
+    """Store the valid, not yet stored URLs for a company and queue their parse jobs.
+
+    Returns per-row results (``created``, ``duplicate`` or ``invalid``) and
+    their counts. Commits once.
+    """
+    results = classify(urls)
+    valid = [r for r in results if r["status"] == "valid"]
+
+    existing = set()
+    if valid:
+        existing = set(db.execute(
+            select(Link.url).where(Link.company_id == company_id, Link.url.in_({r["url"] for r in valid}))
+        ).scalars())
+    to_create: List[Dict[str, Any]] = []
+    seen = set()
+    for result in valid:
+        if result["url"] in existing:
+            result.update(status="duplicate", error="Link already exists for this company")
+        elif result["url"] in seen:
+            result.update(status="duplicate", error="Link appears earlier in this import")
+        else:
+            seen.add(result["url"])
+            to_create.append(result)
+
+    if to_create:
+        ensure_content(db, (r["content_key"] for r in to_create))
+        # RETURNING rows are matched back by URL (unique within to_create), so
+        # the driver is free to batch the rows into multi-row INSERTs
+        returned = db.execute(
+            insert(Link).returning(Link.id, Link.url),
+            [
+                {
+                    "url": r["url"],
+                    "platform": r["platform"],
+                    "title": fallback_title(r["platform"]),
+                    "user_id": user_id,
+                    "company_id": company_id,
+                    "content_key": r["content_key"],
+                }
+                for r in to_create
+            ],
+        ).all()
+        ids = {url: link_id for link_id, url in returned}
+        created = []
+        for result in to_create:
+            result.update(status="created", id=ids[result["url"]])
+            created.append(result["id"])
+        db.execute(insert(LinkMetrics), [
+            {"link_id": link_id, "views": 0, "likes": 0, "comments": 0} for link_id in created
+        ])
+        # Core inserts skip the flush hook, so count the new links in the rollups here
+        per_platform = Counter(r["platform"] for r in to_create)
+        apply_deltas(db, {(company_id, platform): [count, 0, 0, 0] for platform, count in per_platform.items()})
+        enqueue_many(db, created, priority=PRIORITY_NEW_LINK, commit=False)
+    db.commit()
+
+    counts = Counter(r["status"] for r in results)
+    return {
+        "total": len(results),
+        "created": counts["created"],
+        "duplicates": counts["duplicate"],
+        "invalid": counts["invalid"],
+        "results": results,
+    }
@@ -0,0 +1,166 @@
+"""
+Keyset-paginated link listing.
+
+Pages are selected with a ``(sort value, id)`` predicate instead of OFFSET,
+so every page costs the same no matter how deep it is. Only the columns the
+listing returns are selected; rows are never hydrated into ORM objects.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.sql import Select
+
+from backend.app.models.models import Link, LinkMetrics
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Sort key -> column; metric sorts are backed by the (column, link_id)
+# indexes on link_metrics, the id sort by (company_id, id) on links
+SORT_COLUMNS = {
+    "id": Link.id,
+    "views": LinkMetrics.views,
+    "likes": LinkMetrics.likes,
+    "updated_at": LinkMetrics.updated_at,
+}
+
+# Default direction per sort key: oldest links first, biggest metrics first
+DEFAULT_ORDER = {"id": "asc", "views": "desc", "likes": "desc", "updated_at": "desc"}
+
+COLUMNS = (
+    Link.id,
+    Link.url,
+    Link.platform,
+    Link.title,
+    Link.user_id,
+    Link.company_id,
+    Link.created_at,
+    Link.monday_item_id,
+    LinkMetrics.views,
+    LinkMetrics.likes,
+    LinkMetrics.comments,
+    LinkMetrics.updated_at.label("metrics_updated_at"),
+)
+
+
+def encode_cursor(sort: str, value: Any, link_id: int) -> str:
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([sort, value, link_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> Tuple[Any, int]:
+    """Return the (sort value, id) a cursor points after; ValueError if it is not valid for ``sort``"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        cursor_sort, value, link_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (TypeError, ValueError) as e:
+        raise ValueError("Malformed cursor") from e
+    if cursor_sort != sort or not isinstance(link_id, int):
+        raise ValueError("Cursor does not belong to this sort order")
+    if sort == "updated_at" and value is not None:
+        value = datetime.fromisoformat(value)
+    return value, link_id
+
+
+# Sort value of a link without a metrics row: what the row stored when a
+# link is added would hold, so paging after such a link still finds its place
+ANCHOR_DEFAULTS = {
+    "views": 0,
+    "likes": 0,
+    "updated_at": Link.created_at,
+}
+
+
+def anchor_query(link_id: int, sort: str) -> Select:
+    """SELECT of the sort value of ``link_id``, to page after it without a cursor"""
+    column = SORT_COLUMNS[sort]
+    if sort in ANCHOR_DEFAULTS:
+        column = func.coalesce(column, ANCHOR_DEFAULTS[sort])
+    return select(column).select_from(Link).outerjoin(
+        LinkMetrics, LinkMetrics.link_id == Link.id
+    ).where(Link.id == link_id)
+
+
+def links_page_query(
+    company_id: int,
+    sort: str = "id",
+    order: Optional[str] = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    after: Optional[Tuple[Any, int]] = None,
+    platform: Optional[str] = None,
+) -> Select:
+    """SELECT for one page; fetches ``limit + 1`` rows so the caller can tell if more follow.
+
+    Metric sorts inner-join link_metrics (every stored link gets a metrics
+    row when it is added), the id sort outer-joins it.
+    """
+    if sort not in SORT_COLUMNS:
+        raise ValueError(f"Unsupported sort: {sort}")
+    order = order or DEFAULT_ORDER[sort]
+    if order not in ("asc", "desc"):
+        raise ValueError(f"Unsupported order: {order}")
+    column = SORT_COLUMNS[sort]
+    descending = order == "desc"
+
+    query = select(*COLUMNS).where(Link.company_id == company_id)
+    if sort == "id":
+        query = query.outerjoin(LinkMetrics, LinkMetrics.link_id == Link.id)
+    else:
+        query = query.join(LinkMetrics, LinkMetrics.link_id == Link.id).where(column.isnot(None))
+    if platform:
+        query = query.where(func.lower(Link.platform) == platform.lower())
+
+    if after is not None:
+        value, last_id = after
+        if sort == "id":
+            query = query.where(Link.id < last_id if descending else Link.id > last_id)
+        elif descending:
+            query = query.where(or_(column < value, and_(column == value, Link.id < last_id)))
+        else:
+            query = query.where(or_(column > value, and_(column == value, Link.id > last_id)))
+
+    if sort == "id":
+        query = query.order_by(Link.id.desc() if descending else Link.id.asc())
+    elif descending:
+        query = query.order_by(column.desc(), Link.id.desc())
+    else:
+        query = query.order_by(column.asc(), Link.id.asc())
+    return query.limit(limit + 1)
+
+
+def _row_to_dict(row) -> Dict[str, Any]:
+    created_at = row.created_at
+    updated_at = row.metrics_updated_at
+    has_metrics = row.views is not None or updated_at is not None
+    return {
+        "id": row.id,
+        "url": row.url,
+        "platform": row.platform,
+        "title": row.title,
+        "user_id": row.user_id,
+        "company_id": row.company_id,
+        "created_at": created_at.isoformat() if created_at else None,
+        "monday_item_id": row.monday_item_id,
+        "metrics": {
+            "views": row.views,
+            "likes": row.likes,
+            "comments": row.comments,
+            "updated_at": updated_at.isoformat() if updated_at else None,
+        } if has_metrics else None,
+    }
+
+
+def build_page(rows: Sequence, sort: str, limit: int) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """JSON-ready items for the first ``limit`` rows and the cursor of the next page (None on the last page)"""
+    items = [_row_to_dict(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        value = last.id if sort == "id" else getattr(last, "metrics_updated_at" if sort == "updated_at" else sort)
+        next_cursor = encode_cursor(sort, value, last.id)
+    return items, next_cursor
@@ -0,0 +1,169 @@
+"""
+Append-only metrics history: snapshot writes and time-range queries
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, func, insert
+from sqlalchemy.orm import Session
+
+from backend.app.models.models import Link, LinkMetricsHistory
+
+# (link_id, views, likes, comments)
+Snapshot = Tuple[int, int, int, int]
+
+
+def record_snapshots(db: Session, snapshots: Iterable[Snapshot], captured_at: Optional[datetime] = None) -> int:
+    """Append one history row per snapshot with a single multi-row INSERT.
+
+    Does not commit, so the snapshots land in the same transaction as the
+    LinkMetrics update they describe.
+    """
+    captured_at = captured_at or datetime.utcnow()
+    rows = [
+        {
+            "link_id": link_id,
+            "views": views or 0,
+            "likes": likes or 0,
+            "comments": comments or 0,
+            "captured_at": captured_at,
+        }
+        for link_id, views, likes, comments in snapshots
+    ]
+    if rows:
+        db.execute(insert(LinkMetricsHistory), rows)
+    return len(rows)
+
+
+def day_range(start_date: datetime, end_date: datetime) -> Tuple[datetime, datetime]:
+    """Half-open [start, end) range covering whole days from start_date to end_date"""
+    start = datetime(start_date.year, start_date.month, start_date.day)
+    end = datetime(end_date.year, end_date.month, end_date.day) + timedelta(days=1)
+    return start, end
+
+
+def _company_snapshots(db: Session, company_id: int, start: datetime, end: datetime, platform: Optional[str] = None):
+    query = (
+        db.query(LinkMetricsHistory)
+        .join(Link, Link.id == LinkMetricsHistory.link_id)
+        .filter(
+            Link.company_id == company_id,
+            LinkMetricsHistory.captured_at >= start,
+            LinkMetricsHistory.captured_at < end,
+        )
+    )
+    if platform:
+        query = query.filter(func.lower(Link.platform) == platform.lower())
+    return query
+
+
+def daily_buckets(
+    db: Session,
+    company_id: int,
+    start: datetime,
+    end: datetime,
+    platform: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Per-day totals for a company between start (inclusive) and end (exclusive).
+
+    Each link contributes its highest value seen that day (the counters only
+    grow), so several refreshes on one day are not double counted.
+    """
+    day = func.date(LinkMetricsHistory.captured_at)
+    per_link = (
+        _company_snapshots(db, company_id, start, end, platform)
+        .with_entities(
+            LinkMetricsHistory.link_id.label("link_id"),
+            day.label("day"),
+            func.max(LinkMetricsHistory.views).label("views"),
+            func.max(LinkMetricsHistory.likes).label("likes"),
+            func.max(LinkMetricsHistory.comments).label("comments"),
+        )
+        .group_by(LinkMetricsHistory.link_id, day)
+        .subquery()
+    )
+    rows = (
+        db.query(
+            per_link.c.day,
+            func.sum(per_link.c.views),
+            func.sum(per_link.c.likes),
+            func.sum(per_link.c.comments),
+            func.count(per_link.c.link_id),
+        )
+        .group_by(per_link.c.day)
+        .order_by(per_link.c.day)
+        .all()
+    )
+    return [
+        {
+            "date": str(row[0]),
+            "views": int(row[1] or 0),
+            "likes": int(row[2] or 0),
+            "comments": int(row[3] or 0),
+            "links": row[4],
+        }
+        for row in rows
+    ]
+
+
+def growth_by_platform(
+    db: Session,
+    company_id: int,
+    start: datetime,
+    end: datetime,
+) -> Dict[str, Dict[str, int]]:
+    """First and last snapshot of every link in the range, summed per platform.
+
+    Growth of a link is its last value minus its first value within the
+    range; links with a single snapshot contribute no growth.
+    """
+    bounds = (
+        _company_snapshots(db, company_id, start, end)
+        .with_entities(
+            LinkMetricsHistory.link_id.label("link_id"),
+            func.min(LinkMetricsHistory.captured_at).label("first_at"),
+            func.max(LinkMetricsHistory.captured_at).label("last_at"),
+        )
+        .group_by(LinkMetricsHistory.link_id)
+        .subquery()
+    )
+
+    platform = func.lower(Link.platform)
+
+    def totals(at_column):
+        return dict(
+            (row[0], row[1:])
+            for row in db.query(
+                platform,
+                func.sum(LinkMetricsHistory.views),
+                func.sum(LinkMetricsHistory.likes),
+                func.sum(LinkMetricsHistory.comments),
+                func.count(LinkMetricsHistory.link_id.distinct()),
+            )
+            .select_from(bounds)
+            .join(LinkMetricsHistory, and_(
+                LinkMetricsHistory.link_id == bounds.c.link_id,
+                LinkMetricsHistory.captured_at == at_column,
+            ))
+            .join(Link, Link.id == bounds.c.link_id)
+            .group_by(platform)
+            .all()
+        )
+
+    first, last = totals(bounds.c.first_at), totals(bounds.c.last_at)
+    result = {}
+    for platform, (views, likes, comments, links) in last.items():
+        first_views, first_likes, first_comments, _ = first.get(platform, (0, 0, 0, 0))
+        result[platform] = {
+            "links": links,
+            "views_start": int(first_views or 0),
+            "views_end": int(views or 0),
+            "views_growth": int((views or 0) - (first_views or 0)),
+            "likes_start": int(first_likes or 0),
+            "likes_end": int(likes or 0),
+            "likes_growth": int((likes or 0) - (first_likes or 0)),
+            "comments_start": int(first_comments or 0),
+            "comments_end": int(comments or 0),
+            "comments_growth": int((comments or 0) - (first_comments or 0)),
+        }
+    return result
@@ -0,0 +1,314 @@
+"""
+Batched Monday.com metric pushes.
+
+Column updates for many items are sent as aliased
+``change_multiple_column_values`` mutations in one GraphQL document; item
+creation and archiving are batched the same way. Each
+document also asks for its ``complexity``, and the batch size follows the
+observed cost per mutation so documents stay under the per-query budget.
+The outcome of every item is written back to its Link row.
+"""
+import asyncio
+import json
+import logging
+import os
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam
+from sqlalchemy.orm import Session
+
+from backend.app.core.monday_client import monday_client
+from backend.app.models.models import Link, LinkMetrics, MondayConnection
+
+logger = logging.getLogger(__name__)
+
+MONDAY_BATCH_SIZE = int(os.getenv("MONDAY_BATCH_SIZE", "50"))
+# Starting estimate; replaced by the cost Monday reports for each document
+MONDAY_MUTATION_COMPLEXITY = int(os.getenv("MONDAY_MUTATION_COMPLEXITY", "30000"))
+MONDAY_QUERY_COMPLEXITY_BUDGET = int(os.getenv("MONDAY_QUERY_COMPLEXITY_BUDGET", "1000000"))
+
+
+@dataclass
+class ColumnUpdate:
+    link_id: int
+    item_id: str
+    column_values: Dict[str, str]
+
+
+def build_mutation(updates: Sequence[ColumnUpdate]) -> Tuple[str, Dict[str, Any]]:
+    """One GraphQL document with an ``u<N>`` alias per update; values travel as variables"""
+    params = ["$boardId: ID!"]
+    fields = ["complexity { query before after reset_in_x_seconds }"]
+    variables: Dict[str, Any] = {}
+    for index, update in enumerate(updates):
+        params.append(f"$item{index}: ID!, $values{index}: JSON!")
+        fields.append(
+            f"u{index}: change_multiple_column_values(board_id: $boardId, item_id: $item{index}, "
+            f"column_values: $values{index}) {{ id }}"
+        )
+        variables[f"item{index}"] = update.item_id
+        variables[f"values{index}"] = json.dumps(update.column_values)
+    return f"mutation ({', '.join(params)}) {{\n  " + "\n  ".join(fields) + "\n}", variables
+
+
+@dataclass
+class NewItem:
+    link_id: int
+    name: str
+    column_values: Dict[str, str]
+
+
+def build_create_mutation(items: Sequence[NewItem], subitems: bool = False) -> Tuple[str, Dict[str, Any]]:
+    """One ``c<N>`` alias per new item; subitems boards create under ``$parentId``"""
+    params = ["$parentId: ID!" if subitems else "$boardId: ID!"]
+    fields = ["complexity { query before after reset_in_x_seconds }"]
+    variables: Dict[str, Any] = {}
+    for index, item in enumerate(items):
+        params.append(f"$name{index}: String!, $values{index}: JSON!")
+        if subitems:
+            target = f"create_subitem(parent_item_id: $parentId, item_name: $name{index}, column_values: $values{index})"
+        else:
+            target = f"create_item(board_id: $boardId, item_name: $name{index}, column_values: $values{index})"
+        fields.append(f"c{index}: {target} {{ id }}")
+        variables[f"name{index}"] = item.name
+        variables[f"values{index}"] = json.dumps(item.column_values)
+    return f"mutation ({', '.join(params)}) {{\n  " + "\n  ".join(fields) + "\n}", variables
+
+
+def build_archive_mutation(item_ids: Sequence[str]) -> Tuple[str, Dict[str, Any]]:
+    """One ``a<N>`` alias per archived item"""
+    params, variables = [], {}
+    fields = ["complexity { query before after reset_in_x_seconds }"]
+    for index, item_id in enumerate(item_ids):
+        params.append(f"$item{index}: ID!")
+        fields.append(f"a{index}: archive_item(item_id: $item{index}) {{ id }}")
+        variables[f"item{index}"] = item_id
+    return f"mutation ({', '.join(params)}) {{\n  " + "\n  ".join(fields) + "\n}", variables
+
+
+def alias_errors(keys: Sequence[Any], body: Dict[str, Any], prefix: str) -> Dict[Any, Optional[str]]:
+    """Map a batch response to ``{key: error or None}`` for aliases ``<prefix><N>``.
+
+    Errors carrying a ``path`` fail their own alias only; any other error
+    fails the whole document, since Monday then applied none of it.
+    """
+    errors = list(body.get("errors") or [])
+    if body.get("error_message"):
+        errors.append({"message": body["error_message"]})
+    by_alias: Dict[str, str] = {}
+    for error in errors:
+        path = error.get("path") or []
+        if path:
+            by_alias[str(path[0])] = error.get("message", "Unknown error")
+        else:
+            message = error.get("message", "Unknown error")
+            return {key: message for key in keys}
+
+    data = body.get("data") or {}
+    results: Dict[Any, Optional[str]] = {}
+    for index, key in enumerate(keys):
+        alias = f"{prefix}{index}"
+        if alias in by_alias:
+            results[key] = by_alias[alias]
+        elif not data.get(alias):
+            results[key] = "Item was not updated"
+        else:
+            results[key] = None
+    return results
+
+
+def batch_errors(updates: Sequence[ColumnUpdate], body: Dict[str, Any]) -> Dict[int, Optional[str]]:
+    """Map a batch response to ``{link_id: error or None}``"""
+    return alias_errors([update.link_id for update in updates], body, "u")
+
+
+class MondayBatchWriter:
+    """Pushes column updates, new items and archives for one board in complexity-sized batches"""
+
+    def __init__(
+        self,
+        api_token: str,
+        board_id: str,
+        api_url: Optional[str] = None,
+        max_batch: Optional[int] = None,
+        mutation_cost: Optional[int] = None,
+        budget: Optional[int] = None,
+    ):
+        self.api_token = api_token
+        self.board_id = board_id
+        self.api_url = api_url
+        self.max_batch = max_batch or MONDAY_BATCH_SIZE
+        self.mutation_cost = mutation_cost or MONDAY_MUTATION_COMPLEXITY
+        self.budget = budget or MONDAY_QUERY_COMPLEXITY_BUDGET
+        self.requests = 0
+
+    @property
+    def batch_size(self) -> int:
+        return max(1, min(self.max_batch, self.budget // max(1, self.mutation_cost)))
+
+    def _observe(self, body: Dict[str, Any], count: int) -> None:
+        complexity = (body.get("data") or {}).get("complexity") or {}
+        if complexity.get("query"):
+            self.mutation_cost = max(1, -(-int(complexity["query"]) // count))
+
+    async def _batches(self, operations: Sequence[Any], build, kind: str):
+        """Send ``operations`` in documents made by ``build``; yields (batch, body, error)"""
+        pending = list(operations)
+        while pending:
+            batch, pending = pending[:self.batch_size], pending[self.batch_size:]
+            query, variables = build(batch)
+            self.requests += 1
+            try:
+                # The client queues the document until the token's budget covers it
+                body = await monday_client.execute(
+                    self.api_token, query, variables, cost=self.mutation_cost * len(batch), url=self.api_url
+                )
+            except Exception as e:
+                logger.error(f"Monday.com batch of {len(batch)} {kind} failed: {str(e)}")
+                yield batch, None, str(e)
+                continue
+            self._observe(body, len(batch))
+            yield batch, body, None
+
+    def _with_board(self, build):
+        def document(batch):
+            query, variables = build(batch)
+            variables["boardId"] = self.board_id
+            return query, variables
+        return document
+
+    async def push(self, updates: Sequence[ColumnUpdate]) -> Dict[int, Optional[str]]:
+        """Send every update; returns ``{link_id: error or None}``"""
+        results: Dict[int, Optional[str]] = {}
+        async for batch, body, error in self._batches(updates, self._with_board(build_mutation), "updates"):
+            if error:
+                results.update({update.link_id: error for update in batch})
+            else:
+                results.update(batch_errors(batch, body))
+        return results
+
+    async def create(
+        self, items: Sequence[NewItem], parent_item_id: Optional[str] = None
+    ) -> Dict[int, Tuple[Optional[str], Optional[str]]]:
+        """Create items (as subitems of ``parent_item_id`` when given).
+
+        Returns ``{link_id: (item_id, error)}``.
+        """
+        if parent_item_id:
+            def build(batch):
+                query, variables = build_create_mutation(batch, subitems=True)
+                variables["parentId"] = parent_item_id
+                return query, variables
+        else:
+            build = self._with_board(build_create_mutation)
+        results: Dict[int, Tuple[Optional[str], Optional[str]]] = {}
+        async for batch, body, error in self._batches(items, build, "creates"):
+            if error:
+                results.update({item.link_id: (None, error) for item in batch})
+                continue
+            errors = alias_errors([item.link_id for item in batch], body, "c")
+            data = body.get("data") or {}
+            for index, item in enumerate(batch):
+                created = data.get(f"c{index}") or {}
+                error = errors[item.link_id]
+                results[item.link_id] = (None, error) if error else (str(created["id"]), None)
+        return results
+
+    async def archive(self, item_ids: Sequence[str]) -> Dict[str, Optional[str]]:
+        """Archive items; returns ``{item_id: error or None}``"""
+        results: Dict[str, Optional[str]] = {}
+        async for batch, body, error in self._batches(item_ids, build_archive_mutation, "archives"):
+            if error:
+                results.update({item_id: error for item_id in batch})
+            else:
+                results.update(alias_errors(batch, body, "a"))
+        return results
+
+
+def load_updates(db: Session, connection: MondayConnection, link_ids: Sequence[int]) -> List[ColumnUpdate]:
+    """Column updates for the links that already have a Monday.com item"""
+    rows = (
+        db.query(Link.id, Link.monday_item_id, LinkMetrics.views, LinkMetrics.likes, LinkMetrics.comments)
+        .outerjoin(LinkMetrics, LinkMetrics.link_id == Link.id)
+        .filter(Link.id.in_(list(link_ids)), Link.monday_item_id.isnot(None))
+        .order_by(Link.id)
+        .all()
+    )
+    columns = (
+        (connection.views_column_id, "views"),
+        (connection.likes_column_id, "likes"),
+        (connection.comments_column_id, "comments"),
+    )
+    return [
+        ColumnUpdate(
+            link_id=row.id,
+            item_id=row.monday_item_id,
+            column_values={column_id: str(getattr(row, name) or 0) for column_id, name in columns if column_id},
+        )
+        for row in rows
+    ]
+
+
+def record_sync_results(db: Session, results: Dict[int, Optional[str]], synced_at: Optional[datetime] = None) -> None:
+    """Store per-link sync outcomes in one executemany (commits)"""
+    if not results:
+        return
+    links = Link.__table__
+    statement = (
+        links.update()
+        .where(links.c.id == bindparam("link_id"))
+        # Keep updated_at: a sync outcome is not a change to the link itself
+        .values(
+            monday_sync_status=bindparam("status"),
+            monday_sync_error=bindparam("error"),
+            monday_synced_at=bindparam("synced_at"),
+            updated_at=links.c.updated_at,
+        )
+    )
+    synced_at = synced_at or datetime.utcnow()
+    db.execute(statement, [
+        {"link_id": link_id, "status": "error" if error else "success", "error": error, "synced_at": synced_at}
+        for link_id, error in results.items()
+    ])
+    db.commit()
+
+
+async def sync_links_to_monday(session_factory, connection_id: int, link_ids: Sequence[int], **writer_options) -> Dict[str, int]:
+    """Push the metrics of the given links to their Monday.com items in batches.
+
+    Links without an item yet are skipped (items are created by the per-link
+    push). Returns counts of synced, failed and skipped links and requests sent.
+    """
+    def load():
+        db = session_factory()
+        try:
+            connection = db.get(MondayConnection, connection_id)
+            if connection is None or not connection.board_id:
+                return None, []
+            return (connection.api_token, connection.board_id), load_updates(db, connection, link_ids)
+        finally:
+            db.close()
+
+    def store(results):
+        db = session_factory()
+        try:
+            record_sync_results(db, results)
+        finally:
+            db.close()
+
+    board, updates = await asyncio.to_thread(load)
+    if board is None:
+        return {"synced": 0, "failed": 0, "skipped": len(link_ids), "requests": 0}
+    writer = MondayBatchWriter(*board, **writer_options)
+    results = await writer.push(updates)
+    await asyncio.to_thread(store, results)
+    failed = sum(1 for error in results.values() if error)
+    logger.info(f"Monday.com batch sync: {len(results) - failed} synced, {failed} failed in {writer.requests} requests")
+    return {
+        "synced": len(results) - failed,
+        "failed": failed,
+        "skipped": len(link_ids) - len(updates),
+        "requests": writer.requests,
+    }
@@ -0,0 +1,125 @@
+"""
+Cached Monday.com board metadata: board kind, columns and a parent item
+"""
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BOARD_QUERY = """
+query ($boardId: ID!) {
+    boards(ids: [$boardId]) {
+        id
+        name
+        board_kind
+        columns {
+            id
+            title
+        }
+        items_page(limit: 1) {
+            items {
+                id
+            }
+        }
+    }
+}
+"""
+
+
+@dataclass
+class BoardMetadata:
+    board_id: str
+    board_kind: Optional[str] = None
+    # column id -> title
+    columns: Dict[str, str] = field(default_factory=dict)
+    # First item on the board; new rows of a subitems board are created under it
+    parent_item_id: Optional[str] = None
+
+    @property
+    def is_subitems(self) -> bool:
+        return self.board_kind == "subitems"
+
+
+def parse_board(board_id: str, body: Dict[str, Any]) -> BoardMetadata:
+    boards = (body.get("data") or {}).get("boards") or []
+    if not boards:
+        return BoardMetadata(board_id=str(board_id))
+    board = boards[0]
+    items = (board.get("items_page") or {}).get("items") or []
+    return BoardMetadata(
+        board_id=str(board_id),
+        board_kind=board.get("board_kind"),
+        columns={column["id"]: column.get("title") for column in board.get("columns") or []},
+        parent_item_id=items[0]["id"] if items else None,
+    )
+
+
+class BoardMetadataCache:
+    """TTL + LRU cache of board metadata keyed by (connection id, board id).
+
+    Saving a connection's configuration calls :meth:`invalidate`; the TTL
+    bounds how long changes made on Monday.com itself go unnoticed.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_size: int = 1024):
+        self.ttl = ttl if ttl is not None else float(os.getenv("MONDAY_BOARD_CACHE_TTL", "600"))
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[int, str], Tuple[float, BoardMetadata]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, connection_id: int, board_id: str) -> Optional[BoardMetadata]:
+        key = (connection_id, str(board_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, connection_id: int, metadata: BoardMetadata) -> None:
+        if self.ttl <= 0:
+            return
+        key = (connection_id, metadata.board_id)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, metadata)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, connection_id: int) -> None:
+        """Drop every board of a connection; call after its configuration changed"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == connection_id]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0,
+            "invalidations": self.invalidations,
+        }
+
+
+# Create a singleton instance
+board_cache = BoardMetadataCache()
@@ -0,0 +1,144 @@
+"""
+Streaming reader for the items of a Monday.com board.
+
+The first page comes from ``boards { items_page }``; the rest follow its
+cursor through ``next_items_page`` until Monday returns no cursor. Pages
+are yielded as they arrive, so a board with tens of thousands of items is
+never held in memory at once.
+"""
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from backend.app.core.monday_client import MondayAPIError, MondayClient, monday_client
+
+logger = logging.getLogger(__name__)
+
+# Monday.com accepts up to 500 items per page
+MAX_PAGE_SIZE = 500
+MONDAY_ITEMS_PAGE_SIZE = int(os.getenv("MONDAY_ITEMS_PAGE_SIZE", "100"))
+
+ITEM_FIELDS = """
+            id
+            name
+            state
+            updated_at
+            column_values {
+                id
+                text
+            }
+"""
+
+FIRST_PAGE_QUERY = """
+query ($boardId: ID!, $limit: Int!) {
+    boards(ids: [$boardId]) {
+        items_page(limit: $limit) {
+            cursor
+            items {%s}
+        }
+    }
+}
+""" % ITEM_FIELDS
+
+NEXT_PAGE_QUERY = """
+query ($cursor: String!, $limit: Int!) {
+    next_items_page(cursor: $cursor, limit: $limit) {
+        cursor
+        items {%s}
+    }
+}
+""" % ITEM_FIELDS
+
+
+def page_size(requested: Optional[int] = None) -> int:
+    return max(1, min(requested or MONDAY_ITEMS_PAGE_SIZE, MAX_PAGE_SIZE))
+
+
+def _page(board_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+    if body.get("errors"):
+        raise MondayAPIError(body["errors"][0].get("message") or "Monday.com query failed", 400)
+    data = body.get("data") or {}
+    if "next_items_page" in data:
+        return data["next_items_page"] or {}
+    boards = data.get("boards") or []
+    if not boards:
+        raise MondayAPIError(f"Board {board_id} not found", 404)
+    return boards[0].get("items_page") or {}
+
+
+async def iter_item_pages(
+    api_token: str,
+    board_id: str,
+    limit: Optional[int] = None,
+    client: Optional[MondayClient] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield the board's items one page at a time, following cursors to the end.
+
+    Raises MondayAPIError when the board cannot be read; a cursor expiring
+    mid-board surfaces the same way.
+    """
+    client = client or monday_client
+    limit = page_size(limit)
+    body = await client.execute(api_token, FIRST_PAGE_QUERY, {"boardId": str(board_id), "limit": limit})
+    page = _page(board_id, body)
+    pages = 1
+    while True:
+        items = page.get("items") or []
+        if items:
+            yield items
+        cursor = page.get("cursor")
+        if not cursor:
+            break
+        body = await client.execute(api_token, NEXT_PAGE_QUERY, {"cursor": cursor, "limit": limit})
+        page = _page(board_id, body)
+        pages += 1
+    logger.debug(f"Read board {board_id} in {pages} page(s) of up to {limit} items")
+
+
+async def iter_board_items(
+    api_token: str,
+    board_id: str,
+    limit: Optional[int] = None,
+    client: Optional[MondayClient] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Yield every item of a board as it is read"""
+    async for items in iter_item_pages(api_token, board_id, limit, client):
+        for item in items:
+            yield item
+
+
+async def open_item_pages(
+    api_token: str,
+    board_id: str,
+    limit: Optional[int] = None,
+    client: Optional[MondayClient] = None,
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Read the first page now and return an iterator over all pages.
+
+    Lets an endpoint report a bad token or board with a proper status
+    before it commits to a streaming response.
+    """
+    pages = iter_item_pages(api_token, board_id, limit, client)
+    try:
+        first = await pages.__anext__()
+    except StopAsyncIteration:
+        first = None
+
+    async def chained() -> AsyncIterator[List[Dict[str, Any]]]:
+        if first is not None:
+            yield first
+        async for items in pages:
+            yield items
+
+    return chained()
+
+
+async def ndjson_chunks(pages: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[bytes]:
+    """One JSON item per line, one chunk per page"""
+    try:
+        async for items in pages:
+            yield "".join(json.dumps(item) + "\n" for item in items).encode()
+    except MondayAPIError as e:
+        # The status line is already sent; the client sees a truncated stream
+        logger.error(f"Monday.com board stream stopped: {str(e)}")
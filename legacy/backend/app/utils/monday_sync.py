@@ -1,9 +1,13 @@
-﻿import logging
+﻿import inspect
+import logging
 import json
-import aiohttp
 import os
 from datetime import datetime
+from typing import Optional, Tuple
+from backend.app.core.http_client import http_client
+from backend.app.core.monday_client import monday_client
 from backend.app.models.models import MondayConnection, User, Link, LinkMetrics
+from backend.app.utils.monday_boards import BOARD_QUERY, BoardMetadata, board_cache, parse_board
 from sqlalchemy.orm import Session
 
 # Configure logging
@@ -56,7 +60,7 @@ async def sync_link_to_monday(link: Link, db: Session) -> dict:
             }
         }
 
-        async with aiohttp.ClientSession() as session:
+        async with http_client.session("monday") as session:
             headers = {
                 "Authorization": connection.api_key,
                 "Content-Type": "application/json"
@@ -74,3 +78,127 @@ async def sync_link_to_monday(link: Link, db: Session) -> dict:
     except Exception as e:
         logging.error(f"Error syncing link to Monday.com: {str(e)}")
         raise 
+
+async def get_board_metadata(monday_connection: MondayConnection) -> BoardMetadata:
+    """Board kind, columns and parent item of a connection's board, cached per (connection, board)"""
+    metadata = board_cache.get(monday_connection.id, monday_connection.board_id)
+    if metadata is None:
+        body = await monday_client.execute(monday_connection.api_token, BOARD_QUERY, {"boardId": monday_connection.board_id})
+        metadata = parse_board(monday_connection.board_id, body)
+        if "errors" not in body:
+            board_cache.put(monday_connection.id, metadata)
+    return metadata
+
+async def push_link_to_monday(
+    link: Link,
+    metrics: Optional[LinkMetrics],
+    monday_connection: MondayConnection,
+    db: Session
+) -> Tuple[str, Optional[str]]:
+    """
+    Create or update the Monday.com item for a link.
+
+    Returns a (monday_sync_status, monday_error) tuple; the new item ID is
+    stored on the link when an item is created.
+    """
+    if not monday_connection or not monday_connection.board_id:
+        return 'not_configured', None
+
+    column_values = {
+        monday_connection.views_column_id: str(metrics.views if metrics else 0),
+        monday_connection.likes_column_id: str(metrics.likes if metrics else 0),
+        monday_connection.comments_column_id: str(metrics.comments if metrics else 0)
+    }
+    api_token = monday_connection.api_token
+
+    try:
+        if link.monday_item_id:
+            # Update existing item
+            mutation = """
+            mutation ($itemId: ID!, $boardId: ID!, $columnValues: JSON!) {
+                change_multiple_column_values (
+                    item_id: $itemId,
+                    board_id: $boardId,
+                    column_values: $columnValues
+                ) {
+                    id
+                }
+            }
+            """
+            data = await monday_client.execute(api_token, mutation, {
+                "itemId": link.monday_item_id,
+                "boardId": monday_connection.board_id,
+                "columnValues": json.dumps(column_values)
+            })
+            if "errors" in data:
+                return 'error', data["errors"][0]["message"]
+            logger.info(f"Successfully updated Monday.com item: {link.monday_item_id}")
+            return 'success', None
+
+        # Create new item - subitems boards need a parent item
+        board = await get_board_metadata(monday_connection)
+        logger.info(f"Board type: {board.board_kind}")
+        is_subitems_board = board.is_subitems
+
+        if is_subitems_board:
+            parent_item_id = board.parent_item_id
+            if not parent_item_id:
+                error = "No parent item found in subitems board. Please create a parent item first."
+                logger.error(error)
+                board_cache.invalidate(monday_connection.id)
+                return 'error', error
+            logger.info(f"Using parent item: {parent_item_id}")
+
+            mutation = """
+            mutation ($parentId: ID!, $itemName: String!, $columnValues: JSON!) {
+                create_subitem (
+                    parent_item_id: $parentId,
+                    item_name: $itemName,
+                    column_values: $columnValues
+                ) {
+                    id
+                }
+            }
+            """
+            variables = {
+                "parentId": parent_item_id,
+                "itemName": link.title or link.url,
+                "columnValues": json.dumps(column_values)
+            }
+        else:
+            mutation = """
+            mutation ($boardId: ID!, $itemName: String!, $columnValues: JSON!) {
+                create_item (
+                    board_id: $boardId,
+                    item_name: $itemName,
+                    column_values: $columnValues
+                ) {
+                    id
+                }
+            }
+            """
+            variables = {
+                "boardId": monday_connection.board_id,
+                "itemName": link.title or link.url,
+                "columnValues": json.dumps(column_values)
+            }
+
+        data = await monday_client.execute(api_token, mutation, variables)
+        if "errors" in data:
+            error = data["errors"][0]["message"]
+            logger.error(error)
+            # The cached parent item or board kind may be outdated
+            board_cache.invalidate(monday_connection.id)
+            return 'error', error
+
+        key = "create_subitem" if is_subitems_board else "create_item"
+        link.monday_item_id = data["data"][key]["id"]
+        # Accepts both a Session and the AsyncSession API of get_async_db
+        committed = db.commit()
+        if inspect.isawaitable(committed):
+            await committed
+        logger.info(f"Successfully created Monday.com item: {link.monday_item_id}")
+        return 'success', None
+    except Exception as e:
+        logger.error(f"Error syncing link {link.id} to Monday.com: {str(e)}", exc_info=True)
+        return 'error', str(e)
@@ -0,0 +1,403 @@
+"""
+Bulk refresh engine: refreshes every link of a company concurrently
+"""
+import argparse
+import asyncio
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.app.db.database import SessionLocal
+from backend.app.models.models import Link, LinkMetrics, MondayConnection
+from backend.app.core.single_flight import parser_flights
+from backend.app.parsers.parser_factory import ParserFactory, result_key
+from backend.app.utils.content_metrics import content_key, ensure_content, fresh_results, group_by_content, store_results
+from backend.app.utils.metrics_history import record_snapshots
+from backend.app.utils.monday_batch import sync_links_to_monday
+
+logger = logging.getLogger(__name__)
+
+# Default per-platform caps; upstream quotas differ a lot between providers.
+DEFAULT_PLATFORM_CONCURRENCY = {
+    "youtube": 10,
+    "tiktok": 3,
+    "instagram": 5,
+    "facebook": 5,
+}
+
+
+def _parse_platform_limits(value: Optional[str]) -> Dict[str, int]:
+    """Parse "tiktok=3,instagram=5" into a dict, ignoring malformed entries"""
+    limits = dict(DEFAULT_PLATFORM_CONCURRENCY)
+    if not value:
+        return limits
+    for entry in value.split(","):
+        name, _, number = entry.partition("=")
+        try:
+            limits[name.strip().lower()] = max(1, int(number))
+        except ValueError:
+            logger.warning(f"Ignoring invalid platform concurrency entry: {entry!r}")
+    return limits
+
+
+@dataclass
+class RefreshJob:
+    """Progress of one bulk refresh"""
+    company_id: int
+    user_id: Optional[int] = None
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: str = "queued"
+    total: int = 0
+    done: int = 0
+    failed: int = 0
+    # Links served by another link's fetch or by recently fetched content
+    shared: int = 0
+    errors: Dict[int, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    # Counts from the batched Monday.com push after the refresh
+    monday: Dict[str, int] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+
+    @property
+    def pending(self) -> int:
+        return max(0, self.total - self.done - self.failed)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "company_id": self.company_id,
+            "status": self.status,
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "pending": self.pending,
+            "shared": self.shared,
+            "errors": {str(link_id): error for link_id, error in list(self.errors.items())[:50]},
+            "error": self.error,
+            "monday": self.monday,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class RefreshEngine:
+    """Fans out parser calls with a global and a per-platform concurrency cap
+    and writes results back in batches."""
+
+    def __init__(
+        self,
+        parser_factory: ParserFactory,
+        session_factory=SessionLocal,
+        max_concurrency: Optional[int] = None,
+        platform_concurrency: Optional[Dict[str, int]] = None,
+        batch_size: Optional[int] = None,
+        max_jobs: int = 100,
+    ):
+        self.parser_factory = parser_factory
+        self.session_factory = session_factory
+        self.max_concurrency = max_concurrency or int(os.getenv("REFRESH_CONCURRENCY", "20"))
+        self.platform_concurrency = platform_concurrency or _parse_platform_limits(
+            os.getenv("REFRESH_PLATFORM_CONCURRENCY")
+        )
+        self.batch_size = batch_size or int(os.getenv("REFRESH_BATCH_SIZE", "50"))
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, RefreshJob]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    # ------------------------------------------------------------------ jobs
+
+    def get_job(self, job_id: str) -> Optional[RefreshJob]:
+        return self.jobs.get(job_id)
+
+    def _register(self, job: RefreshJob) -> None:
+        self.jobs[job.id] = job
+        # Forget the oldest finished jobs once the registry is full
+        while len(self.jobs) > self.max_jobs:
+            oldest_id = next(
+                (job_id for job_id, old in self.jobs.items() if old.status in ("completed", "failed")),
+                None,
+            )
+            if oldest_id is None:
+                break
+            del self.jobs[oldest_id]
+
+    def start_company_refresh(self, company_id: int, user_id: Optional[int] = None) -> RefreshJob:
+        """Schedule a background refresh of all links of a company"""
+        job = RefreshJob(company_id=company_id, user_id=user_id)
+        self._register(job)
+        task = asyncio.create_task(self.run(job))
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.id, None))
+        return job
+
+    # --------------------------------------------------------------- running
+
+    def _load_links(self, company_id: int) -> List[Tuple[int, str, str]]:
+        db = self.session_factory()
+        try:
+            rows = (
+                db.query(Link.id, Link.url, Link.platform)
+                .filter(Link.company_id == company_id)
+                .order_by(Link.id)
+                .all()
+            )
+            return [(row.id, row.url, (row.platform or "").lower()) for row in rows]
+        finally:
+            db.close()
+
+    async def run(self, job: RefreshJob, links: Optional[List[Tuple[int, str, str]]] = None) -> RefreshJob:
+        """Refresh the given (id, url, platform) links, or all links of the job's company"""
+        job.status = "running"
+        try:
+            if links is None:
+                links = await asyncio.to_thread(self._load_links, job.company_id)
+            job.total = len(links)
+            logger.info(f"Refresh job {job.id}: refreshing {job.total} links for company {job.company_id}")
+
+            results: asyncio.Queue = asyncio.Queue()
+            writer = asyncio.create_task(self._write_results(job, results))
+            try:
+                await self._fetch_all(job, links, results)
+            finally:
+                # Stop the writer however the fetch ended; what was fetched is still stored
+                results.put_nowait(None)
+                written = await writer
+            await self._push_to_monday(job, written)
+
+            job.status = "completed"
+        except asyncio.CancelledError:
+            logger.warning(f"Refresh job {job.id} was cancelled")
+            job.status = "failed"
+            job.error = "Cancelled"
+            raise
+        except Exception as e:
+            logger.error(f"Refresh job {job.id} failed: {str(e)}", exc_info=True)
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            job.finished_at = datetime.utcnow()
+        logger.info(f"Refresh job {job.id}: {job.done} done, {job.failed} failed")
+        return job
+
+    def _load_fresh(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        db = self.session_factory()
+        try:
+            return fresh_results(db, keys)
+        finally:
+            db.close()
+
+    async def _fetch_all(self, job: RefreshJob, links, results: asyncio.Queue) -> None:
+        global_limit = asyncio.Semaphore(self.max_concurrency)
+        platform_limits = {
+            platform: asyncio.Semaphore(limit) for platform, limit in self.platform_concurrency.items()
+        }
+
+        # Links of the same content are fetched once; content fetched recently
+        # (e.g. by another company's refresh) is not fetched at all
+        groups = group_by_content(links)
+        fresh = await asyncio.to_thread(self._load_fresh, [key for key in groups if not key.startswith("url:")])
+
+        async def report(group: List[Tuple[int, str, str]], key: str, parsed: Optional[Dict[str, Any]]):
+            if not parsed or parsed.get("error"):
+                error = (parsed or {}).get("error") or "Empty parser result"
+                for link_id, _, _ in group:
+                    await results.put((link_id, None, error, None))
+                return
+            fetched_key = None if key.startswith("url:") else key
+            for index, (link_id, _, _) in enumerate(group):
+                # Only the first link records the fetch in content_metrics
+                await results.put((link_id, parsed, None, fetched_key if index == 0 else None))
+
+        async def fail(group: List[Tuple[int, str, str]], error: str):
+            for link_id, _, _ in group:
+                await results.put((link_id, None, error, None))
+
+        async def fetch(parser, key: str, group: List[Tuple[int, str, str]], platform: str):
+            platform_limit = platform_limits.setdefault(platform, asyncio.Semaphore(self.max_concurrency))
+            async with platform_limit, global_limit:
+                url = group[0][1]
+                try:
+                    # Shares the call with a manual refresh of the same content
+                    parsed = await parser_flights.do(result_key(url), lambda: parser.parse_url(url))
+                except Exception as e:
+                    await fail(group, str(e))
+                    return
+            await report(group, key, parsed)
+
+        async def fetch_batch(parser, batch: List[Tuple[str, List[Tuple[int, str, str]]]], platform: str):
+            # One upstream call for the whole batch, so it takes a single slot
+            platform_limit = platform_limits.setdefault(platform, asyncio.Semaphore(self.max_concurrency))
+            async with platform_limit, global_limit:
+                try:
+                    parsed = await parser.parse_many([group[0][1] for _, group in batch])
+                except Exception as e:
+                    for _, group in batch:
+                        await fail(group, str(e))
+                    return
+            for key, group in batch:
+                await report(group, key, parsed.get(group[0][1]))
+
+        tasks = []
+        batched: Dict[str, List[Tuple[str, List[Tuple[int, str, str]]]]] = {}
+        parsers = {}
+        for key, group in groups.items():
+            if key in fresh:
+                job.shared += len(group)
+                for link_id, _, _ in group:
+                    await results.put((link_id, fresh[key], None, None))
+                continue
+            job.shared += len(group) - 1
+            _, url, platform = group[0]
+            parser = self.parser_factory.get_parser(url=url, platform=platform)
+            if not parser:
+                await fail(group, f"No parser for platform: {platform}")
+            elif getattr(parser, "batch_size", 1) > 1:
+                parsers[platform] = parser
+                batched.setdefault(platform, []).append((key, group))
+            else:
+                tasks.append(fetch(parser, key, group, platform))
+
+        for platform, platform_groups in batched.items():
+            parser = parsers[platform]
+            size = parser.batch_size
+            for i in range(0, len(platform_groups), size):
+                tasks.append(fetch_batch(parser, platform_groups[i:i + size], platform))
+
+        await asyncio.gather(*tasks)
+
+    async def _write_results(self, job: RefreshJob, results: asyncio.Queue) -> List[int]:
+        """Write results as they arrive; returns the ids of the links stored"""
+        written: List[int] = []
+        batch: List[Tuple[int, Dict[str, Any], Optional[str]]] = []
+        while True:
+            item = await results.get()
+            if item is None:
+                break
+            link_id, parsed, error, fetched_key = item
+            if error:
+                job.failed += 1
+                job.errors[link_id] = error
+                continue
+            batch.append((link_id, parsed, fetched_key))
+            if len(batch) >= self.batch_size:
+                if await self._flush(job, batch):
+                    written.extend(link_id for link_id, _, _ in batch)
+                batch = []
+        if batch and await self._flush(job, batch):
+            written.extend(link_id for link_id, _, _ in batch)
+        return written
+
+    async def _flush(self, job: RefreshJob, batch: List[Tuple[int, Dict[str, Any], Optional[str]]]) -> bool:
+        try:
+            await asyncio.to_thread(self._write_batch, batch)
+            job.done += len(batch)
+            return True
+        except Exception as e:
+            logger.error(f"Refresh job {job.id}: failed to write batch: {str(e)}", exc_info=True)
+            job.failed += len(batch)
+            for link_id, _, _ in batch:
+                job.errors[link_id] = f"Database error: {str(e)}"
+            return False
+
+    def _monday_connection_id(self, job: RefreshJob) -> Optional[int]:
+        db = self.session_factory()
+        try:
+            query = db.query(MondayConnection.id).filter(
+                MondayConnection.company_id == job.company_id,
+                MondayConnection.board_id.isnot(None),
+            )
+            if job.user_id is not None:
+                query = query.filter(MondayConnection.user_id == job.user_id)
+            return query.scalar()
+        finally:
+            db.close()
+
+    async def _push_to_monday(self, job: RefreshJob, link_ids: List[int]) -> None:
+        """Push refreshed metrics to Monday.com in batched mutations; failures are recorded per link"""
+        if not link_ids:
+            return
+        connection_id = await asyncio.to_thread(self._monday_connection_id, job)
+        if connection_id is None:
+            return
+        try:
+            job.monday = await sync_links_to_monday(self.session_factory, connection_id, link_ids)
+        except Exception as e:
+            # The metrics are stored; the next refresh pushes them again
+            logger.error(f"Refresh job {job.id}: Monday.com sync failed: {str(e)}", exc_info=True)
+            job.monday = {"error": str(e)}
+
+    def _write_batch(self, batch: List[Tuple[int, Dict[str, Any], Optional[str]]]) -> None:
+        """Persist one batch of parser results in a single transaction.
+
+        Each item is (link_id, parsed, fetched_key); fetched_key is set when
+        the result was fetched in this run and is stored as the content's metrics.
+        """
+        db: Session = self.session_factory()
+        try:
+            link_ids = [link_id for link_id, _, _ in batch]
+            links = {link.id: link for link in db.query(Link).filter(Link.id.in_(link_ids)).all()}
+            existing = {
+                metrics.link_id: metrics
+                for metrics in db.query(LinkMetrics).filter(LinkMetrics.link_id.in_(link_ids)).all()
+            }
+            now = datetime.utcnow()
+            store_results(db, {key: parsed for _, parsed, key in batch if key}, fetched_at=now)
+            # Key links added before content keys existed
+            unkeyed = {link.id: content_key(link.url) for link in links.values() if link.content_key is None}
+            ensure_content(db, unkeyed.values())
+            snapshots = []
+            for link_id, parsed, _ in batch:
+                link = links.get(link_id)
+                if link is None:
+                    continue  # deleted while the refresh was running
+                if unkeyed.get(link_id):
+                    link.content_key = unkeyed[link_id]
+                metrics = existing.get(link_id)
+                if metrics is None:
+                    metrics = LinkMetrics(link_id=link_id)
+                    db.add(metrics)
+                metrics.views = parsed.get("views") or 0
+                metrics.likes = parsed.get("likes") or 0
+                metrics.comments = parsed.get("comments") or 0
+                metrics.updated_at = now
+                if parsed.get("title"):
+                    link.title = parsed["title"]
+                snapshots.append((link_id, metrics.views, metrics.likes, metrics.comments))
+            record_snapshots(db, snapshots, captured_at=now)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+
+async def _main(company_id: int, concurrency: Optional[int]) -> int:
+    from backend.app.core.http_client import http_client
+
+    engine = RefreshEngine(ParserFactory(http_client=http_client), max_concurrency=concurrency)
+    job = RefreshJob(company_id=company_id)
+    try:
+        await engine.run(job)
+    finally:
+        await http_client.close()
+    print(f"Refreshed company {company_id}: {job.done} done, {job.failed} failed, {job.total} total")
+    for link_id, error in job.errors.items():
+        print(f"  link {link_id}: {error}")
+    return 0 if job.status == "completed" else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    arg_parser = argparse.ArgumentParser(description="Refresh metrics for all links of a company")
+    arg_parser.add_argument("company_id", type=int, help="ID of the company to refresh")
+    arg_parser.add_argument("--concurrency", type=int, default=None, help="Global concurrency cap")
+    args = arg_parser.parse_args()
+    raise SystemExit(asyncio.run(_main(args.company_id, args.concurrency)))
@@ -0,0 +1,122 @@
+"""
+Report query layer: one aggregate query per report, grouped by platform
+"""
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy import and_, func
+from sqlalchemy.orm import Session
+
+from backend.app.models.models import Link, LinkMetrics
+from backend.app.utils.metrics_history import day_range, daily_buckets, growth_by_platform
+
+# Report keys used by the frontend for each stored platform name
+PLATFORM_LABELS = {
+    "youtube": "YouTube",
+    "tiktok": "TikTok",
+    "instagram": "Instagram",
+    "facebook": "Facebook",
+}
+
+
+def platform_totals(db: Session, company_id: int, start: datetime, end: datetime) -> Dict[str, Dict[str, int]]:
+    """Metric sums per platform for links whose metrics were updated in [start, end).
+
+    Single query: links are outer-joined to metrics inside the range, so
+    ``links`` counts every link of the platform and ``count`` only those with
+    metrics in the range.
+    """
+    platform = func.lower(Link.platform)
+    rows = (
+        db.query(
+            platform,
+            func.count(Link.id),
+            func.count(LinkMetrics.id),
+            func.coalesce(func.sum(LinkMetrics.views), 0),
+            func.coalesce(func.sum(LinkMetrics.likes), 0),
+            func.coalesce(func.sum(LinkMetrics.comments), 0),
+        )
+        .outerjoin(LinkMetrics, and_(
+            LinkMetrics.link_id == Link.id,
+            LinkMetrics.updated_at >= start,
+            LinkMetrics.updated_at < end,
+        ))
+        .filter(Link.company_id == company_id)
+        .group_by(platform)
+        .all()
+    )
+    return {
+        name: {
+            "links": links,
+            "count": count,
+            "views": int(views),
+            "likes": int(likes),
+            "comments": int(comments),
+        }
+        for name, links, count, views, likes, comments in rows
+    }
+
+
+def platform_performance(db: Session, company_id: int, start_date: datetime, end_date: datetime) -> Dict[str, Dict[str, Any]]:
+    """Totals and per-link averages for each platform"""
+    start, end = day_range(start_date, end_date)
+    totals = platform_totals(db, company_id, start, end)
+    report = {}
+    for platform, label in PLATFORM_LABELS.items():
+        stats = totals.get(platform, {"views": 0, "likes": 0, "comments": 0, "count": 0})
+        count = stats["count"]
+        report[label] = {
+            "views": stats["views"],
+            "likes": stats["likes"],
+            "comments": stats["comments"],
+            "count": count,
+            "avg_views": stats["views"] / count if count else 0,
+            "avg_likes": stats["likes"] / count if count else 0,
+            "avg_comments": stats["comments"] / count if count else 0,
+        }
+    return report
+
+
+def engagement_analysis(db: Session, company_id: int, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    """Company-wide totals and engagement rate ((likes + comments) / views)"""
+    start, end = day_range(start_date, end_date)
+    totals = platform_totals(db, company_id, start, end).values()
+    report = {
+        "total_views": sum(t["views"] for t in totals),
+        "total_likes": sum(t["likes"] for t in totals),
+        "total_comments": sum(t["comments"] for t in totals),
+        "total_links": sum(t["links"] for t in totals),
+        "engagement_rate": 0,
+    }
+    if report["total_views"] > 0:
+        report["engagement_rate"] = (
+            (report["total_likes"] + report["total_comments"]) / report["total_views"]
+        ) * 100
+    return report
+
+
+def growth_trends(db: Session, company_id: int, start_date: datetime, end_date: datetime) -> Dict[str, Any]:
+    """Growth over the range from the metrics history.
+
+    Per link, growth is its last snapshot in the range minus its first one.
+    """
+    start, end = day_range(start_date, end_date)
+    platforms = growth_by_platform(db, company_id, start, end)
+    total_links = db.query(func.count(Link.id)).filter(Link.company_id == company_id).scalar()
+    report = {
+        "total_views": sum(p["views_end"] for p in platforms.values()),
+        "total_likes": sum(p["likes_end"] for p in platforms.values()),
+        "total_comments": sum(p["comments_end"] for p in platforms.values()),
+        "total_links": total_links,
+        "views_growth": sum(p["views_growth"] for p in platforms.values()),
+        "likes_growth": sum(p["likes_growth"] for p in platforms.values()),
+        "comments_growth": sum(p["comments_growth"] for p in platforms.values()),
+        "growth_rate": 0,
+        "platforms": platforms,
+        "daily": daily_buckets(db, company_id, start, end),
+    }
+    # Growth rate: percentage change in views over the range
+    views_start = sum(p["views_start"] for p in platforms.values())
+    if views_start > 0:
+        report["growth_rate"] = (report["views_growth"] / views_start) * 100
+    return report
@@ -0,0 +1,219 @@
+"""
+Per-company, per-platform metric rollups.
+
+``company_platform_rollup`` holds running totals: ``link_count`` follows
+every Link insert or delete (links without a metrics row count too), the
+metric sums follow the delta of every LinkMetrics insert, update or delete.
+The adjustment runs in a ``before_flush`` hook, so it is part of the same
+transaction as the write no matter which code path did it. Importing this
+module installs the hook.
+
+Repair with:
+
+    python -m backend.app.utils.rollups [--company-id N]
+"""
+import argparse
+import logging
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, insert, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import get_history
+
+from backend.app.models.models import CompanyPlatformRollup, Link, LinkMetrics
+from backend.app.utils.upsert import conflict_insert
+
+logger = logging.getLogger(__name__)
+
+METRIC_FIELDS = ("views", "likes", "comments")
+
+# (company_id, platform) -> [link_count, views, likes, comments]
+Deltas = Dict[Tuple[int, str], List[int]]
+
+
+def _old_value(metrics: LinkMetrics, name: str) -> int:
+    history = get_history(metrics, name)
+    if history.deleted:
+        return history.deleted[0] or 0
+    if history.unchanged:
+        return history.unchanged[0] or 0
+    return 0
+
+
+def _link_owner(link: Link, committed: bool = False) -> Tuple[Optional[int], str]:
+    if committed:
+        return _old_value(link, "company_id") or None, (_old_value(link, "platform") or "").lower()
+    return link.company_id, (link.platform or "").lower()
+
+
+def _collect_deltas(session: Session) -> Deltas:
+    deltas: Deltas = defaultdict(lambda: [0, 0, 0, 0])
+    for obj in session.new:
+        if isinstance(obj, Link):
+            deltas[_link_owner(obj)][0] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Link):
+            deltas[_link_owner(obj, committed=True)][0] -= 1
+
+    changes = []  # (metrics, [metric deltas])
+    for obj in session.new:
+        if isinstance(obj, LinkMetrics):
+            changes.append((obj, [getattr(obj, name) or 0 for name in METRIC_FIELDS]))
+    for obj in session.dirty:
+        if isinstance(obj, LinkMetrics) and session.is_modified(obj):
+            diff = [(getattr(obj, name) or 0) - _old_value(obj, name) for name in METRIC_FIELDS]
+            if any(diff):
+                changes.append((obj, diff))
+    for obj in session.deleted:
+        if isinstance(obj, LinkMetrics):
+            changes.append((obj, [-_old_value(obj, name) for name in METRIC_FIELDS]))
+
+    # Resolve company and platform of every touched link, with one query for
+    # links that are not already loaded in the session
+    owners = {}
+    lookup = defaultdict(list)
+    for metrics, _ in changes:
+        link = metrics.__dict__.get("link")
+        if link is not None:
+            owners[id(metrics)] = _link_owner(link, committed=link in session.deleted)
+        elif metrics.link_id is not None:
+            lookup[metrics.link_id].append(metrics)
+    if lookup:
+        for row in session.query(Link.id, Link.company_id, Link.platform).filter(Link.id.in_(list(lookup))).all():
+            for metrics in lookup[row.id]:
+                owners[id(metrics)] = (row.company_id, (row.platform or "").lower())
+
+    for metrics, diff in changes:
+        owner = owners.get(id(metrics))
+        if owner is None:
+            continue
+        delta = deltas[owner]
+        for i, value in enumerate(diff):
+            delta[i + 1] += value
+    # Links without a company are not part of any rollup
+    return {owner: delta for owner, delta in deltas.items() if owner[0] is not None}
+
+
+def apply_deltas(session: Session, deltas: Deltas) -> None:
+    """Add the given deltas to the rollup rows, creating rows as needed.
+
+    On PostgreSQL and SQLite this is a single INSERT .. ON CONFLICT per row,
+    so two transactions creating the same rollup row cannot race into a
+    primary key violation. Other databases get UPDATE, then INSERT when no
+    row was there.
+    """
+    now = datetime.utcnow()
+    for (company_id, platform), (count, views, likes, comments) in deltas.items():
+        if not any((count, views, likes, comments)):
+            continue
+        row = dict(
+            company_id=company_id,
+            platform=platform,
+            link_count=count,
+            views=views,
+            likes=likes,
+            comments=comments,
+            updated_at=now,
+        )
+        statement = conflict_insert(session, CompanyPlatformRollup)
+        if statement is None:
+            _update_or_insert(session, row)
+            continue
+        statement = statement.values(**row)
+        session.execute(statement.on_conflict_do_update(
+            index_elements=[CompanyPlatformRollup.company_id, CompanyPlatformRollup.platform],
+            set_={
+                "link_count": CompanyPlatformRollup.link_count + statement.excluded.link_count,
+                "views": CompanyPlatformRollup.views + statement.excluded.views,
+                "likes": CompanyPlatformRollup.likes + statement.excluded.likes,
+                "comments": CompanyPlatformRollup.comments + statement.excluded.comments,
+                "updated_at": statement.excluded.updated_at,
+            },
+        ))
+
+
+def _update_or_insert(session: Session, row: Dict[str, Any]) -> None:
+    result = session.execute(
+        update(CompanyPlatformRollup)
+        .where(CompanyPlatformRollup.company_id == row["company_id"], CompanyPlatformRollup.platform == row["platform"])
+        .values(
+            link_count=CompanyPlatformRollup.link_count + row["link_count"],
+            views=CompanyPlatformRollup.views + row["views"],
+            likes=CompanyPlatformRollup.likes + row["likes"],
+            comments=CompanyPlatformRollup.comments + row["comments"],
+            updated_at=row["updated_at"],
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        session.execute(insert(CompanyPlatformRollup).values(**row))
+
+
+@event.listens_for(Session, "before_flush")
+def _update_rollups(session: Session, flush_context, instances) -> None:
+    with session.no_autoflush:
+        deltas = _collect_deltas(session)
+        if deltas:
+            apply_deltas(session, deltas)
+
+
+def rebuild_rollups(db: Session, company_id: Optional[int] = None) -> int:
+    """Recompute rollups from links and link_metrics (all companies, or one); returns rows written"""
+    platform = func.lower(Link.platform)
+    query = (
+        db.query(
+            Link.company_id,
+            platform,
+            func.count(func.distinct(Link.id)),
+            func.coalesce(func.sum(LinkMetrics.views), 0),
+            func.coalesce(func.sum(LinkMetrics.likes), 0),
+            func.coalesce(func.sum(LinkMetrics.comments), 0),
+        )
+        .outerjoin(LinkMetrics, LinkMetrics.link_id == Link.id)
+        .filter(Link.company_id.isnot(None))
+        .group_by(Link.company_id, platform)
+    )
+    delete_query = db.query(CompanyPlatformRollup)
+    if company_id is not None:
+        query = query.filter(Link.company_id == company_id)
+        delete_query = delete_query.filter(CompanyPlatformRollup.company_id == company_id)
+
+    now = datetime.utcnow()
+    rows = [
+        {
+            "company_id": row[0],
+            "platform": row[1],
+            "link_count": row[2],
+            "views": row[3],
+            "likes": row[4],
+            "comments": row[5],
+            "updated_at": now,
+        }
+        for row in query.all()
+    ]
+    delete_query.delete(synchronize_session=False)
+    if rows:
+        db.execute(insert(CompanyPlatformRollup), rows)
+    db.commit()
+    return len(rows)
+
+
+def company_rollups(db: Session, company_id: int) -> List[CompanyPlatformRollup]:
+    return db.query(CompanyPlatformRollup).filter(CompanyPlatformRollup.company_id == company_id).all()
+
+
+if __name__ == "__main__":
+    from backend.app.db.database import SessionLocal
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    arg_parser = argparse.ArgumentParser(description="Rebuild company_platform_rollup from links and link_metrics")
+    arg_parser.add_argument("--company-id", type=int, default=None, help="Only rebuild this company")
+    args = arg_parser.parse_args()
+    db = SessionLocal()
+    try:
+        written = rebuild_rollups(db, args.company_id)
+    finally:
+        db.close()
+    print(f"Rebuilt {written} rollup rows")
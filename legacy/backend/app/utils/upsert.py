@@ -0,0 +1,19 @@
+"""
+Dialect-specific INSERT for ``ON CONFLICT`` clauses.
+
+PostgreSQL and SQLite share the ``on_conflict_do_update`` and
+``on_conflict_do_nothing`` API; other databases get None, and callers fall
+back to a plain read-then-write.
+"""
+from typing import Any, Optional
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def conflict_insert(session: Session, model: Any) -> Optional[Any]:
+    """INSERT for ``model`` with ON CONFLICT support, or None on other dialects"""
+    insert = _INSERTS.get(session.get_bind().dialect.name)
+    return insert(model) if insert else None
@@ -0,0 +1,104 @@
+"""
+Single-pass classifier for social media URLs.
+
+All supported URL shapes are compiled into one regex alternation, so a URL
+is matched once to get its platform, canonical URL and content ID. Main,
+the parser factory and the parsers all classify through ``classify_url``.
+"""
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+class ClassifiedURL(NamedTuple):
+    platform: str
+    canonical_url: str
+    # Platform ID of the post or video; None for short links (vm.tiktok.com,
+    # fb.watch, ...) whose target is only known after following the redirect
+    content_id: Optional[str]
+
+    @property
+    def content_key(self) -> Optional[str]:
+        """Key shared by every URL of the same content, e.g. ``youtube:dQw4w9WgXcQ``"""
+        return f"{self.platform}:{self.content_id}" if self.content_id else None
+
+
+def _youtube(groups: Dict[str, str]) -> Tuple[str, Optional[str]]:
+    return f"https://www.youtube.com/watch?v={groups['id']}", groups["id"]
+
+
+def _tiktok_video(groups: Dict[str, str]) -> Tuple[str, Optional[str]]:
+    return f"https://www.tiktok.com/@{groups['user']}/video/{groups['id']}", groups["id"]
+
+
+def _instagram_post(groups: Dict[str, str]) -> Tuple[str, Optional[str]]:
+    # Posts, reels and IGTV share one shortcode space; /p/ resolves all of them
+    return f"https://www.instagram.com/p/{groups['id']}/", groups["id"]
+
+
+def _instagram_story(groups: Dict[str, str]) -> Tuple[str, Optional[str]]:
+    if groups.get("id"):
+        return f"https://www.instagram.com/stories/{groups['user']}/{groups['id']}/", groups["id"]
+    return f"https://www.instagram.com/stories/{groups['user']}/", None
+
+
+def _facebook_video(groups: Dict[str, str]) -> Tuple[str, Optional[str]]:
+    return f"https://www.facebook.com/watch/?v={groups['id']}", groups["id"]
+
+
+def _facebook_reel(groups: Dict[str, str]) -> Tuple[str, Optional[str]]:
+    return f"https://www.facebook.com/reel/{groups['id']}", groups["id"]
+
+
+def _short(base: str) -> Callable[[Dict[str, str]], Tuple[str, Optional[str]]]:
+    return lambda groups: (f"{base}{groups['code']}", None)
+
+
+_SCHEME = r"(?:https?://)?"
+_WWW = r"(?:www\.)?"
+_YOUTUBE_ID = r"(?P<id>[\w-]{11})(?![\w-])"
+# Instagram URLs may carry a trailing path or query string, nothing else
+_INSTAGRAM_TAIL = r"(?:[/?].*)?$"
+
+# (platform, pattern, canonicalizer), tried in this order
+RULES: List[Tuple[str, str, Callable[[Dict[str, str]], Tuple[str, Optional[str]]]]] = [
+    ("youtube", _SCHEME + _WWW + r"youtube\.com/watch\?v=" + _YOUTUBE_ID, _youtube),
+    ("youtube", _SCHEME + _WWW + r"youtube\.com/shorts/" + _YOUTUBE_ID, _youtube),
+    ("youtube", _SCHEME + _WWW + r"youtube\.com/embed/" + _YOUTUBE_ID, _youtube),
+    ("youtube", _SCHEME + r"youtu\.be/" + _YOUTUBE_ID, _youtube),
+    ("tiktok", _SCHEME + _WWW + r"tiktok\.com/@(?P<user>[\w.-]+)/video/(?P<id>\d+)", _tiktok_video),
+    ("tiktok", _SCHEME + _WWW + r"tiktok\.com/t/(?P<code>[\w-]+)", _short("https://www.tiktok.com/t/")),
+    ("tiktok", _SCHEME + r"vm\.tiktok\.com/(?P<code>[\w-]+)", _short("https://vm.tiktok.com/")),
+    ("instagram", _SCHEME + _WWW + r"instagram\.com/(?:p|reels?|tv)/(?P<id>[\w-]+)" + _INSTAGRAM_TAIL, _instagram_post),
+    ("instagram", _SCHEME + _WWW + r"instagram\.com/stories/(?P<user>[\w.-]+)(?:/(?P<id>\d+))?" + _INSTAGRAM_TAIL, _instagram_story),
+    ("facebook", _SCHEME + _WWW + r"facebook\.com/reel/(?P<id>\d+)", _facebook_reel),
+    ("facebook", _SCHEME + _WWW + r"facebook\.com/[\w.-]+/videos/(?P<id>\d+)", _facebook_video),
+    ("facebook", _SCHEME + _WWW + r"facebook\.com/watch/\?v=(?P<id>\d+)", _facebook_video),
+    ("facebook", _SCHEME + _WWW + r"fb\.watch/(?P<code>[\w-]+)", _short("https://fb.watch/")),
+]
+
+def _compile(rules) -> Tuple["re.Pattern", Dict[str, Tuple[str, Callable, Dict[str, str]]]]:
+    """One alternation of every rule; each rule's groups get a unique r<N>_ prefix"""
+    parts = []
+    lookup = {}
+    for index, (platform, pattern, canonicalize) in enumerate(rules):
+        name = f"r{index}"
+        inner = re.compile(pattern).groupindex
+        parts.append(f"(?P<{name}>{pattern.replace('(?P<', f'(?P<{name}_')})")
+        lookup[name] = (platform, canonicalize, {f"{name}_{group}": group for group in inner})
+    return re.compile("|".join(parts)), lookup
+
+
+_CLASSIFIER_RE, _RULES_BY_GROUP = _compile(RULES)
+
+
+def classify_url(url: str) -> Optional[ClassifiedURL]:
+    """Classify a URL in one regex match; None when no supported shape matches"""
+    if not url:
+        return None
+    match = _CLASSIFIER_RE.match(url.strip())
+    if match is None:
+        return None
+    # The rule's own group closes after its inner groups, so it is lastgroup
+    platform, canonicalize, groups = _RULES_BY_GROUP[match.lastgroup]
+    canonical_url, content_id = canonicalize({short: match.group(full) for full, short in groups.items()})
+    return ClassifiedURL(platform, canonical_url, content_id)
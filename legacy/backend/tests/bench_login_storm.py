@@ -0,0 +1,81 @@
+"""
+Login-storm benchmark: event loop latency while many bcrypt verifications run.
+
+Compares verifying on the event loop (the old behaviour) with the bounded
+password executor. A probe task measures how late a 10 ms sleep wakes up,
+which is the extra latency every other request would see.
+
+    python backend/tests/bench_login_storm.py [--logins 40] [--rounds 12]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import os
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+
+async def _probe(stop: asyncio.Event, lags):
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append((time.perf_counter() - started - 0.01) * 1000)
+
+
+async def _storm(logins: int, hashed: str, pooled: bool):
+    from backend.app.core import auth
+
+    async def login():
+        if pooled:
+            return await auth.averify_password("correct horse", hashed)
+        return auth.verify_password("correct horse", hashed)
+
+    lags = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(stop, lags))
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+    assert all(results)
+    lags.sort()
+    return {
+        "logins_per_second": logins / elapsed,
+        "lag_p50_ms": statistics.median(lags) if lags else float("nan"),
+        "lag_max_ms": lags[-1] if lags else float("nan"),
+        "probe_samples": len(lags),
+    }
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Event loop latency during a login storm")
+    arg_parser.add_argument("--logins", type=int, default=40)
+    arg_parser.add_argument("--rounds", type=int, default=12)
+    args = arg_parser.parse_args()
+
+    from passlib.context import CryptContext
+    from backend.app.core import auth
+
+    # auth builds its context at import time, so replace it rather than rely on BCRYPT_ROUNDS
+    auth.BCRYPT_ROUNDS = args.rounds
+    auth.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=args.rounds)
+
+    hashed = auth.get_password_hash("correct horse")
+    print(f"{args.logins} logins, bcrypt rounds={args.rounds}, password workers={auth.PASSWORD_HASH_WORKERS}")
+    for label, pooled in (("on event loop", False), ("password executor", True)):
+        result = asyncio.run(_storm(args.logins, hashed, pooled))
+        print(
+            f"  {label:18s} {result['logins_per_second']:7.1f} logins/s  "
+            f"loop lag p50={result['lag_p50_ms']:.1f} ms max={result['lag_max_ms']:.1f} ms  "
+            f"({result['probe_samples']} probes)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+URL classifier benchmark: classify_url against the previous multi-regex checks.
+
+The previous approach ran uncompiled validation patterns platform by
+platform and then a second set of patterns to extract the ID; it is kept
+here only for comparison.
+
+    python backend/tests/bench_url_classifier.py [--size 200000]
+"""
+import argparse
+import random
+import re
+import sys
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.utils.url_classifier import classify_url
+
+
+def _corpus(size: int) -> List[str]:
+    rng = random.Random(17)
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-"
+
+    def token(length):
+        return "".join(rng.choice(alphabet) for _ in range(length))
+
+    def digits(length):
+        return "".join(rng.choice("0123456789") for _ in range(length))
+
+    makers = [
+        lambda: f"https://www.youtube.com/watch?v={token(11)}",
+        lambda: f"https://youtu.be/{token(11)}",
+        lambda: f"https://www.youtube.com/shorts/{token(11)}",
+        lambda: f"https://www.tiktok.com/@user.{token(6)}/video/{digits(19)}",
+        lambda: f"https://vm.tiktok.com/{token(9)}",
+        lambda: f"https://www.instagram.com/reel/{token(11)}/?igsh={token(16)}",
+        lambda: f"https://www.instagram.com/p/{token(11)}/",
+        lambda: f"https://www.facebook.com/reel/{digits(16)}",
+        lambda: f"https://www.facebook.com/page.{token(5)}/videos/{digits(16)}",
+        lambda: f"https://example.com/{token(12)}",
+    ]
+    return [rng.choice(makers)() for _ in range(size)]
+
+
+def _legacy_classify(url: str) -> Optional[Tuple[str, Optional[str]]]:
+    """The previous approach, for comparison: uncompiled patterns per platform,
+    then a second set of patterns to extract the ID"""
+    validators = {
+        "youtube": [r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/watch\?v=[\w-]+',
+                    r'(?:https?:\/\/)?(?:www\.)?youtube\.com\/shorts\/[\w-]+',
+                    r'(?:https?:\/\/)?youtu\.be\/[\w-]+'],
+        "tiktok": [r'(?:https?:\/\/)?(?:www\.)?tiktok\.com\/@[\w.-]+\/video\/\d+',
+                   r'(?:https?:\/\/)?(?:www\.)?tiktok\.com\/t\/[\w-]+',
+                   r'(?:https?:\/\/)?vm\.tiktok\.com\/[\w-]+'],
+        "instagram": [r'(?:https?:\/\/)?(?:www\.)?instagram\.com\/(?:p|reel)\/[\w-]+(?:\/.*)?(?:\?.*)?$',
+                      r'(?:https?:\/\/)?(?:www\.)?instagram\.com\/reels\/[\w-]+(?:\/.*)?(?:\?.*)?$',
+                      r'(?:https?:\/\/)?(?:www\.)?instagram\.com\/(?:stories|tv)\/[\w-]+(?:\/.*)?(?:\?.*)?$'],
+        "facebook": [r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/reel\/\d+',
+                     r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/[\w.-]+\/videos\/\d+',
+                     r'(?:https?:\/\/)?(?:www\.)?facebook\.com\/watch\/\?v=\d+',
+                     r'(?:https?:\/\/)?(?:www\.)?fb\.watch\/[\w-]+'],
+    }
+    extractors = {
+        "youtube": [r'(?:v=|\/)([0-9A-Za-z_-]{11}).*', r'(?:youtu\.be\/)([0-9A-Za-z_-]{11})',
+                    r'(?:embed\/)([0-9A-Za-z_-]{11})', r'(?:shorts\/)([0-9A-Za-z_-]{11})'],
+        "tiktok": [r'video/(\d+)', r'v/(\d+)', r'@[\w.-]+/video/(\d+)', r'vm\.tiktok\.com/(\w+)', r'tiktok\.com/t/(\w+)'],
+        "instagram": [r'/(?:p|reel)/([\w-]+)'],
+        "facebook": [r'facebook\.com\/reel\/(\d+)', r'facebook\.com\/.*\/videos\/(\d+)', r'facebook\.com\/watch\/\?v=(\d+)'],
+    }
+    for platform, patterns in validators.items():
+        if any(re.match(pattern, url) for pattern in patterns):
+            for pattern in extractors[platform]:
+                match = re.search(pattern, url)
+                if match:
+                    return platform, match.group(1)
+            return platform, None
+    return None
+
+
+def benchmark(size: int) -> Dict[str, float]:
+    """URLs per second for classify_url and for the previous multi-regex approach"""
+    corpus = _corpus(size)
+    results = {}
+    for name, fn in (("classify_url", classify_url), ("legacy", _legacy_classify)):
+        started = time.perf_counter()
+        for url in corpus:
+            fn(url)
+        results[name] = size / (time.perf_counter() - started)
+    return results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Benchmark URL classification")
+    arg_parser.add_argument("--size", type=int, default=200_000, help="Number of URLs in the corpus")
+    args = arg_parser.parse_args()
+    rates = benchmark(args.size)
+    print(f"{args.size} URLs")
+    for name, rate in rates.items():
+        print(f"  {name:14s} {rate:12,.0f} URLs/s")
+    print(f"  {'speedup':14s} {rates['classify_url'] / rates['legacy']:12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
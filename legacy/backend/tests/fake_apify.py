@@ -0,0 +1,76 @@
+"""
+In-process stand-in for the subset of the Apify API the TikTok parser uses:
+starting an actor run, long-polling its status, aborting it and reading its
+dataset.
+"""
+import itertools
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+
+class FakeApify:
+    def __init__(self, items_by_url=None, polls_until_done=0, final_status="SUCCEEDED"):
+        # postURL -> dataset item returned for it (missing URLs yield nothing)
+        self.items_by_url = items_by_url or {}
+        # Status requests a run needs before it finishes; 0 means the
+        # waitForFinish on the start request already sees it finished.
+        self.polls_until_done = polls_until_done
+        self.final_status = final_status
+        self.requests = []
+        self.runs = {}
+        self._ids = itertools.count(1)
+        self.server = None
+
+    @property
+    def api_base(self) -> str:
+        return str(self.server.make_url("/v2"))
+
+    def _run_data(self, run):
+        status = self.final_status if run["polls_left"] <= 0 else "RUNNING"
+        return {"data": {"id": run["id"], "status": status, "defaultDatasetId": run["dataset_id"]}}
+
+    async def start_run(self, request):
+        self.requests.append(("start", dict(request.query)))
+        body = await request.json()
+        run_id = f"run{next(self._ids)}"
+        run = {
+            "id": run_id,
+            "dataset_id": f"ds-{run_id}",
+            "post_urls": body["postURLs"],
+            "polls_left": self.polls_until_done,
+        }
+        self.runs[run_id] = run
+        return web.json_response(self._run_data(run), status=201)
+
+    async def get_run(self, request):
+        self.requests.append(("status", dict(request.query)))
+        run = self.runs[request.match_info["run_id"]]
+        run["polls_left"] -= 1
+        return web.json_response(self._run_data(run))
+
+    async def abort_run(self, request):
+        self.requests.append(("abort", dict(request.query)))
+        run = self.runs[request.match_info["run_id"]]
+        run["aborted"] = True
+        return web.json_response({"data": {"id": run["id"], "status": "ABORTING"}})
+
+    async def dataset_items(self, request):
+        self.requests.append(("dataset", dict(request.query)))
+        dataset_id = request.match_info["dataset_id"]
+        run = next(run for run in self.runs.values() if run["dataset_id"] == dataset_id)
+        items = [self.items_by_url[url] for url in run["post_urls"] if url in self.items_by_url]
+        return web.json_response(items)
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/v2/acts/{actor_id}/runs", self.start_run)
+        app.router.add_get("/v2/actor-runs/{run_id}", self.get_run)
+        app.router.add_post("/v2/actor-runs/{run_id}/abort", self.abort_run)
+        app.router.add_get("/v2/datasets/{dataset_id}/items", self.dataset_items)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.server.close()
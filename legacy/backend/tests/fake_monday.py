@@ -0,0 +1,154 @@
+"""
+In-process stand-in for the subset of the Monday.com GraphQL API the sync
+code uses. Queries are recognised by the fields they contain, not parsed.
+"""
+import json
+import re
+from datetime import datetime, timedelta
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+ITEM_CREATE = re.compile(
+    r"(\w+): (create_item|create_subitem)\((?:board_id|parent_item_id): \$(\w+), item_name: \$(\w+), column_values: \$(\w+)\)"
+)
+ITEM_ARCHIVE = re.compile(r"(\w+): archive_item\(item_id: \$(\w+)\)")
+PAGE_LIMIT = re.compile(r"items_page\(limit: (\d+)\)")
+COLUMN_UPDATE = re.compile(
+    r"(\w+): change_multiple_column_values\(board_id: \$(\w+), item_id: \$(\w+), column_values: \$(\w+)\)"
+)
+
+
+class FakeMonday:
+    def __init__(self, items=None, mutation_cost=1000, budget=10_000_000, board_kind="public", columns=None,
+                 rate_limited=0, retry_in=0):
+        # item_id -> {"name": ..., "column_values": {...}}
+        self.items = items or {}
+        self.board_kind = board_kind
+        self.columns = columns or {"views": "Views", "likes": "Likes", "comments": "Comments"}
+        self._next_id = 900000
+        self.mutation_cost = mutation_cost
+        self.budget = budget
+        # The first ``rate_limited`` requests get a budget-exhausted error
+        self.rate_limited = rate_limited
+        self.retry_in = retry_in
+        self.requests = []
+        self.pages = 0
+        self.clock = datetime(2026, 10, 18)
+        self.server = None
+
+    @property
+    def api_url(self) -> str:
+        return str(self.server.make_url("/v2"))
+
+    def _complexity(self, cost):
+        before = self.budget
+        self.budget -= cost
+        return {"query": cost, "before": before, "after": self.budget, "reset_in_x_seconds": 60}
+
+    async def graphql(self, request):
+        body = await request.json()
+        query, variables = body["query"], body.get("variables") or {}
+        self.requests.append(body)
+        if len(self.requests) <= self.rate_limited:
+            return web.json_response({"errors": [{
+                "message": f"Complexity budget exhausted, reset in {self.retry_in} seconds",
+                "extensions": {"code": "ComplexityException", "retry_in_seconds": self.retry_in},
+            }]})
+        data, errors = {}, []
+        updates = COLUMN_UPDATE.findall(query)
+        for alias, board_var, item_var, values_var in updates:
+            item = self.items.get(str(variables[item_var]))
+            if item is None:
+                data[alias] = None
+                errors.append({"message": f"Item {variables[item_var]} not found", "path": [alias]})
+                continue
+            item["column_values"].update(json.loads(variables[values_var]))
+            item["updated_at"] = self.tick()
+            data[alias] = {"id": str(variables[item_var])}
+        creates = ITEM_CREATE.findall(query)
+        for alias, mutation, parent_var, name_var, values_var in creates:
+            data[alias] = self._create({
+                "itemName": variables[name_var],
+                "columnValues": variables[values_var],
+                "parentId": variables[parent_var] if mutation == "create_subitem" else None,
+            })
+        archives = ITEM_ARCHIVE.findall(query)
+        for alias, item_var in archives:
+            item = self.items.get(str(variables[item_var]))
+            if item is None:
+                data[alias] = None
+                errors.append({"message": f"Item {variables[item_var]} not found", "path": [alias]})
+                continue
+            item["state"] = "archived"
+            item["updated_at"] = self.tick()
+            data[alias] = {"id": str(variables[item_var])}
+        updates = updates + creates + archives
+        if "boards(ids:" in query:
+            data["boards"] = [self._board(variables, query)]
+        if "next_items_page(" in query:
+            data["next_items_page"] = self._items_page(int(variables["cursor"]), variables["limit"])
+        for mutation in ("create_item", "create_subitem"):
+            if not creates and (f"{mutation} (" in query or f"{mutation}(" in query):
+                data[mutation] = self._create(variables)
+        if "complexity" in query:
+            data["complexity"] = self._complexity(self.mutation_cost * max(1, len(updates)))
+        response = {"data": data}
+        if errors:
+            response["errors"] = errors
+        return web.json_response(response)
+
+    def _board(self, variables, query):
+        board = {"id": str(variables.get("boardId")), "name": "Board", "board_kind": self.board_kind}
+        board["columns"] = [{"id": column_id, "title": title} for column_id, title in self.columns.items()]
+        if "items_page" in query:
+            match = PAGE_LIMIT.search(query)
+            board["items_page"] = self._items_page(0, int(match.group(1)) if match else variables["limit"])
+        return board
+
+    def _items_page(self, offset, limit):
+        # Cursors are plain offsets; item ids sort numerically
+        ids = sorted(
+            (item_id for item_id, item in self.items.items() if item.get("state", "active") == "active"),
+            key=lambda item_id: (len(item_id), item_id),
+        )
+        page = [self._item(item_id) for item_id in ids[offset:offset + limit]]
+        cursor = str(offset + limit) if offset + limit < len(ids) else None
+        self.pages += 1
+        return {"cursor": cursor, "items": page}
+
+    def _item(self, item_id):
+        item = self.items[item_id]
+        return {
+            "id": item_id,
+            "name": item.get("name"),
+            "state": item.get("state", "active"),
+            "updated_at": item.get("updated_at"),
+            "column_values": [{"id": column_id, "text": text} for column_id, text in item["column_values"].items()],
+        }
+
+    def _create(self, variables):
+        self._next_id += 1
+        item_id = str(self._next_id)
+        self.items[item_id] = {
+            "name": variables.get("itemName"),
+            "column_values": json.loads(variables.get("columnValues") or "{}"),
+            "parent_id": variables.get("parentId"),
+            "updated_at": self.tick(),
+        }
+        return {"id": item_id}
+
+    def tick(self):
+        """Monday.com-style ISO timestamp, one second later than the last"""
+        self.clock += timedelta(seconds=1)
+        return self.clock.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/v2", self.graphql)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.server.close()
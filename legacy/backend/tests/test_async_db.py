@@ -0,0 +1,151 @@
+import sys
+import os
+import asyncio
+import json
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+DB_PATH = os.path.join(tempfile.mkdtemp(), "async_db.db")
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + DB_PATH)
+for key in ("YOUTUBE_API_KEY", "APIFY_TOKEN", "RAPIDAPI_KEY"):
+    os.environ.setdefault(key, "test")
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.db.database import SyncSessionAdapter, async_database_url, engine_options
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics
+import backend.app.main as main
+
+
+class FakeParser:
+    async def parse_url(self, url):
+        return {"views": 500, "likes": 50, "comments": 5}
+
+
+class FailingParser:
+    async def parse_url(self, url):
+        raise ValueError("upstream failure")
+
+
+def _seed(engine):
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(username="async", email="async@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="Async Co", owner_id=user.id)
+    db.add(company)
+    db.commit()
+    link = Link(url="https://www.youtube.com/watch?v=abc", platform="youtube", user_id=user.id, company_id=company.id)
+    link.metrics = LinkMetrics(views=100, likes=10, comments=1)
+    db.add_all([link, Link(url="https://www.tiktok.com/@a/video/1", platform="tiktok", user_id=user.id, company_id=company.id)])
+    db.commit()
+    ids = user.id, company.id, link.id
+    db.close()
+    return ids
+
+
+async def _exercise(db, user, company_id, link_id, views_before):
+    response = await main.get_links(
+        company_id, limit=100, after_id=None, cursor=None, sort="id", order=None, platform=None,
+        db=db, current_user=user
+    )
+    links = json.loads(response.body)
+    assert len(links) == 2
+    by_platform = {link["platform"]: link for link in links}
+    assert by_platform["youtube"]["metrics"]["views"] == views_before
+    assert by_platform["tiktok"]["metrics"] is None
+
+    refreshed = await main.refresh_link(link_id, force=False, db=db, current_user=user)
+    assert refreshed["metrics"]["views"] == 500
+    assert refreshed["monday_sync_status"] == "not_configured"
+
+    stats = await main.get_company_stats(company_id, db=db, current_user=user)
+    assert stats["total_views"] == 500
+    assert stats["platform_stats"]["YouTube"]["likes"] == 50
+
+
+async def _exercise_failure(db, user, link_id, views_before):
+    # A failed parse rolls back; the stored metrics are returned unchanged
+    refreshed = await main.refresh_link(link_id, force=True, db=db, current_user=user)
+    assert refreshed["id"] == link_id
+    assert refreshed["metrics"]["views"] == views_before
+    assert refreshed["monday_sync_status"] == "not_configured"
+
+
+def test_engine_options():
+    assert engine_options("sqlite:///x.db") == {
+        "echo": False,
+        "pool_pre_ping": True,
+        "pool_recycle": 1800,
+        "connect_args": {"check_same_thread": False},
+    }
+    options = engine_options("postgresql://u:p@db/app")
+    assert options["pool_size"] == 5 and options["max_overflow"] == 10 and options["echo"] is False
+    assert async_database_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    assert async_database_url("sqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_hot_endpoints_on_both_session_kinds():
+    engine = create_engine("sqlite:///" + DB_PATH, connect_args={"check_same_thread": False})
+    user_id, company_id, link_id = _seed(engine)
+    user = User(id=user_id, username="async", email="async@example.com")
+    original_get_parser = main.parser_factory.get_parser
+    main.parser_factory.get_parser = lambda url=None, platform=None: FakeParser()
+    try:
+        # Threaded adapter over the regular Session (DB_ASYNC=false)
+        adapter = SyncSessionAdapter(sessionmaker(bind=engine)())
+        try:
+            asyncio.run(_exercise(adapter, user, company_id, link_id, 100))
+        finally:
+            asyncio.run(adapter.close())
+
+        # Native AsyncSession on aiosqlite (DB_ASYNC=true)
+        async def run_async():
+            async_engine = create_async_engine(async_database_url("sqlite:///" + DB_PATH))
+            try:
+                async with async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)() as db:
+                    # Second pass starts from the metrics stored by the first
+                    await _exercise(db, user, company_id, link_id, 500)
+            finally:
+                await async_engine.dispose()
+
+        asyncio.run(run_async())
+    finally:
+        main.parser_factory.get_parser = original_get_parser
+
+
+def test_failed_refresh_returns_stored_metrics():
+    path = os.path.join(tempfile.mkdtemp(), "async_db_failure.db")
+    engine = create_engine("sqlite:///" + path, connect_args={"check_same_thread": False})
+    user_id, _, link_id = _seed(engine)
+    user = User(id=user_id, username="async", email="async@example.com")
+    original_get_parser = main.parser_factory.get_parser
+    main.parser_factory.get_parser = lambda url=None, platform=None: FailingParser()
+    try:
+        adapter = SyncSessionAdapter(sessionmaker(bind=engine)())
+        try:
+            asyncio.run(_exercise_failure(adapter, user, link_id, 100))
+        finally:
+            asyncio.run(adapter.close())
+
+        async def run_async():
+            async_engine = create_async_engine(async_database_url("sqlite:///" + path))
+            try:
+                async with async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False)() as db:
+                    await _exercise_failure(db, user, link_id, 100)
+            finally:
+                await async_engine.dispose()
+
+        asyncio.run(run_async())
+    finally:
+        main.parser_factory.get_parser = original_get_parser
+
+
+if __name__ == "__main__":
+    test_engine_options()
+    test_hot_endpoints_on_both_session_kinds()
+    test_failed_refresh_returns_stored_metrics()
+    print("async db tests passed")
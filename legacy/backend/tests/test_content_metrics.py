@@ -0,0 +1,142 @@
+import asyncio
+import sys
+import os
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "content_metrics.db"))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.jobs.parse_link import parse_link
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics, ContentMetrics
+from backend.app.utils.content_metrics import backfill_keys, ensure_content
+from backend.app.utils.refresh_engine import RefreshEngine, RefreshJob
+
+VIDEO = "dQw4w9WgXcQ"
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = []
+
+    async def parse_url(self, url):
+        self.calls.append(url)
+        return {"title": "Shared video", "views": 1000, "likes": 50, "comments": 5}
+
+
+class FakeParserFactory:
+    def __init__(self, parser):
+        self.parser = parser
+
+    def get_parser(self, url=None, platform=None):
+        return self.parser
+
+
+def _make_session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    user = User(username="shared", email="shared@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    companies = [Company(name=f"Company {i}", owner_id=user.id) for i in range(3)]
+    db.add_all(companies)
+    db.commit()
+    # Links created before content keys existed: the same video in three URL shapes
+    urls = [f"https://youtu.be/{VIDEO}", f"https://www.youtube.com/watch?v={VIDEO}", f"https://youtube.com/shorts/{VIDEO}"]
+    for company, url in zip(companies, urls):
+        db.add(Link(url=url, platform="youtube", user_id=user.id, company_id=company.id))
+    db.add(Link(url=urls[1] + "&t=10", platform="youtube", user_id=user.id, company_id=companies[0].id))
+    db.commit()
+    company_ids = [company.id for company in companies]
+    db.close()
+    return session_factory, company_ids
+
+
+def test_content_fetched_once_across_companies():
+    session_factory, company_ids = _make_session_factory()
+    parser = CountingParser()
+    engine = RefreshEngine(FakeParserFactory(parser), session_factory=session_factory, max_concurrency=4)
+
+    first = asyncio.run(engine.run(RefreshJob(company_id=company_ids[0])))
+    assert (first.done, first.failed, first.shared) == (2, 0, 1)
+    assert len(parser.calls) == 1
+
+    # A second company tracking the same video reuses the fresh fetch
+    second = asyncio.run(engine.run(RefreshJob(company_id=company_ids[1])))
+    assert (second.done, second.shared) == (1, 1)
+    assert len(parser.calls) == 1
+    assert second.to_dict()["shared"] == 1
+
+    db = session_factory()
+    try:
+        content = db.query(ContentMetrics).one()
+        assert (content.content_key, content.views, content.title) == (f"youtube:{VIDEO}", 1000, "Shared video")
+        refreshed = db.query(Link).filter(Link.company_id.in_(company_ids[:2])).all()
+        assert all(link.content_key == content.content_key for link in refreshed)
+        assert sorted(m.views for m in db.query(LinkMetrics).all()) == [1000, 1000, 1000]
+        third_link_id = db.query(Link.id).filter(Link.company_id == company_ids[2]).scalar()
+    finally:
+        db.close()
+
+    # The parse job of a third company's link reuses it as well
+    asyncio.run(parse_link(third_link_id, FakeParserFactory(parser), session_factory=session_factory))
+    assert len(parser.calls) == 1
+    db = session_factory()
+    try:
+        assert db.query(LinkMetrics).filter(LinkMetrics.link_id == third_link_id).one().views == 1000
+        assert db.get(Link, third_link_id).content_key == f"youtube:{VIDEO}"
+    finally:
+        db.close()
+
+
+def test_backfill_keys():
+    session_factory, company_ids = _make_session_factory()
+    db = session_factory()
+    try:
+        db.add(Link(url="https://fb.watch/abc/", platform="facebook", company_id=company_ids[0]))
+        db.commit()
+        assert backfill_keys(db, batch_size=2) == 4
+        assert db.query(ContentMetrics).count() == 1
+        assert db.query(Link).filter(Link.content_key.is_(None)).count() == 1  # short links have no key
+        assert backfill_keys(db) == 0
+    finally:
+        db.close()
+
+
+def test_ensure_content_tolerates_concurrent_insert():
+    session_factory, _ = _make_session_factory()
+    db = session_factory()
+    key = f"youtube:{VIDEO}"
+
+    raced = []
+
+    # Another writer stores the row between our lookup and our insert
+    def race(conn, cursor, statement, parameters, context, executemany):
+        if not raced and statement.startswith("SELECT") and "content_metrics" in statement:
+            raced.append(statement)
+            conn.exec_driver_sql(
+                "INSERT INTO content_metrics (content_key, platform, content_id) VALUES (?, ?, ?)",
+                (key, "youtube", VIDEO),
+            )
+
+    event.listen(db.get_bind(), "after_cursor_execute", race)
+    try:
+        ensure_content(db, [key, "tiktok:1"])
+        db.commit()
+        assert raced
+        assert {row.content_key for row in db.query(ContentMetrics)} == {key, "tiktok:1"}
+    finally:
+        event.remove(db.get_bind(), "after_cursor_execute", race)
+        db.close()
+
+
+if __name__ == "__main__":
+    test_content_fetched_once_across_companies()
+    test_backfill_keys()
+    test_ensure_content_tolerates_concurrent_insert()
+    print("content metrics tests passed")
@@ -0,0 +1,82 @@
+import sys
+import os
+import csv
+import io
+import json
+import tempfile
+from datetime import datetime
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "export.db"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics
+from backend.app.utils import export
+from backend.app.utils.metrics_history import day_range, record_snapshots
+
+
+def _make_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    db = factory()
+    user = User(username="export", email="export@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="Export Co", owner_id=user.id)
+    db.add(company)
+    db.commit()
+    for i in range(25):
+        link = Link(url=f"https://example.com/{i}", platform="youtube", title=f"Video, {i}", user_id=user.id, company_id=company.id)
+        link.metrics = LinkMetrics(views=i * 10, likes=i, comments=0)
+        db.add(link)
+    db.commit()
+    ids = [link_id for (link_id,) in db.query(Link.id).order_by(Link.id)]
+    record_snapshots(db, [(link_id, 1, 0, 0) for link_id in ids], captured_at=datetime(2026, 3, 1, 12))
+    record_snapshots(db, [(link_id, 2, 0, 0) for link_id in ids[:5]], captured_at=datetime(2026, 3, 2, 12))
+    record_snapshots(db, [(link_id, 3, 0, 0) for link_id in ids[:5]], captured_at=datetime(2026, 3, 5, 12))
+    db.commit()
+    company_id = company.id
+    db.close()
+    return factory, company_id
+
+
+def test_csv_streams_one_chunk_per_partition():
+    factory, company_id = _make_factory()
+    chunks = list(export.stream_export(factory, company_id, "csv", batch_size=10))
+    assert len(chunks) == 3  # header rides with the first partition
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert rows[0] == [name for name, _ in export.CURRENT_SCHEMA]
+    assert len(rows) == 26
+    assert rows[1][3] == "Video, 0" and rows[25][6] == "240"
+
+
+def test_ndjson_history_window():
+    factory, company_id = _make_factory()
+    history = day_range(datetime(2026, 3, 1), datetime(2026, 3, 2))
+    lines = b"".join(export.stream_export(factory, company_id, "ndjson", history, batch_size=7)).decode().splitlines()
+    records = [json.loads(line) for line in lines]
+    assert len(records) == 30  # 25 snapshots on the first day, 5 on the second
+    assert records[0]["captured_at"] == "2026-03-01T12:00:00"
+    assert {r["views"] for r in records} == {1, 2}
+    assert export.export_filename(company_id, "ndjson", history).endswith("history-20260301-20260302.ndjson")
+
+
+def test_parquet_when_available():
+    if export.pyarrow is None:
+        return
+    import pyarrow.parquet
+    factory, company_id = _make_factory()
+    data = b"".join(export.stream_export(factory, company_id, "parquet", batch_size=10))
+    table = pyarrow.parquet.read_table(io.BytesIO(data))
+    assert table.num_rows == 25 and table.column("views").to_pylist()[-1] == 240
+
+
+if __name__ == "__main__":
+    test_csv_streams_one_chunk_per_partition()
+    test_ndjson_history_window()
+    test_parquet_when_available()
+    print("export tests passed")
@@ -0,0 +1,58 @@
+import asyncio
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from backend.app.core.http_client import HTTPClientManager, PoolConfig
+
+
+async def _run_pool_reuse():
+    app = web.Application()
+    app.router.add_get("/ping", lambda request: web.json_response({"ok": True}))
+    server = TestServer(app)
+    await server.start_server()
+    client = HTTPClientManager(pools={"monday": PoolConfig(limit_per_host=2)})
+    try:
+        for _ in range(5):
+            async with client.session("monday") as session:
+                async with session.get(server.make_url("/ping")) as response:
+                    assert response.status == 200
+                    assert (await response.json()) == {"ok": True}
+
+        # Unknown pools fall back to the default pool
+        assert client.get_session("does-not-exist") is client.get_session("default")
+        return client.metrics()
+    finally:
+        await client.close()
+        await server.close()
+
+
+def test_shared_session_reuses_connections():
+    metrics = asyncio.run(_run_pool_reuse())
+    monday = metrics["monday"]
+    assert monday["requests"] == 5
+    assert monday["handshakes"] == 1
+    assert monday["connections_reused"] == 4
+    assert monday["limit_per_host"] == 2
+
+
+def test_close_releases_sessions():
+    async def run():
+        client = HTTPClientManager()
+        session = client.get_session("apify")
+        await client.close()
+        return session, client.metrics()
+
+    session, metrics = asyncio.run(run())
+    assert session.closed
+    assert metrics["apify"]["open"] is False
+
+
+if __name__ == "__main__":
+    test_shared_session_reuses_connections()
+    test_close_releases_sessions()
+    print("HTTP client pool tests passed")
@@ -0,0 +1,186 @@
+import asyncio
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "job_queue.db"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics, ParseJob
+from backend.app.jobs import queue
+from backend.app.jobs.worker import JobWorker
+
+
+def _make_session_factory(link_count=3):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    user = User(username="queue", email="queue@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="Queue Co", owner_id=user.id)
+    db.add(company)
+    db.commit()
+    for i in range(link_count):
+        db.add(Link(url=f"https://www.youtube.com/watch?v=video{i:05d}", platform="youtube",
+                    user_id=user.id, company_id=company.id))
+    db.commit()
+    db.close()
+    return session_factory
+
+
+def test_enqueue_dedupes_and_bumps_priority():
+    session_factory = _make_session_factory()
+    db = session_factory()
+    try:
+        queue.enqueue(db, 1, priority=queue.PRIORITY_REFRESH)
+        queue.enqueue(db, 1, priority=queue.PRIORITY_NEW_LINK)
+        assert queue.enqueue_many(db, [1, 2, 3, 2]) == 2
+        assert db.query(ParseJob).count() == 3
+        assert db.query(ParseJob).filter(ParseJob.link_id == 1).one().priority == queue.PRIORITY_NEW_LINK
+
+        # New links come first
+        claimed = queue.claim(db, "w1", limit=1, visibility_timeout=60)
+        assert [job.link_id for job in claimed] == [1]
+        # A leased job is invisible to other workers until its lease expires
+        assert 1 not in [job.link_id for job in queue.claim(db, "w2", limit=5, visibility_timeout=60)]
+        db.query(ParseJob).filter(ParseJob.link_id == 1).update(
+            {"locked_until": datetime.utcnow() - timedelta(seconds=1)})
+        db.commit()
+        assert [job.link_id for job in queue.claim(db, "w3", limit=5, visibility_timeout=60)] == [1]
+    finally:
+        db.close()
+
+
+def test_failed_jobs_back_off_then_give_up():
+    session_factory = _make_session_factory(link_count=1)
+    db = session_factory()
+    try:
+        job = queue.enqueue(db, 1, max_attempts=2)
+        job_id = job.id
+        queue.claim(db, "w1", limit=1, visibility_timeout=60)
+        job = queue.fail(db, job_id, "timeout")
+        assert job.status == "queued"
+        assert job.run_after > datetime.utcnow()
+        assert queue.claim(db, "w1", limit=1, visibility_timeout=60) == []
+
+        job.run_after = datetime.utcnow()
+        db.commit()
+        queue.claim(db, "w1", limit=1, visibility_timeout=60)
+        job = queue.fail(db, job_id, "timeout")
+        assert job.status == "failed"
+        assert job.dedupe_key is None
+        # The link can be queued again once its job gave up
+        assert queue.enqueue(db, 1).id != job_id
+    finally:
+        db.close()
+
+
+def test_expired_lease_on_last_attempt_fails():
+    session_factory = _make_session_factory(link_count=1)
+    db = session_factory()
+    try:
+        job_id = queue.enqueue(db, 1, max_attempts=2).id
+        for attempt in range(2):
+            # The worker dies mid-job: fail() is never called and the lease runs out
+            assert [job.attempts for job in queue.claim(db, "w1", limit=1, visibility_timeout=60)] == [attempt + 1]
+            db.query(ParseJob).filter(ParseJob.id == job_id).update(
+                {"locked_until": datetime.utcnow() - timedelta(seconds=1)})
+            db.commit()
+        assert queue.claim(db, "w2", limit=1, visibility_timeout=60) == []
+        job = db.get(ParseJob, job_id)
+        assert job.status == "failed" and job.dedupe_key is None and job.locked_until is None
+        assert job.attempts == 2
+    finally:
+        db.close()
+
+
+def test_enqueue_stale_uses_refresh_lane():
+    session_factory = _make_session_factory()
+    db = session_factory()
+    try:
+        db.add(LinkMetrics(link_id=1, views=1, updated_at=datetime.utcnow()))
+        db.add(LinkMetrics(link_id=2, views=1, updated_at=datetime.utcnow() - timedelta(days=2)))
+        db.commit()
+        queue.enqueue(db, 3, priority=queue.PRIORITY_NEW_LINK)
+        assert queue.enqueue_stale(db, max_age_seconds=86400) == 1
+        priorities = dict(db.query(ParseJob.link_id, ParseJob.priority).all())
+        # Link 3 (no metrics yet) keeps its new-link priority
+        assert priorities == {2: queue.PRIORITY_REFRESH, 3: queue.PRIORITY_NEW_LINK}
+        assert [job.link_id for job in queue.claim(db, "w1", limit=2, visibility_timeout=60)] == [3, 2]
+    finally:
+        db.close()
+
+
+def test_worker_processes_queue():
+    session_factory = _make_session_factory()
+    db = session_factory()
+    queue.enqueue_many(db, [1, 2, 3])
+    db.close()
+
+    seen = []
+
+    async def handler(link_id):
+        await asyncio.sleep(0.01)
+        if link_id == 2:
+            raise queue.PermanentJobError("unsupported")
+        seen.append(link_id)
+        inner = session_factory()
+        inner.add(LinkMetrics(link_id=link_id, views=link_id * 100))
+        inner.commit()
+        inner.close()
+
+    worker = JobWorker(parser_factory=None, session_factory=session_factory, concurrency=2, handler=handler)
+    asyncio.run(worker.drain())
+
+    assert sorted(seen) == [1, 3]
+    assert worker.processed == 2
+    assert worker.failed == 1
+    db = session_factory()
+    try:
+        assert queue.stats(db) == {"queued": 0, "running": 0, "failed": 1}
+        assert db.query(LinkMetrics).count() == 2
+    finally:
+        db.close()
+
+
+def test_heartbeat_keeps_slow_job_leased():
+    session_factory = _make_session_factory(link_count=1)
+    db = session_factory()
+    queue.enqueue(db, 1)
+    db.close()
+
+    runs = []
+    stolen = []
+
+    async def slow_handler(link_id):
+        runs.append(link_id)
+        # Outlives the lease several times over while another worker polls
+        for _ in range(6):
+            await asyncio.sleep(0.1)
+            other = session_factory()
+            stolen.extend(queue.claim(other, "other", limit=1, visibility_timeout=0.2))
+            other.close()
+
+    worker = JobWorker(parser_factory=None, session_factory=session_factory, concurrency=1,
+                       visibility_timeout=0.2, heartbeat_interval=0.05, handler=slow_handler)
+    asyncio.run(worker.drain())
+
+    assert runs == [1] and stolen == []
+    assert worker.processed == 1
+
+
+if __name__ == "__main__":
+    test_enqueue_dedupes_and_bumps_priority()
+    test_failed_jobs_back_off_then_give_up()
+    test_expired_lease_on_last_attempt_fails()
+    test_enqueue_stale_uses_refresh_lane()
+    test_worker_processes_queue()
+    test_heartbeat_keeps_slow_job_leased()
+    print("Job queue tests passed")
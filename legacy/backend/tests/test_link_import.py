@@ -0,0 +1,82 @@
+import sys
+import os
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "link_import.db"))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics, ParseJob, ContentMetrics
+from backend.app.utils import link_import
+from backend.app.utils.rollups import company_rollups
+
+
+def _make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(username="importer", email="importer@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="Import Co", owner_id=user.id)
+    db.add(company)
+    db.commit()
+    return engine, db, user.id, company.id
+
+
+def test_urls_from_csv():
+    assert link_import.urls_from_csv("name,url\na,https://youtu.be/a\nb,https://youtu.be/b\n") == [
+        "https://youtu.be/a", "https://youtu.be/b"
+    ]
+    assert link_import.urls_from_csv("https://youtu.be/a\n\nhttps://youtu.be/b") == ["https://youtu.be/a", "https://youtu.be/b"]
+    assert link_import.urls_from_csv("") == []
+
+
+def test_import_links_in_one_transaction():
+    engine, db, user_id, company_id = _make_session()
+    try:
+        db.add(Link(url="https://youtu.be/existing123", platform="youtube", user_id=user_id, company_id=company_id))
+        db.commit()
+
+        urls = [f"https://youtu.be/video{i:06d}" for i in range(200)] + [
+            "https://www.tiktok.com/@a/video/1",
+            "https://youtu.be/existing123",
+            "https://youtu.be/video000003",
+            "not a url",
+            "  ",
+        ]
+        statements = []
+        event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+        report = link_import.import_links(db, company_id, user_id, urls)
+        import_statements = len(statements)
+
+        assert (report["total"], report["created"], report["duplicates"], report["invalid"]) == (205, 201, 2, 2)
+        results = report["results"]
+        assert results[0]["status"] == "created" and results[0]["platform"] == "youtube"
+        assert results[201]["error"] == "Link already exists for this company"
+        assert results[202]["error"] == "Link appears earlier in this import"
+        assert results[203]["status"] == "invalid" and results[204]["error"] == "URL cannot be empty"
+
+        # Returned ids belong to the row that created them
+        stored = dict(db.query(Link.id, Link.url).all())
+        assert all(stored[r["id"]] == r["url"] for r in results if r["status"] == "created")
+        assert db.query(LinkMetrics).count() == 201
+        assert db.query(ParseJob).count() == 201
+        rollups = {r.platform: r.link_count for r in company_rollups(db, company_id)}
+        # The link stored before the import has no metrics row but still counts
+        assert rollups == {"youtube": 201, "tiktok": 1}
+        assert db.query(ContentMetrics).count() == 201
+        assert db.query(Link).filter(Link.url == "https://youtu.be/video000003").one().content_key == "youtube:video000003"
+        # Dedupe, content, links, metrics, rollups, job lookup and jobs: a fixed number of statements
+        assert import_statements <= 12
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_urls_from_csv()
+    test_import_links_in_one_transaction()
+    print("link import tests passed")
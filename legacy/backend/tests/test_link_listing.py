@@ -0,0 +1,140 @@
+import sys
+import os
+import tempfile
+from datetime import datetime, timedelta
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "link_listing.db"))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics
+from backend.app.utils import link_listing
+
+
+def _seed(db):
+    user = User(username="lister", email="lister@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="Listing Co", owner_id=user.id)
+    other = Company(name="Other Co", owner_id=user.id)
+    db.add_all([company, other])
+    db.commit()
+    base = datetime(2026, 1, 1)
+    for i in range(25):
+        platform = "YouTube" if i % 2 else "tiktok"
+        link = Link(url=f"https://example.com/{i}", platform=platform, user_id=user.id, company_id=company.id)
+        # Views repeat so the id tiebreak is exercised
+        link.metrics = LinkMetrics(views=(i % 5) * 100, likes=i, comments=0, updated_at=base + timedelta(hours=i))
+        db.add(link)
+    db.add(Link(url="https://example.com/other", platform="tiktok", user_id=user.id, company_id=other.id))
+    db.commit()
+    return company.id
+
+
+def _walk(db, company_id, sort, order=None, platform=None, limit=7):
+    """Collect every page by following the cursors"""
+    seen, after, pages = [], None, 0
+    while True:
+        rows = db.execute(link_listing.links_page_query(company_id, sort, order, limit, after, platform)).all()
+        items, cursor = link_listing.build_page(rows, sort, limit)
+        assert len(items) <= limit
+        seen.extend(items)
+        pages += 1
+        if cursor is None:
+            return seen, pages
+        after = link_listing.decode_cursor(cursor, sort)
+
+
+def test_pages_cover_every_link_once():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        company_id = _seed(db)
+
+        items, pages = _walk(db, company_id, "id")
+        assert [item["id"] for item in items] == sorted(item["id"] for item in items)
+        assert len(items) == 25 and pages == 4
+        assert items[0]["metrics"]["views"] == 0 and items[0]["created_at"]
+
+        items, _ = _walk(db, company_id, "views")
+        keys = [(item["metrics"]["views"], item["id"]) for item in items]
+        assert keys == sorted(keys, reverse=True) and len(set(keys)) == 25
+
+        items, _ = _walk(db, company_id, "updated_at", order="asc")
+        stamps = [item["metrics"]["updated_at"] for item in items]
+        assert stamps == sorted(stamps) and len(items) == 25
+
+        items, _ = _walk(db, company_id, "likes", platform="youtube")
+        assert len(items) == 12 and all(item["platform"] == "YouTube" for item in items)
+        assert [item["metrics"]["likes"] for item in items] == sorted((i for i in range(25) if i % 2), reverse=True)
+    finally:
+        db.close()
+
+
+def test_page_is_a_single_query():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    try:
+        company_id = _seed(db)
+        statements.clear()
+        rows = db.execute(link_listing.links_page_query(company_id, "views", limit=10)).all()
+        assert len(rows) == 11  # one extra row tells whether a next page exists
+        assert len(statements) == 1
+
+        anchor = db.execute(link_listing.anchor_query(rows[3].id, "views")).first()
+        assert anchor[0] == rows[3].views
+    finally:
+        db.close()
+
+
+def test_after_link_without_metrics():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        company_id = _seed(db)
+        bare = Link(url="https://example.com/bare", platform="tiktok", company_id=company_id)
+        db.add(bare)
+        db.commit()
+
+        # Placed among the links with no views yet, before those with lower ids
+        value = db.execute(link_listing.anchor_query(bare.id, "views")).scalar()
+        assert value == 0
+        rows = db.execute(link_listing.links_page_query(company_id, "views", limit=10, after=(value, bare.id))).all()
+        assert [row.id for row in rows] == [21, 16, 11, 6, 1]
+
+        # Never fetched: sorts at its creation time, later than every seeded update
+        value = db.execute(link_listing.anchor_query(bare.id, "updated_at")).scalar()
+        rows = db.execute(link_listing.links_page_query(
+            company_id, "updated_at", order="asc", limit=30, after=(value, bare.id)
+        )).all()
+        assert value is not None and rows == []
+    finally:
+        db.close()
+
+
+def test_cursor_rejects_other_sort():
+    cursor = link_listing.encode_cursor("views", 100, 7)
+    assert link_listing.decode_cursor(cursor, "views") == (100, 7)
+    for bad in (cursor, "not-a-cursor"):
+        try:
+            link_listing.decode_cursor(bad, "likes")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("cursor accepted for another sort")
+
+
+if __name__ == "__main__":
+    test_pages_cover_every_link_once()
+    test_page_is_a_single_query()
+    test_after_link_without_metrics()
+    test_cursor_rejects_other_sort()
+    print("link listing tests passed")
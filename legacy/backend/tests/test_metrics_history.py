@@ -0,0 +1,69 @@
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "metrics_history.db"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.models.models import Base, User, Company, Link, LinkMetricsHistory
+from backend.app.utils.metrics_history import record_snapshots, day_range, daily_buckets, growth_by_platform
+
+
+def _make_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(username="history", email="history@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="History Co", owner_id=user.id)
+    db.add(company)
+    db.commit()
+    db.add_all([
+        Link(url="https://www.youtube.com/watch?v=aaaaaaaaaaa", platform="youtube", user_id=user.id, company_id=company.id),
+        # Older rows store the platform capitalised
+        Link(url="https://www.youtube.com/watch?v=bbbbbbbbbbb", platform="YouTube", user_id=user.id, company_id=company.id),
+        Link(url="https://www.tiktok.com/@x/video/1", platform="tiktok", user_id=user.id, company_id=company.id),
+    ])
+    db.commit()
+    return db, company.id
+
+
+def test_daily_buckets_and_growth_from_snapshots():
+    db, company_id = _make_session()
+    try:
+        record_snapshots(db, [(1, 100, 10, 1), (2, 50, 5, 0), (3, 1000, 100, 10)], captured_at=datetime(2026, 3, 1, 9))
+        # A second refresh on the same day only counts once per link
+        record_snapshots(db, [(1, 120, 12, 1)], captured_at=datetime(2026, 3, 1, 18))
+        record_snapshots(db, [(1, 200, 20, 2), (2, 80, 8, 1), (3, 1500, 150, 15)], captured_at=datetime(2026, 3, 2, 9))
+        # Outside the requested range
+        record_snapshots(db, [(1, 999, 99, 9)], captured_at=datetime(2026, 3, 5, 9))
+        db.commit()
+        assert db.query(LinkMetricsHistory).count() == 8
+
+        start, end = day_range(datetime(2026, 3, 1), datetime(2026, 3, 2))
+        days = daily_buckets(db, company_id, start, end)
+        assert days == [
+            {"date": "2026-03-01", "views": 1170, "likes": 117, "comments": 11, "links": 3},
+            {"date": "2026-03-02", "views": 1780, "likes": 178, "comments": 18, "links": 3},
+        ]
+        assert [d["views"] for d in daily_buckets(db, company_id, start, end, platform="tiktok")] == [1000, 1500]
+
+        growth = growth_by_platform(db, company_id, start, end)
+        assert growth["youtube"]["views_start"] == 150
+        assert growth["youtube"]["views_end"] == 280
+        assert growth["youtube"]["views_growth"] == 130
+        assert growth["tiktok"]["likes_growth"] == 50
+        assert growth["youtube"]["links"] == 2
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_daily_buckets_and_growth_from_snapshots()
+    print("Metrics history tests passed")
@@ -0,0 +1,95 @@
+import asyncio
+import sys
+import os
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "monday_batch.db"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.core.http_client import http_client
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics, MondayConnection
+from backend.app.utils.monday_batch import ColumnUpdate, batch_errors, build_mutation, sync_links_to_monday
+from backend.tests.fake_monday import FakeMonday
+
+
+def _make_session_factory(links=120):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    user = User(username="monday", email="monday@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="Board Co", owner_id=user.id)
+    db.add(company)
+    db.commit()
+    connection = MondayConnection(
+        user_id=user.id, company_id=company.id, api_token="token", board_id="42",
+        views_column_id="views", likes_column_id="likes", comments_column_id="comments",
+    )
+    db.add(connection)
+    for i in range(links):
+        link = Link(url=f"https://youtu.be/video{i:06d}", platform="youtube", user_id=user.id,
+                    company_id=company.id, monday_item_id=str(1000 + i))
+        link.metrics = LinkMetrics(views=i, likes=1, comments=0)
+        db.add(link)
+    # Not on the board yet: skipped by the batch push
+    db.add(Link(url="https://youtu.be/unsynced001", platform="youtube", user_id=user.id, company_id=company.id))
+    db.commit()
+    ids = connection.id, [link_id for (link_id,) in db.query(Link.id).order_by(Link.id)]
+    db.close()
+    return session_factory, ids
+
+
+def test_build_mutation_and_errors():
+    updates = [ColumnUpdate(1, "100", {"views": "5"}), ColumnUpdate(2, "200", {"views": "6"})]
+    query, variables = build_mutation(updates)
+    assert "u0: change_multiple_column_values(board_id: $boardId, item_id: $item0, column_values: $values0)" in query
+    assert "complexity { query before after reset_in_x_seconds }" in query
+    assert variables == {"item0": "100", "values0": '{"views": "5"}', "item1": "200", "values1": '{"views": "6"}'}
+
+    body = {"data": {"u0": {"id": "100"}, "u1": None}, "errors": [{"message": "gone", "path": ["u1"]}]}
+    assert batch_errors(updates, body) == {1: None, 2: "gone"}
+    assert batch_errors(updates, {"error_message": "Complexity budget exhausted"}) == {
+        1: "Complexity budget exhausted", 2: "Complexity budget exhausted"
+    }
+
+
+def test_sync_links_in_complexity_sized_batches():
+    session_factory, (connection_id, link_ids) = _make_session_factory()
+
+    async def run():
+        # Item 1005 was deleted on the board
+        items = {str(1000 + i): {"name": f"Video {i}", "column_values": {}} for i in range(120) if i != 5}
+        async with FakeMonday(items=items, mutation_cost=20000) as monday:
+            report = await sync_links_to_monday(
+                session_factory, connection_id, link_ids,
+                api_url=monday.api_url, max_batch=100, mutation_cost=1000, budget=1_000_000,
+            )
+        await http_client.close()
+        return report, monday
+
+    report, monday = asyncio.run(run())
+    # First batch sized from the estimate (100), the rest from the observed 20000/mutation (50)
+    assert [len(request["variables"]) // 2 for request in monday.requests] == [100, 20]
+    assert report == {"synced": 119, "failed": 1, "skipped": 1, "requests": 2}
+    assert monday.items["1010"]["column_values"] == {"views": "10", "likes": "1", "comments": "0"}
+
+    db = session_factory()
+    try:
+        statuses = dict(db.query(Link.monday_item_id, Link.monday_sync_status).all())
+        assert statuses["1000"] == "success" and statuses["1005"] == "error" and statuses[None] is None
+        failed = db.query(Link).filter(Link.monday_item_id == "1005").one()
+        assert failed.monday_sync_error == "Item 1005 not found" and failed.monday_synced_at is not None
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_build_mutation_and_errors()
+    test_sync_links_in_complexity_sized_batches()
+    print("Monday batch tests passed")
@@ -0,0 +1,86 @@
+import asyncio
+import sys
+import os
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "monday_boards.db"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.core.http_client import http_client
+from backend.app.core.monday_client import monday_client
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics, MondayConnection
+from backend.app.utils import monday_sync
+from backend.app.utils.monday_boards import BoardMetadataCache, board_cache, parse_board
+from backend.tests.fake_monday import FakeMonday
+
+
+def test_parse_board_and_cache_ttl():
+    body = {"data": {"boards": [{
+        "id": "42", "board_kind": "subitems",
+        "columns": [{"id": "numbers", "title": "Views"}],
+        "items_page": {"items": [{"id": "7"}]},
+    }]}}
+    metadata = parse_board("42", body)
+    assert metadata.is_subitems and metadata.parent_item_id == "7" and metadata.columns == {"numbers": "Views"}
+    assert parse_board("42", {"data": {"boards": []}}).board_kind is None
+
+    cache = BoardMetadataCache(ttl=60)
+    cache.put(1, metadata)
+    cache.put(2, parse_board("43", body))
+    assert cache.get(1, "42") is metadata and cache.get(1, "43") is None
+    cache.invalidate(1)
+    assert cache.get(1, "42") is None and cache.get(2, "43") is not None
+    assert BoardMetadataCache(ttl=0).get(1, "42") is None
+
+
+def test_board_metadata_fetched_once_per_connection():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(username="boards", email="boards@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="Boards Co", owner_id=user.id)
+    db.add(company)
+    db.commit()
+    connection = MondayConnection(
+        user_id=user.id, company_id=company.id, api_token="token", board_id="42",
+        views_column_id="views", likes_column_id="likes", comments_column_id="comments",
+    )
+    links = [Link(url=f"https://youtu.be/video{i:06d}", platform="youtube", user_id=user.id, company_id=company.id)
+             for i in range(3)]
+    db.add_all([connection] + links)
+    db.commit()
+    board_cache.clear()
+
+    async def run():
+        async with FakeMonday(items={"500": {"name": "Parent", "column_values": {}}}, board_kind="subitems") as monday:
+            monday_client.api_url = monday.api_url
+            statuses = [
+                await monday_sync.push_link_to_monday(link, LinkMetrics(views=5, likes=1, comments=0), connection, db)
+                for link in links[:2]
+            ]
+            # Saving the configuration drops the cached board
+            board_cache.invalidate(connection.id)
+            statuses.append(await monday_sync.push_link_to_monday(links[2], None, connection, db))
+        await http_client.close()
+        return statuses, monday
+
+    try:
+        statuses, monday = asyncio.run(run())
+        assert statuses == [("success", None)] * 3
+        board_queries = [request for request in monday.requests if "boards(ids:" in request["query"]]
+        assert len(board_queries) == 2
+        assert all(monday.items[link.monday_item_id]["parent_id"] == "500" for link in links)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_parse_board_and_cache_ttl()
+    test_board_metadata_fetched_once_per_connection()
+    print("Monday board cache tests passed")
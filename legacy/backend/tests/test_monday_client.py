@@ -0,0 +1,84 @@
+import asyncio
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.core.http_client import http_client
+from backend.app.core.monday_client import MondayClient, MondayRateLimitError, rate_limit_delay, with_complexity
+from backend.tests.fake_monday import FakeMonday
+
+ITEM_QUERY = "query ($boardId: ID!) { boards(ids: [$boardId]) { id name } }"
+
+
+def test_with_complexity_and_rate_limit_delay():
+    document = with_complexity(ITEM_QUERY)
+    assert document.startswith("query ($boardId: ID!) { complexity { query before after reset_in_x_seconds } ")
+    assert with_complexity(document) == document
+
+    assert rate_limit_delay({"data": {}}) is None
+    assert rate_limit_delay({"errors": [{"message": "Item not found"}]}) is None
+    assert rate_limit_delay({"errors": [{"message": "x", "extensions": {"code": "ComplexityException", "retry_in_seconds": 7}}]}) == 7
+    assert rate_limit_delay({"error_code": "ComplexityException",
+                             "error_message": "Complexity budget exhausted, query cost 30001 budget remaining 2 out of 1000000 reset in 12 seconds"}) == 12
+    assert rate_limit_delay({"error_message": "Rate Limit Exceeded", "status_code": 429}) == 60
+
+
+def test_retries_after_server_delay():
+    async def run():
+        async with FakeMonday(rate_limited=2, retry_in=0.05) as monday:
+            client = MondayClient(http=http_client, api_url=monday.api_url, max_retries=3)
+            body = await client.execute("token", ITEM_QUERY, {"boardId": "42"})
+
+            failing = MondayClient(http=http_client, api_url=monday.api_url, max_retries=0)
+            monday.rate_limited = len(monday.requests) + 1
+            try:
+                await failing.execute("token", ITEM_QUERY, {"boardId": "42"})
+                raise AssertionError("expected MondayRateLimitError")
+            except MondayRateLimitError:
+                pass
+        await http_client.close()
+        return client, body, monday
+
+    client, body, monday = asyncio.run(run())
+    assert body["data"]["boards"][0]["id"] == "42"
+    assert "complexity" in monday.requests[0]["query"]
+    metrics = client.metrics()
+    assert metrics["requests"] == 3 and metrics["retries"] == 2 and metrics["rate_limited"] == 2
+    # The second and third attempts waited for the reported reset
+    assert metrics["throttled"] == 2 and metrics["throttled_seconds"] >= 0.1
+
+
+def test_token_bucket_queues_requests_per_token():
+    async def run():
+        async with FakeMonday(mutation_cost=100, budget=1_000_000) as monday:
+            # 200 points refilled per second: the fourth 100-point query waits ~0.5s
+            client = MondayClient(http=http_client, api_url=monday.api_url, budget=300, window=1.5, default_cost=100)
+            depths = []
+
+            async def sample():
+                await asyncio.sleep(0.05)
+                depths.append(client.queue_depth)
+
+            await asyncio.gather(
+                sample(),
+                *[client.execute("token", ITEM_QUERY, {"boardId": str(i)}, cost=100) for i in range(4)],
+            )
+            # Another token has its own budget
+            await client.execute("other", ITEM_QUERY, {"boardId": "1"}, cost=100)
+        await http_client.close()
+        return client, depths
+
+    client, depths = asyncio.run(run())
+    metrics = client.metrics()
+    assert metrics["tokens"] == 2 and metrics["requests"] == 5
+    assert metrics["throttled"] == 1 and metrics["throttled_seconds"] > 0
+    assert depths == [1] and metrics["max_queue_depth"] == 1 and metrics["queue_depth"] == 0
+
+
+if __name__ == "__main__":
+    test_with_complexity_and_rate_limit_delay()
+    test_retries_after_server_delay()
+    test_token_bucket_queues_requests_per_token()
+    print("Monday client tests passed")
@@ -0,0 +1,86 @@
+import asyncio
+import json
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.core.http_client import http_client
+from backend.app.core.monday_client import MondayAPIError, MondayClient
+from backend.app.utils.monday_items import (
+    iter_board_items, iter_item_pages, ndjson_chunks, open_item_pages, page_size, _page
+)
+from backend.tests.fake_monday import FakeMonday
+
+
+def _items(count):
+    return {str(1000 + i): {"name": f"Item {i}", "column_values": {"views": str(i)}} for i in range(count)}
+
+
+def test_page_size_and_errors():
+    assert page_size(None) == 100 and page_size(1000) == 500 and page_size(25) == 25
+    try:
+        _page("42", {"data": {"boards": []}})
+        raise AssertionError("expected MondayAPIError")
+    except MondayAPIError as e:
+        assert e.status == 404
+    try:
+        _page("42", {"errors": [{"message": "CursorExpiredError"}]})
+        raise AssertionError("expected MondayAPIError")
+    except MondayAPIError as e:
+        assert str(e) == "CursorExpiredError"
+
+
+def test_reads_every_page():
+    async def run():
+        async with FakeMonday(items=_items(1234)) as monday:
+            client = MondayClient(http=http_client, api_url=monday.api_url)
+            sizes = [len(items) async for items in iter_item_pages("token", "42", limit=100, client=client)]
+            ids = [item["id"] async for item in iter_board_items("token", "42", limit=500, client=client)]
+            requests = list(monday.requests)
+        await http_client.close()
+        return sizes, ids, requests
+
+    sizes, ids, requests = asyncio.run(run())
+    assert sizes == [100] * 12 + [34]
+    assert len(ids) == 1234 and len(set(ids)) == 1234 and ids[0] == "1000" and ids[-1] == "2233"
+    # One board query, then cursors only
+    assert "items_page(limit: $limit)" in requests[0]["query"]
+    assert all("next_items_page" in request["query"] for request in requests[1:13])
+    assert requests[1]["variables"] == {"cursor": "100", "limit": 100}
+
+
+def test_streams_ndjson():
+    async def run():
+        async with FakeMonday(items=_items(250)) as monday:
+            client = MondayClient(http=http_client, api_url=monday.api_url)
+            pages = await open_item_pages("token", "42", limit=100, client=client)
+            # The first page is read before the response starts
+            read_before_stream = monday.pages
+            chunks = [chunk async for chunk in ndjson_chunks(pages)]
+
+            empty = FakeMonday()
+            async with empty:
+                pages = await open_item_pages("token", "42", client=MondayClient(http=http_client, api_url=empty.api_url))
+                empty_chunks = [chunk async for chunk in ndjson_chunks(pages)]
+        await http_client.close()
+        return read_before_stream, chunks, empty_chunks
+
+    read_before_stream, chunks, empty_chunks = asyncio.run(run())
+    assert read_before_stream == 1
+    assert len(chunks) == 3
+    lines = b"".join(chunks).decode().splitlines()
+    assert len(lines) == 250
+    assert json.loads(lines[7]) == {
+        "id": "1007", "name": "Item 7", "state": "active", "updated_at": None,
+        "column_values": [{"id": "views", "text": "7"}],
+    }
+    assert empty_chunks == []
+
+
+if __name__ == "__main__":
+    test_page_size_and_errors()
+    test_reads_every_page()
+    test_streams_ndjson()
+    print("Monday items tests passed")
@@ -0,0 +1,200 @@
+import asyncio
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "monday_reconcile.db"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.core.http_client import http_client
+from backend.app.core.monday_client import monday_client
+from backend.app.jobs import monday_reconcile
+from backend.app.jobs.monday_reconcile import claim, parse_monday_time, reconcile_connection
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics, MondayConnection, MondayItemSnapshot
+from backend.app.utils.monday_boards import board_cache
+from backend.tests.fake_monday import FakeMonday
+
+
+def _values(views):
+    return {"views": str(views), "likes": "1", "comments": "0"}
+
+
+def _setup():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    user = User(username="monday", email="monday@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="Board Co", owner_id=user.id)
+    db.add(company)
+    db.commit()
+    connection = MondayConnection(
+        user_id=user.id, company_id=company.id, api_token="token", board_id="42",
+        views_column_id="views", likes_column_id="likes", comments_column_id="comments",
+    )
+    db.add(connection)
+    # 1000-1004 are on the board, 1005 was deleted there, the last link never got an item
+    item_ids = ["1000", "1001", "1002", "1003", "1004", "1005", "1009", None]
+    for i, item_id in enumerate(item_ids):
+        link = Link(url=f"https://youtu.be/video{i:06d}", platform="youtube", user_id=user.id,
+                    company_id=company.id, monday_item_id=item_id, title=f"Video {i}")
+        link.metrics = LinkMetrics(views=i, likes=1, comments=0)
+        db.add(link)
+    db.commit()
+    ids = connection.id, {link.monday_item_id or "new": link.id for link in db.query(Link)}
+    db.close()
+
+    items = {str(1000 + i): {"name": f"Video {i}", "column_values": _values(i), "updated_at": "2026-10-01T00:00:00Z"}
+             for i in range(5)}
+    items["1003"]["column_values"]["views"] = "999"
+    items["1009"] = {"name": "Video 6", "column_values": _values(6), "updated_at": "2026-10-01T00:00:00Z"}
+    # Added by hand on the board; never touched
+    items["2000"] = {"name": "Notes", "column_values": {}, "updated_at": "2026-10-01T00:00:00Z"}
+    return session_factory, ids, items
+
+
+def test_parse_monday_time():
+    assert parse_monday_time("2026-10-18T12:30:00Z") == datetime(2026, 10, 18, 12, 30)
+    assert parse_monday_time("2026-10-18T14:30:00+02:00") == datetime(2026, 10, 18, 12, 30)
+    assert parse_monday_time(None) is None and parse_monday_time("yesterday") is None
+
+
+def test_reconcile_only_changes():
+    session_factory, (connection_id, links), items = _setup()
+
+    async def run():
+        async with FakeMonday(items=items) as monday:
+            monday_client.api_url = monday.api_url
+            reconcile = lambda: reconcile_connection(session_factory, connection_id, page_size=3, create_delay=0)
+            first = await reconcile()
+            writes = len(monday.requests)
+            second = await reconcile()
+            second_requests = monday.requests[writes:]
+
+            db = session_factory()
+            metrics = db.query(LinkMetrics).filter(LinkMetrics.link_id == links["1000"]).one()
+            metrics.views = 500
+            metrics.updated_at = datetime.utcnow()
+            db.delete(db.get(Link, links["1009"]))
+            db.commit()
+            db.close()
+            monday.items["1001"]["column_values"]["views"] = "7"
+            monday.items["1001"]["updated_at"] = monday.tick()
+            third = await reconcile()
+
+            # Another run holds the lease
+            db = session_factory()
+            assert claim(db, connection_id, 60)
+            db.close()
+            skipped = await reconcile()
+
+            # Free lease, but no token to read the board with
+            db = session_factory()
+            connection = db.get(MondayConnection, connection_id)
+            connection.api_token = None
+            connection.reconcile_locked_until = None
+            db.commit()
+            db.close()
+            unconfigured = await reconcile()
+        await http_client.close()
+        return first, second, second_requests, third, skipped, unconfigured, monday
+
+    first, second, second_requests, third, skipped, unconfigured, monday = asyncio.run(run())
+    board_cache.clear()
+
+    assert first["status"] == "success" and first["items"] == 7 and first["changed_items"] == 7
+    # 1005 is gone from the board: unlinked, then created again with the link that never had an item
+    assert first["unlinked"] == 1 and first["created"] == 2
+    # Only 1003 differed from our metrics
+    assert first["updated"] == 1 and monday.items["1003"]["column_values"]["views"] == "3"
+    assert first["archived"] == 0 and first["failed"] == 0
+
+    assert second["status"] == "success" and second["updated"] == second["created"] == second["archived"] == 0
+    assert second["requests"] == 0
+    # Board reads only: one page of 3 + cursors for 9 active items
+    assert len(second_requests) == 3 and all("mutation" not in request["query"] for request in second_requests)
+
+    # 1000 changed here, 1001 was edited on the board, 1009's link was deleted
+    assert third["updated"] == 2 and third["archived"] == 1 and third["created"] == 0
+    assert monday.items["1000"]["column_values"]["views"] == "500"
+    assert monday.items["1001"]["column_values"]["views"] == "1"
+    assert monday.items["1009"]["state"] == "archived"
+    assert monday.items["2000"]["column_values"] == {} and monday.items["2000"].get("state", "active") == "active"
+    assert skipped["status"] == "skipped"
+    assert unconfigured["status"] == "not_configured"
+
+    db = session_factory()
+    try:
+        created = {link.id: link for link in db.query(Link).filter(Link.id.in_([links["1005"], links["new"]]))}
+        new_ids = {link.monday_item_id for link in created.values()}
+        assert len(new_ids) == 2 and all(item_id in monday.items for item_id in new_ids)
+        assert all(link.monday_sync_status == "success" for link in created.values())
+        assert monday.items[created[links["new"]].monday_item_id]["name"] == "Video 7"
+
+        snapshot = {row.item_id: row for row in db.query(MondayItemSnapshot)}
+        assert set(snapshot) == {"1000", "1001", "1002", "1003", "1004", "2000"} | new_ids
+        assert snapshot["2000"].link_id is None and snapshot["1000"].link_id == links["1000"]
+        connection = db.get(MondayConnection, connection_id)
+        assert connection.reconciled_at is not None and connection.board_updated_at is not None
+    finally:
+        db.close()
+
+
+def test_item_pushed_while_reading_stays_linked():
+    session_factory, (connection_id, links), items = _setup()
+    read_items = monday_reconcile.iter_board_items
+
+    async def run():
+        async with FakeMonday(items=items) as monday:
+            monday_client.api_url = monday.api_url
+
+            async def pushed_mid_read(*args, **kwargs):
+                first = True
+                async for item in read_items(*args, **kwargs):
+                    yield item
+                    if first:
+                        first = False
+                        # add_link's push lands at the top of the board, on the page already read
+                        monday.items["999"] = {"name": "Video 7", "column_values": _values(7),
+                                               "updated_at": monday.tick()}
+                        db = session_factory()
+                        db.get(Link, links["new"]).monday_item_id = "999"
+                        db.commit()
+                        db.close()
+
+            monday_reconcile.iter_board_items = pushed_mid_read
+            try:
+                first = await reconcile_connection(session_factory, connection_id, page_size=3, create_delay=0)
+            finally:
+                monday_reconcile.iter_board_items = read_items
+            second = await reconcile_connection(session_factory, connection_id, page_size=3, create_delay=0)
+        await http_client.close()
+        return first, second, monday
+
+    first, second, monday = asyncio.run(run())
+    board_cache.clear()
+
+    # Only 1005's link, gone from the board before the run, is unlinked and created again
+    assert first["unlinked"] == 1 and first["created"] == 1
+    assert second["unlinked"] == 0 and second["created"] == 0
+    assert sum(1 for item in monday.items.values() if item["name"] == "Video 7") == 1
+    db = session_factory()
+    try:
+        assert db.get(Link, links["new"]).monday_item_id == "999"
+        assert db.query(MondayItemSnapshot).filter(MondayItemSnapshot.item_id == "999").one().link_id == links["new"]
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_parse_monday_time()
+    test_reconcile_only_changes()
+    test_item_pushed_while_reading_stays_linked()
+    print("Monday reconcile tests passed")
@@ -0,0 +1,107 @@
+import asyncio
+import sys
+import os
+import tempfile
+import time
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.parsers.parser_factory import ParserFactory
+from backend.app.parsers.result_cache import ParserResultCache, _parse_platform_ttls
+
+URL = "https://youtu.be/dQw4w9WgXcQ"
+
+
+class CountingParser:
+    def __init__(self):
+        self.calls = 0
+
+    async def parse_url(self, url):
+        self.calls += 1
+        await asyncio.sleep(0)
+        if "broken" in url:
+            return {"error": "upstream failure"}
+        return {"title": "Video", "views": self.calls * 100, "likes": 1, "comments": 0}
+
+
+def _factory(cache):
+    factory = ParserFactory(cache=cache)
+    factory.parsers = {"youtube": CountingParser()}
+    return factory
+
+
+def test_platform_ttls():
+    ttls = _parse_platform_ttls("tiktok=60, youtube=bad,custom=5")
+    assert ttls["tiktok"] == 60 and ttls["youtube"] == 300 and ttls["custom"] == 5
+
+
+def test_fresh_hits_force_and_errors():
+    factory = _factory(ParserResultCache(ttls={"youtube": 60}, stale=60, max_size=10, path=""))
+    parser = factory.parsers["youtube"]
+
+    async def run():
+        first = await factory.parse_url(URL)
+        # Another URL shape of the same video shares the entry
+        second = await factory.parse_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=5")
+        forced = await factory.parse_url(URL, force=True)
+        after_force = await factory.parse_url(URL)
+        await factory.parse_url("https://youtu.be/broken12345")
+        await factory.parse_url("https://youtu.be/broken12345")
+        return first, second, forced, after_force
+
+    first, second, forced, after_force = asyncio.run(run())
+    assert first["views"] == second["views"] == 100
+    assert forced["views"] == after_force["views"] == 200
+    # 2 calls for the video, 2 for the uncached error
+    assert parser.calls == 4
+    assert factory.cache.metrics()["hits"] == 2
+
+
+def test_stale_while_revalidate():
+    cache = ParserResultCache(ttls={"youtube": 60}, stale=600, max_size=10, path="")
+    factory = _factory(cache)
+    parser = factory.parsers["youtube"]
+
+    async def run():
+        await factory.parse_url(URL)
+        # Age the entry past its TTL but inside the stale window
+        stored_at, platform, value = cache._entries["youtube:dQw4w9WgXcQ"]
+        cache._entries["youtube:dQw4w9WgXcQ"] = (stored_at - 120, platform, value)
+        stale = await asyncio.gather(factory.parse_url(URL), factory.parse_url(URL))
+        await asyncio.gather(*factory._revalidating.values())
+        return stale, await factory.parse_url(URL)
+
+    stale, refreshed = asyncio.run(run())
+    assert [result["views"] for result in stale] == [100, 100]
+    assert refreshed["views"] == 200
+    # One background refresh for both stale reads
+    assert parser.calls == 2
+    assert cache.metrics()["stale_hits"] == 2
+
+
+def test_lru_and_sqlite_tier():
+    path = os.path.join(tempfile.mkdtemp(), "parser_cache.db")
+    cache = ParserResultCache(ttls={"youtube": 60}, stale=0, max_size=2, path=path)
+    for key in ("a", "b", "c"):
+        cache.put(key, "youtube", {"views": 1})
+    assert list(cache._entries) == ["b", "c"] and cache.evictions == 1
+
+    # Evicted and restarted entries come back from disk
+    assert cache.get("a", "youtube") == ({"views": 1}, True)
+    restarted = ParserResultCache(ttls={"youtube": 60}, stale=0, max_size=2, path=path)
+    assert restarted.get("c", "youtube") == ({"views": 1}, True)
+    assert restarted.metrics()["disk_hits"] == 1
+
+    expired = ParserResultCache(ttls={"youtube": 60}, stale=0, max_size=2, path="")
+    expired._entries["old"] = (time.time() - 61, "youtube", {"views": 1})
+    assert expired.get("old", "youtube") == (None, False)
+    assert "old" not in expired._entries
+
+
+if __name__ == "__main__":
+    test_platform_ttls()
+    test_fresh_hits_force_and_errors()
+    test_stale_while_revalidate()
+    test_lru_and_sqlite_tier()
+    print("parser cache tests passed")
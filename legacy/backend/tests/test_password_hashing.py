@@ -0,0 +1,47 @@
+import asyncio
+import sys
+import os
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from passlib.context import CryptContext
+from backend.app.core import auth
+
+
+def _fast_rounds():
+    """Patch the module's context, which was built when auth was first imported"""
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5)
+    return mock.patch.multiple(auth, BCRYPT_ROUNDS=5, pwd_context=context)
+
+
+def test_password_ops_run_on_the_executor():
+    async def run():
+        hashed = await auth.aget_password_hash("s3cret")
+        return hashed, await auth.averify_password("s3cret", hashed), await auth.averify_password("wrong", hashed)
+
+    with _fast_rounds():
+        hashed, ok, wrong = asyncio.run(run())
+    assert hashed.startswith("$2b$05$")
+    assert ok is True
+    assert wrong is False
+
+
+def test_login_rehashes_outdated_work_factor():
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("s3cret")
+    with _fast_rounds():
+        verified, new_hash = asyncio.run(auth.averify_and_update_password("s3cret", old_hash))
+        assert verified is True
+        assert new_hash.startswith("$2b$05$")
+
+        verified, new_hash = asyncio.run(auth.averify_and_update_password("s3cret", new_hash))
+        assert verified is True
+        assert new_hash is None
+
+
+if __name__ == "__main__":
+    test_password_ops_run_on_the_executor()
+    test_login_rehashes_outdated_work_factor()
+    print("Password hashing tests passed")
@@ -0,0 +1,82 @@
+import asyncio
+import sys
+import os
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "principal_cache.db"))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from starlette.requests import Request
+from backend.app.models.models import Base, User
+from backend.app.core import auth
+from backend.app.core.principal_cache import PrincipalCache
+
+
+def _request(token):
+    return Request({"type": "http", "headers": [(b"authorization", f"Bearer {token}".encode())]})
+
+
+def test_cached_principal_skips_the_database():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    user = User(username="cached", email="cached@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    user_id = user.id
+    db.close()
+
+    cache = PrincipalCache(ttl=60, max_size=10)
+    original_cache = auth.principal_cache
+    auth.principal_cache = cache
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    try:
+        token = auth.create_access_token({"sub": "cached@example.com", "uid": user_id})
+
+        db = session_factory()
+        first = asyncio.run(auth.get_current_user(_request(token), db=db))
+        assert first.id == user_id
+        assert len(statements) == 1
+        assert "users.id" in statements[0]  # primary-key lookup
+        db.close()
+
+        db = session_factory()
+        second = asyncio.run(auth.get_current_user(_request(token), db=db))
+        assert len(statements) == 1
+        assert second.username == "cached"
+        # The cached user is attached to the request session and can be updated
+        second.display_name = "Cached User"
+        db.commit()
+        cache.invalidate(second)
+        db.close()
+
+        db = session_factory()
+        third = asyncio.run(auth.get_current_user(_request(token), db=db))
+        assert third.display_name == "Cached User"
+        db.close()
+
+        assert cache.metrics()["hits"] == 1
+        assert cache.metrics()["misses"] == 2
+        assert cache.metrics()["invalidations"] == 1
+    finally:
+        auth.principal_cache = original_cache
+
+
+def test_lru_eviction():
+    cache = PrincipalCache(ttl=60, max_size=2)
+    for i in range(3):
+        cache.put(f"user{i}@example.com", User(id=i, username=f"user{i}", email=f"user{i}@example.com"))
+    assert cache.metrics()["size"] == 2
+    assert cache.metrics()["evictions"] == 1
+
+
+if __name__ == "__main__":
+    test_cached_principal_skips_the_database()
+    test_lru_eviction()
+    print("Principal cache tests passed")
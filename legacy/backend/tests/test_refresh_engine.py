@@ -0,0 +1,170 @@
+import asyncio
+import sys
+import os
+import tempfile
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "refresh_engine.db"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics, LinkMetricsHistory
+from backend.app.utils.refresh_engine import RefreshEngine, RefreshJob
+
+
+class FakeParser:
+    def __init__(self, platform, tracker):
+        self.platform = platform
+        self.tracker = tracker
+
+    async def parse_url(self, url):
+        active = self.tracker["active"]
+        active[self.platform] = active.get(self.platform, 0) + 1
+        self.tracker["peak"] = max(self.tracker["peak"], sum(active.values()))
+        peaks = self.tracker["platform_peak"]
+        peaks[self.platform] = max(peaks.get(self.platform, 0), active[self.platform])
+        await asyncio.sleep(0.01)
+        active[self.platform] -= 1
+        if "broken" in url:
+            raise ValueError("upstream failure")
+        return {"title": f"Title for {url}", "views": 100, "likes": 10, "comments": 1}
+
+
+class FakeBatchParser(FakeParser):
+    batch_size = 5
+
+    def __init__(self, platform, tracker):
+        super().__init__(platform, tracker)
+        self.batches = []
+
+    async def parse_many(self, urls):
+        self.batches.append(len(urls))
+        return {url: await self.parse_url(url) for url in urls}
+
+
+class FakeParserFactory:
+    def __init__(self, tracker, youtube_cls=FakeParser):
+        self.parsers = {"youtube": youtube_cls("youtube", tracker), "tiktok": FakeParser("tiktok", tracker)}
+
+    def get_parser(self, url=None, platform=None):
+        return self.parsers.get(platform)
+
+
+def _make_session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine)
+    db = session_factory()
+    user = User(username="bulk", email="bulk@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="Bulk Co", owner_id=user.id)
+    db.add(company)
+    db.commit()
+    for i in range(12):
+        db.add(Link(url=f"https://www.youtube.com/watch?v=video{i:05d}", platform="youtube",
+                    user_id=user.id, company_id=company.id))
+    db.add(Link(url="https://www.tiktok.com/@x/video/1", platform="tiktok", user_id=user.id, company_id=company.id))
+    db.add(Link(url="https://www.tiktok.com/@broken/video/2", platform="tiktok", user_id=user.id, company_id=company.id))
+    db.commit()
+    company_id = company.id
+    db.close()
+    return session_factory, company_id
+
+
+def test_bulk_refresh_respects_caps_and_writes_batches():
+    session_factory, company_id = _make_session_factory()
+    tracker = {"active": {}, "peak": 0, "platform_peak": {}}
+    engine = RefreshEngine(
+        FakeParserFactory(tracker),
+        session_factory=session_factory,
+        max_concurrency=4,
+        platform_concurrency={"youtube": 3, "tiktok": 1},
+        batch_size=5,
+    )
+    job = asyncio.run(engine.run(RefreshJob(company_id=company_id)))
+
+    assert job.status == "completed"
+    assert job.total == 14
+    assert job.done == 13
+    assert job.failed == 1
+    assert job.pending == 0
+    assert tracker["peak"] <= 4
+    assert tracker["platform_peak"]["youtube"] <= 3
+    assert tracker["platform_peak"]["tiktok"] == 1
+
+    db = session_factory()
+    try:
+        assert db.query(LinkMetrics).count() == 13
+        assert all(m.views == 100 for m in db.query(LinkMetrics).all())
+        assert db.query(Link).filter(Link.title.like("Title for%")).count() == 13
+        assert db.query(LinkMetricsHistory).count() == 13
+    finally:
+        db.close()
+
+
+def test_bulk_refresh_uses_parse_many_for_batch_parsers():
+    session_factory, company_id = _make_session_factory()
+    tracker = {"active": {}, "peak": 0, "platform_peak": {}}
+    factory = FakeParserFactory(tracker, youtube_cls=FakeBatchParser)
+    engine = RefreshEngine(factory, session_factory=session_factory, max_concurrency=4)
+    job = asyncio.run(engine.run(RefreshJob(company_id=company_id)))
+
+    assert job.done == 13
+    assert job.failed == 1
+    assert sorted(factory.parsers["youtube"].batches) == [2, 5, 5]
+
+
+class FailingFetchEngine(RefreshEngine):
+    async def _fetch_all(self, job, links, results):
+        await results.put((links[0][0], {"title": "Stored", "views": 5, "likes": 0, "comments": 0}, None, None))
+        raise RuntimeError("fetch blew up")
+
+
+class StalledFetchEngine(RefreshEngine):
+    async def _fetch_all(self, job, links, results):
+        await asyncio.Event().wait()
+
+
+def test_failed_or_cancelled_fetch_stops_the_writer():
+    session_factory, company_id = _make_session_factory()
+    tracker = {"active": {}, "peak": 0, "platform_peak": {}}
+
+    async def run_failing():
+        engine = FailingFetchEngine(FakeParserFactory(tracker), session_factory=session_factory)
+        job = await engine.run(RefreshJob(company_id=company_id))
+        # Only the task running this coroutine is left: the writer finished
+        return job, len(asyncio.all_tasks())
+
+    job, tasks = asyncio.run(run_failing())
+    assert job.status == "failed"
+    assert job.error == "fetch blew up"
+    assert job.done == 1
+    assert tasks == 1
+
+    async def run_cancelled():
+        engine = StalledFetchEngine(FakeParserFactory(tracker), session_factory=session_factory)
+        job = RefreshJob(company_id=company_id)
+        task = asyncio.create_task(engine.run(job))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        return job, len(asyncio.all_tasks())
+
+    job, tasks = asyncio.run(run_cancelled())
+    assert job.status == "failed"
+    assert job.error == "Cancelled"
+    assert job.finished_at is not None
+    assert tasks == 1
+
+
+if __name__ == "__main__":
+    test_bulk_refresh_respects_caps_and_writes_batches()
+    test_bulk_refresh_uses_parse_many_for_batch_parsers()
+    test_failed_or_cancelled_fetch_stops_the_writer()
+    print("Refresh engine tests passed")
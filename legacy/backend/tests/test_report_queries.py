@@ -0,0 +1,78 @@
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "report_queries.db"))
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics
+from backend.app.utils import report_queries
+
+
+def _make_session(links_per_platform):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    user = User(username="reports", email="reports@example.com", hashed_password="x")
+    db.add(user)
+    db.commit()
+    company = Company(name="Reports Co", owner_id=user.id)
+    db.add(company)
+    db.commit()
+    for platform in ("youtube", "tiktok"):
+        for i in range(links_per_platform):
+            link = Link(url=f"https://{platform}.example/{i}", platform=platform, user_id=user.id, company_id=company.id)
+            db.add(link)
+            db.flush()
+            db.add(LinkMetrics(link_id=link.id, views=100, likes=10, comments=1, updated_at=datetime(2026, 3, 2, 12)))
+    # A link whose metrics fall outside the report range
+    link = Link(url="https://instagram.example/old", platform="instagram", user_id=user.id, company_id=company.id)
+    db.add(link)
+    db.flush()
+    db.add(LinkMetrics(link_id=link.id, views=5000, likes=0, comments=0, updated_at=datetime(2025, 1, 1)))
+    db.commit()
+    return engine, db, company.id
+
+
+def _count_queries(engine, fn):
+    statements = []
+    listener = lambda *args: statements.append(args[2])
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        result = fn()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    return result, len(statements)
+
+
+def test_reports_use_one_aggregate_query():
+    engine, db, company_id = _make_session(links_per_platform=50)
+    start, end = datetime(2026, 3, 1), datetime(2026, 3, 2)
+    try:
+        performance, queries = _count_queries(
+            engine, lambda: report_queries.platform_performance(db, company_id, start, end))
+        assert queries == 1
+        assert performance["YouTube"]["views"] == 5000
+        assert performance["YouTube"]["count"] == 50
+        assert performance["YouTube"]["avg_likes"] == 10
+        assert performance["Instagram"]["count"] == 0
+        assert performance["Facebook"]["avg_views"] == 0
+
+        engagement, queries = _count_queries(
+            engine, lambda: report_queries.engagement_analysis(db, company_id, start, end))
+        assert queries == 1
+        assert engagement["total_views"] == 10000
+        assert engagement["total_links"] == 101
+        assert engagement["engagement_rate"] == 11.0
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_reports_use_one_aggregate_query()
+    print("Report query tests passed")
@@ -0,0 +1,107 @@
+import sys
+import os
+import tempfile
+from unittest import mock
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "rollups.db"))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from backend.app.models.models import Base, User, Company, Link, LinkMetrics
+from backend.app.utils import rollups
+from backend.app.utils.rollups import company_rollups, rebuild_rollups
+
+
+def _snapshot(db, company_id):
+    return {
+        r.platform: (r.link_count, r.views, r.likes, r.comments)
+        for r in company_rollups(db, company_id)
+    }
+
+
+def test_rollups_follow_metric_writes():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        user = User(username="rollup", email="rollup@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        company = Company(name="Rollup Co", owner_id=user.id)
+        db.add(company)
+        db.commit()
+
+        # New link and metrics in the same flush
+        first = Link(url="https://youtube.example/1", platform="YouTube", user_id=user.id, company_id=company.id)
+        first.metrics = LinkMetrics(views=100, likes=10, comments=1)
+        db.add(first)
+        db.commit()
+        # Metrics added for an already stored link
+        second = Link(url="https://youtube.example/2", platform="youtube", user_id=user.id, company_id=company.id)
+        third = Link(url="https://tiktok.example/1", platform="tiktok", user_id=user.id, company_id=company.id)
+        db.add_all([second, third])
+        db.commit()
+        assert _snapshot(db, company.id) == {"youtube": (2, 100, 10, 1), "tiktok": (1, 0, 0, 0)}
+        db.add_all([LinkMetrics(link_id=second.id, views=50), LinkMetrics(link_id=third.id, views=7, likes=1)])
+        db.commit()
+        assert _snapshot(db, company.id) == {"youtube": (2, 150, 10, 1), "tiktok": (1, 7, 1, 0)}
+        # A link that never got a metrics row still counts
+        db.add(Link(url="https://instagram.example/1", platform="Instagram", user_id=user.id, company_id=company.id))
+        db.commit()
+        assert _snapshot(db, company.id)["instagram"] == (1, 0, 0, 0)
+
+        # Updates apply only the delta, including from a fresh session
+        other = sessionmaker(bind=engine)()
+        metrics = other.query(LinkMetrics).filter(LinkMetrics.link_id == first.id).one()
+        metrics.views = 130
+        metrics.comments = 0
+        other.commit()
+        other.close()
+        db.expire_all()
+        assert _snapshot(db, company.id)["youtube"] == (2, 180, 10, 0)
+
+        # Deleting a link removes its metrics from the rollup
+        db.delete(db.get(Link, third.id))
+        db.commit()
+        assert _snapshot(db, company.id)["tiktok"] == (0, 0, 0, 0)
+
+        incremental = _snapshot(db, company.id)
+        rebuild_rollups(db, company.id)
+        rebuilt = _snapshot(db, company.id)
+        assert rebuilt == {"youtube": incremental["youtube"], "instagram": incremental["instagram"]}
+    finally:
+        db.close()
+
+
+def test_rollups_without_on_conflict_support():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        user = User(username="generic", email="generic@example.com", hashed_password="x")
+        db.add(user)
+        db.commit()
+        company = Company(name="Generic Co", owner_id=user.id)
+        db.add(company)
+        db.commit()
+        # As on a database without INSERT .. ON CONFLICT
+        with mock.patch.object(rollups, "conflict_insert", return_value=None):
+            link = Link(url="https://youtube.example/1", platform="youtube", user_id=user.id, company_id=company.id)
+            link.metrics = LinkMetrics(views=10)
+            db.add(link)
+            db.commit()
+            db.add(Link(url="https://youtube.example/2", platform="youtube", user_id=user.id, company_id=company.id))
+            link.metrics.views = 25
+            db.commit()
+        assert _snapshot(db, company.id) == {"youtube": (2, 25, 0, 0)}
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    test_rollups_follow_metric_writes()
+    test_rollups_without_on_conflict_support()
+    print("Rollup tests passed")
@@ -0,0 +1,109 @@
+import asyncio
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.core.single_flight import SingleFlight
+from backend.app.parsers.parser_factory import ParserFactory
+from backend.app.parsers.result_cache import ParserResultCache
+
+
+class SlowParser:
+    def __init__(self):
+        self.calls = 0
+
+    async def parse_url(self, url):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return {"views": 100, "likes": 1, "comments": 0}
+
+
+def test_concurrent_calls_share_one_execution():
+    flights = SingleFlight()
+    executions = []
+
+    async def fetch(key):
+        executions.append(key)
+        await asyncio.sleep(0.01)
+        return {"key": key}
+
+    async def run():
+        return await asyncio.gather(
+            *(flights.do("youtube:a", lambda: fetch("youtube:a")) for _ in range(5)),
+            flights.do("youtube:b", lambda: fetch("youtube:b")),
+        )
+
+    results = asyncio.run(run())
+    assert executions == ["youtube:a", "youtube:b"]
+    assert results[:5] == [{"key": "youtube:a"}] * 5
+    assert flights.metrics() == {
+        "in_flight": 0, "calls": 6, "executions": 2, "coalesced": 4, "coalesced_rate": 4 / 6,
+    }
+
+
+def test_errors_reach_every_waiter_and_are_not_kept():
+    flights = SingleFlight()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failure")
+
+    async def run():
+        return await asyncio.gather(*(flights.do("k", failing) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert flights.executions == 1 and not flights.in_flight("k")
+
+
+def test_cancelled_leader_does_not_cancel_followers():
+    flights = SingleFlight()
+    executions = []
+
+    async def fetch():
+        executions.append(1)
+        await asyncio.sleep(0.05)
+        return "ok"
+
+    async def run():
+        leader = asyncio.create_task(flights.do("k", fetch))
+        await asyncio.sleep(0.01)
+        followers = [asyncio.create_task(flights.do("k", fetch)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        try:
+            await leader
+            raise AssertionError("leader should be cancelled")
+        except asyncio.CancelledError:
+            pass
+        return results
+
+    assert asyncio.run(run()) == ["ok", "ok"]
+    # One follower ran the call again and the other joined it
+    assert len(executions) == 2 and flights.coalesced == 1 and not flights.in_flight("k")
+
+
+def test_forced_refreshes_of_one_video_coalesce():
+    factory = ParserFactory(cache=ParserResultCache(ttls={}, default_ttl=0, path=""), flights=SingleFlight())
+    parser = factory.parsers["youtube"] = SlowParser()
+
+    async def run():
+        return await asyncio.gather(
+            factory.parse_url("https://youtu.be/dQw4w9WgXcQ", force=True),
+            factory.parse_url("https://www.youtube.com/watch?v=dQw4w9WgXcQ", force=True),
+        )
+
+    first, second = asyncio.run(run())
+    assert first == second and parser.calls == 1
+    assert factory.flights.coalesced == 1
+
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_execution()
+    test_errors_reach_every_waiter_and_are_not_kept()
+    test_cancelled_leader_does_not_cancel_followers()
+    test_forced_refreshes_of_one_video_coalesce()
+    print("single flight tests passed")
@@ -0,0 +1,143 @@
+import asyncio
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault("APIFY_TOKEN", "test-token")
+
+from backend.app.core.http_client import HTTPClientManager
+from backend.app.parsers.tiktok_parser import TikTokParser
+from backend.tests.fake_apify import FakeApify
+
+
+class RecordingTikTokParser(TikTokParser):
+    """TikTok parser that answers actor runs from memory and records each run's input"""
+
+    def __init__(self, missing=()):
+        super().__init__()
+        self.runs = []
+        self.missing = set(missing)
+        self.batch_window = 0.01
+
+    async def _run_actor(self, urls):
+        self.runs.append(list(urls))
+        return [
+            {
+                "id": self._extract_video_id(url),
+                "text": f"Video {self._extract_video_id(url)} #tag",
+                "playCount": 500,
+                "diggCount": 50,
+                "commentCount": 5,
+                "submittedVideoUrl": url,
+            }
+            for url in reversed(urls) if self._extract_video_id(url) not in self.missing
+        ]
+
+
+def test_parse_many_maps_items_back_by_video_id():
+    urls = [f"https://www.tiktok.com/@user/video/{7000000000000000000 + i}" for i in range(60)]
+    parser = RecordingTikTokParser(missing={"7000000000000000003"})
+    parser.batch_size = 50
+
+    results = asyncio.run(parser.parse_many(urls + ["https://example.com/not-tiktok"]))
+
+    assert [len(run) for run in parser.runs] == [50, 10]
+    assert results[urls[0]]["views"] == 500
+    assert results[urls[0]]["title"] == "Video 7000000000000000000 #tag"
+    assert results[urls[0]]["hashtags"] == ["tag"]
+    # Partial results: the missing video fails alone
+    assert "error" in results[urls[3]]
+    assert "error" not in results[urls[4]]
+    assert results["https://example.com/not-tiktok"] == {"error": "Invalid TikTok URL"}
+
+
+def test_concurrent_parse_url_calls_share_one_run():
+    urls = [f"https://www.tiktok.com/@user/video/{7100000000000000000 + i}" for i in range(5)]
+    parser = RecordingTikTokParser(missing={"7100000000000000004"})
+
+    async def run():
+        results = await asyncio.gather(*(parser.parse_url(url) for url in urls), return_exceptions=True)
+        # Let the flush task's done callback run
+        await asyncio.sleep(0)
+        return results
+
+    results = asyncio.run(run())
+
+    assert not parser._flush_tasks
+    assert len(parser.runs) == 1
+    assert sorted(parser.runs[0]) == sorted(urls)
+    assert [r["likes"] for r in results[:4]] == [50, 50, 50, 50]
+    assert isinstance(results[4], ValueError)
+
+
+def _tiktok_item(url, views):
+    return {"id": url.rsplit("/", 1)[-1], "text": "clip", "playCount": views, "diggCount": 1, "commentCount": 0}
+
+
+async def _run_against_fake_apify(polls_until_done, final_status="SUCCEEDED", run_timeout=None):
+    urls = [f"https://www.tiktok.com/@user/video/{7200000000000000000 + i}" for i in range(3)]
+    items = {url: _tiktok_item(url, 100 + i) for i, url in enumerate(urls[:2])}
+    client = HTTPClientManager()
+    try:
+        async with FakeApify(items, polls_until_done=polls_until_done, final_status=final_status) as apify:
+            parser = TikTokParser(http_client=client)
+            parser.api_base = apify.api_base
+            parser.api_url = f"{apify.api_base}/acts/{parser.actor_id}/runs"
+            if run_timeout is not None:
+                parser.run_timeout = run_timeout
+            results = await parser.parse_many(urls)
+            return urls, results, apify.requests
+    finally:
+        await client.close()
+
+
+def test_fast_run_needs_two_round_trips():
+    urls, results, requests = asyncio.run(_run_against_fake_apify(polls_until_done=0))
+    assert [kind for kind, _ in requests] == ["start", "dataset"]
+    assert requests[0][1]["waitForFinish"] == "60"
+    assert results[urls[0]]["views"] == 100
+    assert results[urls[1]]["views"] == 101
+    assert "error" in results[urls[2]]
+
+
+def test_slow_run_is_long_polled():
+    urls, results, requests = asyncio.run(_run_against_fake_apify(polls_until_done=2))
+    assert [kind for kind, _ in requests] == ["start", "status", "status", "dataset"]
+    assert all(query["waitForFinish"] == "60" for kind, query in requests if kind == "status")
+    assert results[urls[1]]["views"] == 101
+
+
+def test_failed_run_fails_the_batch():
+    urls, results, _ = asyncio.run(_run_against_fake_apify(polls_until_done=1, final_status="FAILED"))
+    assert all(results[url] == {"error": "Run failed with status: FAILED"} for url in urls)
+
+
+def test_timed_out_run_is_aborted():
+    urls, results, requests = asyncio.run(_run_against_fake_apify(polls_until_done=100, run_timeout=0))
+    assert [kind for kind, _ in requests] == ["start", "abort"]
+    assert requests[1][1]["token"] == "test-token"
+    assert all(results[url] == {"error": "Error fetching TikTok data: Apify run did not finish in time"} for url in urls)
+
+
+def test_single_parse_url_skips_batch_window():
+    parser = RecordingTikTokParser()
+    parser.batch_window = 30
+    url = "https://www.tiktok.com/@user/video/7300000000000000000"
+
+    async def run():
+        return await asyncio.wait_for(parser.parse_url(url), timeout=5)
+
+    assert asyncio.run(run())["views"] == 500
+    assert parser.runs == [[url]]
+
+
+if __name__ == "__main__":
+    test_parse_many_maps_items_back_by_video_id()
+    test_concurrent_parse_url_calls_share_one_run()
+    test_fast_run_needs_two_round_trips()
+    test_slow_run_is_long_polled()
+    test_failed_run_fails_the_batch()
+    test_timed_out_run_is_aborted()
+    test_single_parse_url_skips_batch_window()
+    print("TikTok batch tests passed")
@@ -0,0 +1,53 @@
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from backend.app.utils.url_classifier import ClassifiedURL, classify_url
+
+
+def test_classify_supported_urls():
+    cases = {
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQ&t=42": ("youtube", "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        "youtu.be/dQw4w9WgXcQ": ("youtube", "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        "https://youtube.com/shorts/dQw4w9WgXcQ?feature=share": ("youtube", "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        "https://www.youtube.com/embed/dQw4w9WgXcQ": ("youtube", "https://www.youtube.com/watch?v=dQw4w9WgXcQ", "dQw4w9WgXcQ"),
+        "https://www.tiktok.com/@user.name/video/7234567890123456789?lang=en": (
+            "tiktok", "https://www.tiktok.com/@user.name/video/7234567890123456789", "7234567890123456789"
+        ),
+        "https://vm.tiktok.com/ZMabc123/": ("tiktok", "https://vm.tiktok.com/ZMabc123", None),
+        "https://www.tiktok.com/t/ZTabc/": ("tiktok", "https://www.tiktok.com/t/ZTabc", None),
+        "https://www.instagram.com/reel/Cx_ab-1/?igsh=abc": ("instagram", "https://www.instagram.com/p/Cx_ab-1/", "Cx_ab-1"),
+        "instagram.com/p/Cx_ab-1": ("instagram", "https://www.instagram.com/p/Cx_ab-1/", "Cx_ab-1"),
+        "https://www.instagram.com/stories/some.user/3141592653/": (
+            "instagram", "https://www.instagram.com/stories/some.user/3141592653/", "3141592653"
+        ),
+        "https://www.facebook.com/reel/1234567890": ("facebook", "https://www.facebook.com/reel/1234567890", "1234567890"),
+        "https://www.facebook.com/some.page/videos/987654321/": ("facebook", "https://www.facebook.com/watch/?v=987654321", "987654321"),
+        "https://www.facebook.com/watch/?v=987654321": ("facebook", "https://www.facebook.com/watch/?v=987654321", "987654321"),
+        "https://fb.watch/abcDEF/": ("facebook", "https://fb.watch/abcDEF", None),
+    }
+    for url, expected in cases.items():
+        assert classify_url(url) == ClassifiedURL(*expected), url
+    # Surrounding whitespace is ignored
+    assert classify_url("  https://youtu.be/dQw4w9WgXcQ \n").content_id == "dQw4w9WgXcQ"
+
+
+def test_reject_unsupported_urls():
+    for url in (
+        "",
+        "https://example.com/watch?v=dQw4w9WgXcQ",
+        "https://www.youtube.com/watch?v=short",
+        "https://www.youtube.com/watch?v=dQw4w9WgXcQQ",  # 12 characters
+        "https://www.instagram.com/someuser",
+        "https://www.tiktok.com/@user",
+        "ftp://www.facebook.com/reel/1",
+    ):
+        assert classify_url(url) is None, url
+
+
+if __name__ == "__main__":
+    test_classify_supported_urls()
+    test_reject_unsupported_urls()
+    print("URL classifier tests passed")
@@ -0,0 +1,107 @@
+import asyncio
+import sys
+import os
+
+# Add the project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+# Only needed to construct the parsers; each test sets its own key
+os.environ.setdefault("YOUTUBE_API_KEY", "test-key")
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+from backend.app.core.http_client import HTTPClientManager
+from backend.app.parsers import youtube_parser
+from backend.app.parsers.youtube_parser import YouTubeParser
+
+
+class RecordingYouTubeParser(YouTubeParser):
+    """YouTube parser that answers videos.list from memory and records each call"""
+
+    def __init__(self, missing=()):
+        super().__init__()
+        self.calls = []
+        self.missing = set(missing)
+
+    async def _fetch_videos(self, video_ids):
+        self.calls.append(list(video_ids))
+        return [
+            {
+                "id": video_id,
+                "snippet": {"title": f"Video {video_id}"},
+                "statistics": {"viewCount": "1,000", "likeCount": "10", "commentCount": "1"},
+            }
+            for video_id in video_ids if video_id not in self.missing
+        ]
+
+
+def test_parse_many_batches_fifty_ids_per_call():
+    ids = [f"vid{i:08d}" for i in range(120)]
+    urls = [f"https://www.youtube.com/watch?v={video_id}" for video_id in ids]
+    # The same video under another URL form is fetched only once
+    urls.append(f"https://youtu.be/{ids[0]}")
+    urls.append("https://www.youtube.com/watch?v=bad")
+    parser = RecordingYouTubeParser(missing={ids[5]})
+    parser.api_key = "test-key"
+
+    results = asyncio.run(parser.parse_many(urls))
+
+    assert [len(call) for call in parser.calls] == [50, 50, 20]
+    assert results[urls[0]] == results[f"https://youtu.be/{ids[0]}"]
+    assert results[urls[0]]["views"] == 1000
+    assert results[urls[0]]["title"] == f"Video {ids[0]}"
+    assert "error" in results[urls[5]]
+    assert "error" in results["https://www.youtube.com/watch?v=bad"]
+    assert len(results) == len(urls)
+
+
+async def _run_rest_transport():
+    async def videos(request):
+        # maxResults may not be combined with id
+        assert "maxResults" not in request.query
+        if request.query["key"] != "test-key":
+            return web.json_response(
+                {"error": {"message": "Daily Limit Exceeded", "errors": [{"reason": "quotaExceeded"}]}},
+                status=403,
+            )
+        ids = request.query["id"].split(",")
+        return web.json_response({"items": [
+            {"id": video_id, "snippet": {"title": video_id}, "statistics": {"viewCount": "7"}} for video_id in ids
+        ]})
+
+    app = web.Application()
+    app.router.add_get("/youtube/v3/videos", videos)
+    server = TestServer(app)
+    await server.start_server()
+    original_url = youtube_parser.YOUTUBE_VIDEOS_URL
+    youtube_parser.YOUTUBE_VIDEOS_URL = str(server.make_url("/youtube/v3/videos"))
+    client = HTTPClientManager()
+    try:
+        parser = YouTubeParser(http_client=client)
+        parser.api_key = "test-key"
+        result = await parser.parse_url("https://www.youtube.com/watch?v=abcdefghijk")
+        parser.api_key = "wrong-key"
+        try:
+            await parser.parse_url("https://www.youtube.com/watch?v=abcdefghijk")
+            quota_error = None
+        except ValueError as e:
+            quota_error = str(e)
+        return result, quota_error, client.metrics()["googleapis"]
+    finally:
+        youtube_parser.YOUTUBE_VIDEOS_URL = original_url
+        await client.close()
+        await server.close()
+
+
+def test_rest_transport_uses_pooled_session():
+    result, quota_error, pool = asyncio.run(_run_rest_transport())
+    assert result["title"] == "abcdefghijk"
+    assert result["views"] == 7
+    assert quota_error == "YouTube API quota exceeded. Please try again later."
+    assert pool["requests"] == 2
+    assert pool["handshakes"] == 1
+
+
+if __name__ == "__main__":
+    test_parse_many_batches_fifty_ids_per_call()
+    test_rest_transport_uses_pooled_session()
+    print("YouTube batch tests passed")
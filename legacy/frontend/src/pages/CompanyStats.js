@@ -87,19 +87,26 @@ export default function CompanyStats() {
         return;
       }
       console.log('Making request to:', `http://localhost:8000/api/links/?company_id=${id}`);
-      const res = await axios.get(`http://localhost:8000/api/links/?company_id=${id}`, {
-        headers: {
-          'Authorization': `Bearer ${token}`
+      // The API returns one page at a time; follow X-Next-Cursor until the last page
+      let allLinks = [];
+      let cursor = null;
+      do {
+        const res = await axios.get('http://localhost:8000/api/links/', {
+          params: { company_id: id, limit: 500, ...(cursor ? { cursor } : {}) },
+          headers: {
+            'Authorization': `Bearer ${token}`
+          }
+        });
+        if (!Array.isArray(res.data)) {
+          console.error('Response is not an array:', res.data);
+          setError('Invalid response format');
+          return;
         }
-      });
-      console.log('Links response:', res.data);
-      if (Array.isArray(res.data)) {
-        console.log('Number of links received:', res.data.length);
-        setLinks(res.data);
-      } else {
-        console.error('Response is not an array:', res.data);
-        setError('Invalid response format');
-      }
+        allLinks = allLinks.concat(res.data);
+        cursor = res.headers['x-next-cursor'] || null;
+      } while (cursor);
+      console.log('Number of links received:', allLinks.length);
+      setLinks(allLinks);
     } catch (err) {
       console.error('Error fetching links:', err);
       if (err.response) {
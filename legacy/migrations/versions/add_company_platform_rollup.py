@@ -0,0 +1,40 @@
+"""add company_platform_rollup table
+
+Revision ID: add_company_platform_rollup
+Revises: add_report_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_company_platform_rollup'
+down_revision = 'add_report_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'company_platform_rollup',
+        sa.Column('company_id', sa.Integer(), sa.ForeignKey('companies.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('platform', sa.String(), primary_key=True),
+        sa.Column('link_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('views', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('likes', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('comments', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+
+    # Populate from the current links; links without a metrics row still count
+    op.execute(
+        "INSERT INTO company_platform_rollup (company_id, platform, link_count, views, likes, comments, updated_at) "
+        "SELECT l.company_id, LOWER(l.platform), COUNT(DISTINCT l.id), COALESCE(SUM(m.views), 0), "
+        "COALESCE(SUM(m.likes), 0), COALESCE(SUM(m.comments), 0), CURRENT_TIMESTAMP "
+        "FROM links l LEFT JOIN link_metrics m ON m.link_id = l.id "
+        "WHERE l.company_id IS NOT NULL "
+        "GROUP BY l.company_id, LOWER(l.platform)"
+    )
+
+def downgrade():
+    op.drop_table('company_platform_rollup')
@@ -0,0 +1,40 @@
+"""add content_metrics table and links.content_key
+
+Revision ID: add_content_metrics
+Revises: add_link_listing_indexes
+Create Date: 2026-10-18
+
+Existing links are keyed afterwards with
+``python -m backend.app.utils.content_metrics``.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_content_metrics'
+down_revision = 'add_link_listing_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'content_metrics',
+        sa.Column('content_key', sa.String(), primary_key=True),
+        sa.Column('platform', sa.String(), nullable=False),
+        sa.Column('content_id', sa.String(), nullable=False),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('views', sa.Integer(), nullable=True),
+        sa.Column('likes', sa.Integer(), nullable=True),
+        sa.Column('comments', sa.Integer(), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(), nullable=True),
+    )
+    op.add_column('links', sa.Column(
+        'content_key', sa.String(), sa.ForeignKey('content_metrics.content_key', ondelete='SET NULL'), nullable=True
+    ))
+    op.create_index('ix_links_content_key', 'links', ['content_key'])
+
+def downgrade():
+    op.drop_index('ix_links_content_key', table_name='links')
+    op.drop_column('links', 'content_key')
+    op.drop_table('content_metrics')
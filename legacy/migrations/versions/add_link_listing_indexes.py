@@ -0,0 +1,26 @@
+"""index links and link_metrics for keyset-paginated link listing
+
+Revision ID: add_link_listing_indexes
+Revises: add_company_platform_rollup
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_link_listing_indexes'
+down_revision = 'add_company_platform_rollup'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index('ix_links_company_id_id', 'links', ['company_id', 'id'])
+    op.create_index('ix_link_metrics_views_link_id', 'link_metrics', ['views', 'link_id'])
+    op.create_index('ix_link_metrics_likes_link_id', 'link_metrics', ['likes', 'link_id'])
+    op.create_index('ix_link_metrics_updated_at_link_id', 'link_metrics', ['updated_at', 'link_id'])
+
+def downgrade():
+    op.drop_index('ix_link_metrics_updated_at_link_id', table_name='link_metrics')
+    op.drop_index('ix_link_metrics_likes_link_id', table_name='link_metrics')
+    op.drop_index('ix_link_metrics_views_link_id', table_name='link_metrics')
+    op.drop_index('ix_links_company_id_id', table_name='links')
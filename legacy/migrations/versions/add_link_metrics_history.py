@@ -0,0 +1,38 @@
+"""add link_metrics_history table
+
+Revision ID: add_link_metrics_history
+Revises: add_parse_jobs
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_link_metrics_history'
+down_revision = 'add_parse_jobs'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'link_metrics_history',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('link_id', sa.Integer(), sa.ForeignKey('links.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('views', sa.Integer(), nullable=True),
+        sa.Column('likes', sa.Integer(), nullable=True),
+        sa.Column('comments', sa.Integer(), nullable=True),
+        sa.Column('captured_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index('ix_link_metrics_history_link_id_captured_at', 'link_metrics_history',
+                    ['link_id', 'captured_at'])
+
+    # Seed the history with the current value of every link
+    op.execute(
+        "INSERT INTO link_metrics_history (link_id, views, likes, comments, captured_at) "
+        "SELECT link_id, views, likes, comments, COALESCE(updated_at, CURRENT_TIMESTAMP) FROM link_metrics"
+    )
+
+def downgrade():
+    op.drop_index('ix_link_metrics_history_link_id_captured_at', table_name='link_metrics_history')
+    op.drop_table('link_metrics_history')
@@ -0,0 +1,25 @@
+"""add Monday.com sync status columns to links
+
+Revision ID: add_link_monday_sync_status
+Revises: add_content_metrics
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_link_monday_sync_status'
+down_revision = 'add_content_metrics'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('links', sa.Column('monday_sync_status', sa.String(), nullable=True))
+    op.add_column('links', sa.Column('monday_sync_error', sa.Text(), nullable=True))
+    op.add_column('links', sa.Column('monday_synced_at', sa.DateTime(), nullable=True))
+
+def downgrade():
+    op.drop_column('links', 'monday_synced_at')
+    op.drop_column('links', 'monday_sync_error')
+    op.drop_column('links', 'monday_sync_status')
@@ -0,0 +1,43 @@
+"""add Monday.com board snapshots and reconciliation watermarks
+
+Revision ID: add_monday_reconciliation
+Revises: add_link_monday_sync_status
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_monday_reconciliation'
+down_revision = 'add_link_monday_sync_status'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('monday_connections', sa.Column('reconciled_at', sa.DateTime(), nullable=True))
+    op.add_column('monday_connections', sa.Column('board_updated_at', sa.DateTime(), nullable=True))
+    op.add_column('monday_connections', sa.Column('reconcile_locked_until', sa.DateTime(), nullable=True))
+    op.create_table(
+        'monday_item_snapshots',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('connection_id', sa.Integer(), sa.ForeignKey('monday_connections.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('item_id', sa.String(), nullable=False),
+        sa.Column('link_id', sa.Integer(), nullable=True),
+        sa.Column('name', sa.String(), nullable=True),
+        sa.Column('column_values', sa.Text(), nullable=True),
+        sa.Column('item_updated_at', sa.DateTime(), nullable=True),
+        sa.Column('seen_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_monday_item_snapshots_id', 'monday_item_snapshots', ['id'])
+    op.create_index('ix_monday_item_snapshots_connection_item', 'monday_item_snapshots', ['connection_id', 'item_id'], unique=True)
+    op.create_index('ix_monday_item_snapshots_connection_link', 'monday_item_snapshots', ['connection_id', 'link_id'])
+
+def downgrade():
+    op.drop_index('ix_monday_item_snapshots_connection_link', table_name='monday_item_snapshots')
+    op.drop_index('ix_monday_item_snapshots_connection_item', table_name='monday_item_snapshots')
+    op.drop_index('ix_monday_item_snapshots_id', table_name='monday_item_snapshots')
+    op.drop_table('monday_item_snapshots')
+    op.drop_column('monday_connections', 'reconcile_locked_until')
+    op.drop_column('monday_connections', 'board_updated_at')
+    op.drop_column('monday_connections', 'reconciled_at')
@@ -0,0 +1,43 @@
+"""add parse_jobs queue table
+
+Revision ID: add_parse_jobs
+Revises: make_monday_optional
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = 'add_parse_jobs'
+down_revision = 'make_monday_optional'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'parse_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('link_id', sa.Integer(), sa.ForeignKey('links.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='10'),
+        sa.Column('status', sa.String(), nullable=False, server_default='queued'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='5'),
+        sa.Column('run_after', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column('locked_until', sa.DateTime(), nullable=True),
+        sa.Column('locked_by', sa.String(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('dedupe_key', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_parse_jobs_id', 'parse_jobs', ['id'])
+    op.create_index('ix_parse_jobs_dedupe_key', 'parse_jobs', ['dedupe_key'], unique=True)
+    op.create_index('ix_parse_jobs_status_priority_run_after', 'parse_jobs',
+                    ['status', 'priority', 'run_after'])
+
+def downgrade():
+    op.drop_index('ix_parse_jobs_status_priority_run_after', table_name='parse_jobs')
+    op.drop_index('ix_parse_jobs_dedupe_key', table_name='parse_jobs')
+    op.drop_index('ix_parse_jobs_id', table_name='parse_jobs')
+    op.drop_table('parse_jobs')
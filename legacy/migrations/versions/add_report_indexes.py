@@ -0,0 +1,22 @@
+"""index links.company_id and link_metrics.link_id for report aggregates
+
+Revision ID: add_report_indexes
+Revises: add_link_metrics_history
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'add_report_indexes'
+down_revision = 'add_link_metrics_history'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index('ix_links_company_id', 'links', ['company_id'])
+    op.create_index('ix_link_metrics_link_id', 'link_metrics', ['link_id'])
+
+def downgrade():
+    op.drop_index('ix_link_metrics_link_id', table_name='link_metrics')
+    op.drop_index('ix_links_company_id', table_name='links')